@@ -0,0 +1,221 @@
+"""Microbenchmarks for the encoding/decoding of (key, tile) tuples to/from Python.
+
+Every combination of the chosen cell types, tile sizes, band counts and key types is encoded
+and decoded through :class:`~geopyspark.geotrellis.protobufserializer.ProtoBufSerializer`,
+which is what happens to each record that moves between Python and Scala. Throughput is
+reported in MB/s of cells and in tiles/s. No Spark cluster is needed.
+
+With ``--jvm``, the same grid is also run through the Scala ``ProtoBufCodec``\s using
+``geopyspark.geotrellis.testkit.CodecBenchmark``. This starts a local ``SparkContext`` only to
+reach the JVM, and so requires the GeoPySpark jar.
+
+To compare a codec change, save the results of a run before the change and pass them to the
+run after it::
+
+    python benchmarks/codec_benchmark.py --output before.json
+    python benchmarks/codec_benchmark.py --baseline before.json
+"""
+import argparse
+import datetime
+import itertools
+import json
+import time
+
+import numpy as np
+
+from geopyspark.geotrellis import (Extent, ProjectedExtent, TemporalProjectedExtent, SpatialKey,
+                                   SpaceTimeKey, Tile)
+from geopyspark.geotrellis.protobufcodecs import _raw_cell_dtypes
+from geopyspark.geotrellis.protobufserializer import ProtoBufSerializer
+
+
+CELL_TYPES = ['BIT', 'BYTE', 'UBYTE', 'SHORT', 'USHORT', 'INT', 'FLOAT', 'DOUBLE']
+KEY_TYPES = ['SpatialKey', 'SpaceTimeKey', 'ProjectedExtent', 'TemporalProjectedExtent']
+SIZES = [256, 512, 1024]
+BAND_COUNTS = [1, 4]
+PATTERNS = ['random', 'gradient', 'constant']
+COMPRESSIONS = ['none', 'lz4', 'zstd']
+
+_instant = datetime.datetime(2016, 8, 24, 9)
+_extent = Extent(0.0, 0.0, 1.0, 1.0)
+
+_keys = {
+    'SpatialKey': SpatialKey(0, 0),
+    'SpaceTimeKey': SpaceTimeKey(0, 0, _instant),
+    'ProjectedExtent': ProjectedExtent(_extent, 4326),
+    'TemporalProjectedExtent': TemporalProjectedExtent(_extent, _instant, 4326)
+}
+
+
+def create_cells(cell_type, size, band_count, pattern, random):
+    """Creates the raw (no NoData) cells of a tile, following the same patterns as the JVM.
+
+    ``random`` is incompressible, ``gradient`` compresses well, and ``constant`` is sent as a
+    single value.
+    """
+
+    dtype = _raw_cell_dtypes[cell_type]
+    shape = (band_count, size, size)
+
+    if pattern == 'constant':
+        return np.ones(shape, dtype=dtype)
+
+    if pattern == 'gradient':
+        (rows, cols) = np.indices((size, size))
+
+        if cell_type == 'BIT':
+            band = (cols // 16) % 2
+        elif cell_type in ('FLOAT', 'DOUBLE'):
+            band = (cols + rows) / 8.0
+        else:
+            band = ((cols + rows) // 8) % 100
+
+        return np.broadcast_to(band.astype(dtype), shape).copy()
+
+    if cell_type == 'BIT':
+        return random.randint(0, 2, size=shape).astype(dtype)
+    elif cell_type in ('FLOAT', 'DOUBLE'):
+        return random.standard_normal(shape).astype(dtype)
+    else:
+        info = np.iinfo(dtype)
+        return random.randint(info.min, info.max, size=shape, dtype=np.int64).astype(dtype)
+
+
+def run_python(cell_type, size, band_count, key_type, compression, pattern, tile_count, repeat):
+    """Times the Python codecs for one set of parameters.
+
+    Returns:
+        (float, float, int): The fastest encode time in seconds, the fastest decode time in
+        seconds, and the total number of encoded bytes.
+    """
+
+    random = np.random.RandomState(0)
+    key = _keys[key_type]
+
+    tuples = [(key, Tile(create_cells(cell_type, size, band_count, pattern, random), cell_type, None))
+              for _ in range(tile_count)]
+
+    serializer = ProtoBufSerializer.create_tuple_serializer(key_type, compression=compression)
+
+    encode_seconds = float('inf')
+    decode_seconds = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = [serializer.dumps(x) for x in tuples]
+        encode_seconds = min(encode_seconds, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for x in encoded:
+            # Tiles are decoded lazily, so their cells have to be read to be decoded
+            serializer.loads(x)[0][1].cells
+        decode_seconds = min(decode_seconds, time.perf_counter() - start)
+
+    return (encode_seconds, decode_seconds, sum(len(x) for x in encoded))
+
+
+def run_jvm(jvm, cell_type, size, band_count, key_type, compression, pattern, tile_count, repeat):
+    """Times the Scala codecs for one set of parameters. Returns the same values as
+    :func:`run_python`.
+    """
+
+    result = jvm.geopyspark.geotrellis.testkit.CodecBenchmark.run(
+        cell_type, size, band_count, key_type, compression, pattern, tile_count, repeat)
+
+    return (result[0], result[1], int(result[2]))
+
+
+def _get_jvm():
+    from pyspark import SparkContext
+    from geopyspark import geopyspark_conf
+
+    conf = geopyspark_conf(master="local[1]", appName="codec-benchmark")
+    conf.set('spark.ui.enabled', False)
+
+    return SparkContext(conf=conf)._gateway.jvm
+
+
+def _result_key(result):
+    return "{side} {cell_type} {size} {bands} {key_type} {op}".format(**result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--cell-types', nargs='+', default=CELL_TYPES, choices=CELL_TYPES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--bands', nargs='+', type=int, default=BAND_COUNTS)
+    parser.add_argument('--key-types', nargs='+', default=KEY_TYPES, choices=KEY_TYPES)
+    parser.add_argument('--compression', default='none', choices=COMPRESSIONS)
+    parser.add_argument('--pattern', default='random', choices=PATTERNS)
+    parser.add_argument('--tiles', type=int, default=8,
+                        help="The number of tuples encoded and decoded per timing.")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="The number of timings, of which the fastest is reported.")
+    parser.add_argument('--jvm', action='store_true',
+                        help="Also time the Scala codecs. Requires the GeoPySpark jar.")
+    parser.add_argument('--output', help="Write the results to this JSON file.")
+    parser.add_argument('--baseline', help="Compare against the results in this JSON file.")
+
+    args = parser.parse_args()
+
+    sides = [('python', run_python)]
+
+    if args.jvm:
+        jvm = _get_jvm()
+        sides.append(('jvm', lambda *params: run_jvm(jvm, *params)))
+
+    baseline = {}
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {_result_key(x): x for x in json.load(f)['results']}
+
+    header = "{:<6} {:<8} {:>5} {:>5} {:<24} {:<6} {:>10} {:>10} {:>7}".format(
+        'side', 'cell', 'size', 'bands', 'key type', 'op', 'MB/s', 'tiles/s', 'ratio')
+
+    if baseline:
+        header += " {:>8}".format('vs base')
+
+    print(header)
+
+    results = []
+    grid = itertools.product(args.cell_types, args.sizes, args.bands, args.key_types, sides)
+
+    for (cell_type, size, bands, key_type, (side, run)) in grid:
+        (encode_seconds, decode_seconds, encoded_bytes) = \
+            run(cell_type, size, bands, key_type, args.compression, args.pattern, args.tiles, args.repeat)
+
+        cell_bytes = args.tiles * bands * size * size * np.dtype(_raw_cell_dtypes[cell_type]).itemsize
+
+        for (op, seconds) in [('encode', encode_seconds), ('decode', decode_seconds)]:
+            result = {
+                'side': side,
+                'cell_type': cell_type,
+                'size': size,
+                'bands': bands,
+                'key_type': key_type,
+                'op': op,
+                'mb_per_second': cell_bytes / seconds / 1e6,
+                'tiles_per_second': args.tiles / seconds,
+                'compression_ratio': cell_bytes / encoded_bytes
+            }
+
+            line = "{side:<6} {cell_type:<8} {size:>5} {bands:>5} {key_type:<24} {op:<6} " \
+                   "{mb_per_second:>10.1f} {tiles_per_second:>10.1f} {compression_ratio:>7.2f}".format(**result)
+
+            if _result_key(result) in baseline:
+                speedup = result['mb_per_second'] / baseline[_result_key(result)]['mb_per_second']
+                line += " {:>7.2f}x".format(speedup)
+
+            print(line)
+            results.append(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'compression': args.compression,
+                       'pattern': args.pattern,
+                       'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
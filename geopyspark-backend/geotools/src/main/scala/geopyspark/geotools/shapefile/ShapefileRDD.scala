@@ -52,6 +52,6 @@ object ShapefileRDD {
     val featuresRDD: RDD[Feature[Geometry, Map[String, AnyRef]]] =
       simpleFeaturesRDD.map { SimpleFeatureToFeature(_) }
 
-    PythonTranslator.toPython[Feature[Geometry, Map[String, AnyRef]], ProtoSimpleFeature](featuresRDD)
+    PythonTranslator.toPythonBatched[Feature[Geometry, Map[String, AnyRef]], ProtoSimpleFeature](featuresRDD)
   }
 }
@@ -0,0 +1,295 @@
+package geopyspark.geotrellis
+
+import geopyspark.geotrellis.protobufs.TileProtoBuf
+
+import protos.tileMessages._
+
+import geotrellis.proj4._
+import geotrellis.raster._
+import geotrellis.spark._
+import geotrellis.vector._
+
+import org.apache.arrow.memory.RootAllocator
+import org.apache.arrow.vector._
+import org.apache.arrow.vector.ipc.{ArrowStreamReader, ArrowStreamWriter}
+import org.apache.arrow.vector.types.FloatingPointPrecision
+import org.apache.arrow.vector.types.pojo.{ArrowType, Field, FieldType, Schema}
+
+import org.apache.spark.api.java.JavaRDD
+import org.apache.spark.rdd.RDD
+
+import java.io.{ByteArrayInputStream, ByteArrayOutputStream}
+import java.nio.ByteBuffer
+import java.nio.channels.Channels
+import java.nio.charset.StandardCharsets
+
+import scala.collection.JavaConverters._
+import scala.collection.mutable.ArrayBuffer
+
+
+/** The key columns of an Arrow record batch for a given key type. */
+trait ArrowKeyColumns[K] extends Serializable {
+  def fields: Seq[Field]
+  def write(root: VectorSchemaRoot, index: Int, key: K): Unit
+  def read(root: VectorSchemaRoot, index: Int): K
+}
+
+
+object ArrowKeyColumns {
+  private def intField(name: String): Field =
+    new Field(name, FieldType.nullable(new ArrowType.Int(32, true)), null)
+
+  private def longField(name: String): Field =
+    new Field(name, FieldType.nullable(new ArrowType.Int(64, true)), null)
+
+  private def doubleField(name: String): Field =
+    new Field(name, FieldType.nullable(new ArrowType.FloatingPoint(FloatingPointPrecision.DOUBLE)), null)
+
+  private def stringField(name: String): Field =
+    new Field(name, FieldType.nullable(new ArrowType.Utf8()), null)
+
+  private def int(root: VectorSchemaRoot, name: String): IntVector =
+    root.getVector(name).asInstanceOf[IntVector]
+
+  private def long(root: VectorSchemaRoot, name: String): BigIntVector =
+    root.getVector(name).asInstanceOf[BigIntVector]
+
+  private def double(root: VectorSchemaRoot, name: String): Float8Vector =
+    root.getVector(name).asInstanceOf[Float8Vector]
+
+  private def string(root: VectorSchemaRoot, name: String): VarCharVector =
+    root.getVector(name).asInstanceOf[VarCharVector]
+
+  private val extentFields: Seq[Field] =
+    Seq(doubleField("xmin"), doubleField("ymin"), doubleField("xmax"), doubleField("ymax"),
+      intField("epsg"), stringField("proj4"))
+
+  private def writeExtent(root: VectorSchemaRoot, index: Int, extent: Extent, crs: CRS): Unit = {
+    double(root, "xmin").setSafe(index, extent.xmin)
+    double(root, "ymin").setSafe(index, extent.ymin)
+    double(root, "xmax").setSafe(index, extent.xmax)
+    double(root, "ymax").setSafe(index, extent.ymax)
+
+    crs.epsgCode match {
+      case Some(epsg) =>
+        int(root, "epsg").setSafe(index, epsg)
+        string(root, "proj4").setNull(index)
+      case None =>
+        int(root, "epsg").setNull(index)
+        string(root, "proj4").setSafe(index, crs.toProj4String.getBytes(StandardCharsets.UTF_8))
+    }
+  }
+
+  private def readExtent(root: VectorSchemaRoot, index: Int): (Extent, CRS) = {
+    val extent =
+      Extent(
+        double(root, "xmin").get(index),
+        double(root, "ymin").get(index),
+        double(root, "xmax").get(index),
+        double(root, "ymax").get(index))
+
+    val crs =
+      if (int(root, "epsg").isNull(index))
+        CRS.fromString(new String(string(root, "proj4").get(index), StandardCharsets.UTF_8))
+      else
+        CRS.fromEpsgCode(int(root, "epsg").get(index))
+
+    (extent, crs)
+  }
+
+  implicit val spatialKeyColumns: ArrowKeyColumns[SpatialKey] = new ArrowKeyColumns[SpatialKey] {
+    def fields = Seq(intField("col"), intField("row"))
+
+    def write(root: VectorSchemaRoot, index: Int, key: SpatialKey): Unit = {
+      int(root, "col").setSafe(index, key.col)
+      int(root, "row").setSafe(index, key.row)
+    }
+
+    def read(root: VectorSchemaRoot, index: Int): SpatialKey =
+      SpatialKey(int(root, "col").get(index), int(root, "row").get(index))
+  }
+
+  implicit val spaceTimeKeyColumns: ArrowKeyColumns[SpaceTimeKey] = new ArrowKeyColumns[SpaceTimeKey] {
+    def fields = Seq(intField("col"), intField("row"), longField("instant"))
+
+    def write(root: VectorSchemaRoot, index: Int, key: SpaceTimeKey): Unit = {
+      int(root, "col").setSafe(index, key.col)
+      int(root, "row").setSafe(index, key.row)
+      long(root, "instant").setSafe(index, key.instant)
+    }
+
+    def read(root: VectorSchemaRoot, index: Int): SpaceTimeKey =
+      SpaceTimeKey(int(root, "col").get(index), int(root, "row").get(index), long(root, "instant").get(index))
+  }
+
+  implicit val projectedExtentColumns: ArrowKeyColumns[ProjectedExtent] = new ArrowKeyColumns[ProjectedExtent] {
+    def fields = extentFields
+
+    def write(root: VectorSchemaRoot, index: Int, key: ProjectedExtent): Unit =
+      writeExtent(root, index, key.extent, key.crs)
+
+    def read(root: VectorSchemaRoot, index: Int): ProjectedExtent = {
+      val (extent, crs) = readExtent(root, index)
+      ProjectedExtent(extent, crs)
+    }
+  }
+
+  implicit val temporalProjectedExtentColumns: ArrowKeyColumns[TemporalProjectedExtent] =
+    new ArrowKeyColumns[TemporalProjectedExtent] {
+      def fields = extentFields :+ longField("instant")
+
+      def write(root: VectorSchemaRoot, index: Int, key: TemporalProjectedExtent): Unit = {
+        writeExtent(root, index, key.extent, key.crs)
+        long(root, "instant").setSafe(index, key.instant)
+      }
+
+      def read(root: VectorSchemaRoot, index: Int): TemporalProjectedExtent = {
+        val (extent, crs) = readExtent(root, index)
+        TemporalProjectedExtent(extent, crs, long(root, "instant").get(index))
+      }
+    }
+}
+
+
+/** Moves (key, tile) RDDs to and from Python as Arrow IPC streams.
+  *
+  * Every element of the encoded RDD is one stream holding a record batch
+  * of the key columns followed by the `bands`, `cols`, `rows` and `cells`
+  * columns. `cells` holds the bands of each tile back to back in the raw,
+  * native-endian layout used by [[TileProtoBuf.toRawCells]]. The cell type
+  * of the batch is stored in the schema's metadata under `dataType` and,
+  * if the cell type has a NoData value, `noData`.
+  */
+object ArrowTranslator {
+  // The number of cell bytes at which a batch is closed and sent to Python
+  final val DefaultBatchBytes: Int = 1 << 26
+
+  private val tileFields: Seq[Field] =
+    Seq(
+      new Field("bands", FieldType.nullable(new ArrowType.Int(32, true)), null),
+      new Field("cols", FieldType.nullable(new ArrowType.Int(32, true)), null),
+      new Field("rows", FieldType.nullable(new ArrowType.Int(32, true)), null),
+      new Field("cells", FieldType.nullable(new ArrowType.Binary()), null))
+
+  def toArrow[K](
+    rdd: RDD[(K, MultibandTile)],
+    maxBatchBytes: Int = DefaultBatchBytes
+  )(implicit columns: ArrowKeyColumns[K]): JavaRDD[Array[Byte]] =
+    rdd.mapPartitions { iter =>
+      new Iterator[Array[Byte]] {
+        def hasNext: Boolean = iter.hasNext
+
+        def next(): Array[Byte] = {
+          val batch = ArrayBuffer[(K, MultibandTile)]()
+          var size = 0
+
+          while (iter.hasNext && size < maxBatchBytes) {
+            val (key, tile) = iter.next()
+            batch += key -> tile
+            // cellType.bytes is 0 for BIT cells, so the size is counted in bits
+            size += (tile.bandCount * tile.cols * tile.rows * tile.cellType.bits + 7) / 8
+          }
+
+          writeBatch(batch)
+        }
+      }
+    }.toJavaRDD
+
+  def fromArrow[K](rdd: RDD[Array[Byte]])(implicit columns: ArrowKeyColumns[K]): RDD[(K, MultibandTile)] =
+    rdd.flatMap { bytes => readBatches(bytes) }
+
+  private def writeBatch[K](batch: Seq[(K, MultibandTile)])(implicit columns: ArrowKeyColumns[K]): Array[Byte] = {
+    val cellType = batch.head._2.cellType
+    val protoCellType = TileProtoBuf.cellTypeToMessage(cellType)
+
+    val metadata =
+      if (protoCellType.hasNoData)
+        Map("dataType" -> protoCellType.dataType.name, "noData" -> protoCellType.nd.toString)
+      else
+        Map("dataType" -> protoCellType.dataType.name)
+
+    val allocator = new RootAllocator(Long.MaxValue)
+    val root = VectorSchemaRoot.create(new Schema((columns.fields ++ tileFields).asJava, metadata.asJava), allocator)
+
+    root.getFieldVectors.asScala.foreach { _.allocateNew() }
+
+    val bandsVector = root.getVector("bands").asInstanceOf[IntVector]
+    val colsVector = root.getVector("cols").asInstanceOf[IntVector]
+    val rowsVector = root.getVector("rows").asInstanceOf[IntVector]
+    val cellsVector = root.getVector("cells").asInstanceOf[VarBinaryVector]
+
+    for (((key, tile), index) <- batch.zipWithIndex) {
+      val converted = if (tile.cellType == cellType) tile else tile.convert(cellType)
+      val bands = converted.bands.map { band => TileProtoBuf.toRawCells(band, protoCellType.dataType) }
+
+      columns.write(root, index, key)
+      bandsVector.setSafe(index, converted.bandCount)
+      colsVector.setSafe(index, converted.cols)
+      rowsVector.setSafe(index, converted.rows)
+      cellsVector.setSafe(index, Array.concat(bands: _*))
+    }
+
+    root.setRowCount(batch.size)
+
+    val out = new ByteArrayOutputStream()
+    val writer = new ArrowStreamWriter(root, null, Channels.newChannel(out))
+
+    writer.start()
+    writer.writeBatch()
+    writer.end()
+
+    writer.close()
+    root.close()
+    allocator.close()
+
+    out.toByteArray
+  }
+
+  private def readBatches[K](bytes: Array[Byte])(implicit columns: ArrowKeyColumns[K]): Seq[(K, MultibandTile)] = {
+    val allocator = new RootAllocator(Long.MaxValue)
+    val reader = new ArrowStreamReader(new ByteArrayInputStream(bytes), allocator)
+    val root = reader.getVectorSchemaRoot
+
+    val metadata = root.getSchema.getCustomMetadata.asScala
+    val dataType = ProtoCellType.DataType.fromName(metadata("dataType")).get
+
+    val protoCellType =
+      metadata.get("noData") match {
+        case Some(nd) => ProtoCellType(dataType, nd.toDouble, true)
+        case None => ProtoCellType(dataType, hasNoData = false)
+      }
+
+    val cellType = TileProtoBuf.messageToCellType(protoCellType)
+    val result = ArrayBuffer[(K, MultibandTile)]()
+
+    while (reader.loadNextBatch()) {
+      val bandsVector = root.getVector("bands").asInstanceOf[IntVector]
+      val colsVector = root.getVector("cols").asInstanceOf[IntVector]
+      val rowsVector = root.getVector("rows").asInstanceOf[IntVector]
+      val cellsVector = root.getVector("cells").asInstanceOf[VarBinaryVector]
+
+      for (index <- 0 until root.getRowCount) {
+        val (bandCount, cols, rows) = (bandsVector.get(index), colsVector.get(index), rowsVector.get(index))
+        val cells = cellsVector.get(index)
+
+        if (bandCount <= 0)
+          throw new IllegalArgumentException(s"Record $index of the Arrow batch has no bands.")
+
+        val bandBytes = cells.length / bandCount
+
+        val bands =
+          for (band <- 0 until bandCount) yield {
+            val buffer = ByteBuffer.wrap(cells, band * bandBytes, bandBytes).slice
+            TileProtoBuf.fromRawCells(buffer, dataType, cols, rows, cellType)
+          }
+
+        result += columns.read(root, index) -> MultibandTile(bands)
+      }
+    }
+
+    reader.close()
+    allocator.close()
+
+    result
+  }
+}
@@ -0,0 +1,159 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster._
+import geotrellis.raster.histogram._
+import geotrellis.raster.io._
+
+import spray.json._
+
+import spire.syntax.cfor._
+
+import org.apache.spark.rdd._
+import org.apache.spark.util.AccumulatorV2
+
+import scala.collection.mutable
+import scala.reflect._
+
+
+/** The histogram, the number of cells that are data and the number of
+  * cells that are NoData of each band of a layer, along with its number
+  * of tiles. These are stored as the `statistics` attribute of a layer.
+  */
+class LayerStatistics extends Serializable {
+  var tileCount: Long = 0L
+  var histograms: Array[StreamingHistogram] = Array()
+  var counts: Array[Long] = Array()
+  var noDataCounts: Array[Long] = Array()
+
+  def add(tile: MultibandTile): LayerStatistics = {
+    if (histograms.isEmpty) {
+      histograms = Array.fill(tile.bandCount)(StreamingHistogram())
+      counts = Array.ofDim[Long](tile.bandCount)
+      noDataCounts = Array.ofDim[Long](tile.bandCount)
+    }
+
+    cfor(0)(_ < math.min(histograms.length, tile.bandCount), _ + 1) { b =>
+      val histogram = histograms(b)
+      var count = 0L
+      var noDataCount = 0L
+
+      tile.band(b).foreachDouble { z =>
+        if (isData(z)) {
+          histogram.countItem(z, 1)
+          count += 1
+        } else
+          noDataCount += 1
+      }
+
+      counts(b) += count
+      noDataCounts(b) += noDataCount
+    }
+
+    tileCount += 1
+    this
+  }
+
+  /** Adds the statistics of `other` to these, without changing `other`. */
+  def merge(other: LayerStatistics): LayerStatistics = {
+    if (histograms.isEmpty) {
+      histograms = other.histograms.map { h => StreamingHistogram() + h }
+      counts = other.counts.clone
+      noDataCounts = other.noDataCounts.clone
+    } else
+      cfor(0)(_ < math.min(histograms.length, other.histograms.length), _ + 1) { b =>
+        histograms(b) = histograms(b) + other.histograms(b)
+        counts(b) += other.counts(b)
+        noDataCounts(b) += other.noDataCounts(b)
+      }
+
+    tileCount += other.tileCount
+    this
+  }
+
+  def toJson: JsValue =
+    JsObject(
+      "tileCount" -> JsNumber(tileCount),
+      "bands" -> JsArray(
+        histograms.indices.map { b =>
+          val histogram = histograms(b)
+
+          JsObject(
+            "histogram" -> histogram.asInstanceOf[Histogram[Double]].toJson,
+            "min" -> histogram.minValue.map { JsNumber(_) }.getOrElse(JsNull),
+            "max" -> histogram.maxValue.map { JsNumber(_) }.getOrElse(JsNull),
+            "count" -> JsNumber(counts(b)),
+            "noDataCount" -> JsNumber(noDataCounts(b)))
+        }.toVector))
+}
+
+
+/** Collects the [[LayerStatistics]] of each partition of an RDD as it is
+  * computed by another job.
+  *
+  * The statistics are kept by partition, and a partition that is computed
+  * more than once, such as when a task is retried, replaces its earlier
+  * statistics rather than being counted again.
+  */
+class LayerStatisticsAccumulator extends AccumulatorV2[(Int, LayerStatistics), LayerStatistics] {
+  private val partitions = mutable.Map[Int, LayerStatistics]()
+
+  def isZero: Boolean = partitions.isEmpty
+
+  def copy(): LayerStatisticsAccumulator = {
+    val accumulator = new LayerStatisticsAccumulator
+    accumulator.partitions ++= partitions
+    accumulator
+  }
+
+  def reset(): Unit = partitions.clear()
+
+  def add(partition: (Int, LayerStatistics)): Unit = partitions += partition
+
+  def merge(other: AccumulatorV2[(Int, LayerStatistics), LayerStatistics]): Unit =
+    other match {
+      case o: LayerStatisticsAccumulator => partitions ++= o.partitions
+      case _ => throw new UnsupportedOperationException(s"Cannot merge with ${other.getClass.getName}")
+    }
+
+  def value: LayerStatistics =
+    partitions.values.foldLeft(new LayerStatistics) { _ merge _ }
+}
+
+
+object LayerStatistics {
+  /** Computes the statistics of the layer in a job of its own. */
+  def apply[K](rdd: RDD[(K, MultibandTile)]): LayerStatistics =
+    rdd.treeAggregate(new LayerStatistics)({ (stats, tuple) => stats.add(tuple._2) }, _ merge _)
+
+  /** Returns the RDD with the statistics of each partition added to the
+    * accumulator once the partition has been fully computed. The RDD keeps
+    * the partitioner of `rdd`.
+    */
+  def collecting[K: ClassTag](
+    rdd: RDD[(K, MultibandTile)],
+    accumulator: LayerStatisticsAccumulator
+  ): RDD[(K, MultibandTile)] =
+    rdd.mapPartitionsWithIndex({ (index, iter) =>
+      val stats = new LayerStatistics
+      var reported = false
+
+      new Iterator[(K, MultibandTile)] {
+        def hasNext: Boolean = {
+          val more = iter.hasNext
+
+          if (!more && !reported) {
+            accumulator.add((index, stats))
+            reported = true
+          }
+
+          more
+        }
+
+        def next(): (K, MultibandTile) = {
+          val tuple = iter.next()
+          stats.add(tuple._2)
+          tuple
+        }
+      }
+    }, preservesPartitioning = true)
+}
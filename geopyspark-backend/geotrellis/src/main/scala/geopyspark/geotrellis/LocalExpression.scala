@@ -0,0 +1,263 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster._
+
+import spray.json._
+
+import spire.syntax.cfor._
+
+
+/** A tree of local map algebra operations on the bands of one or more
+  * layers and on constants.
+  *
+  * The tree is sent from Python as JSON. Each node is either
+  * `{"layer": i}`, which refers to the band of the `i`th layer,
+  * `{"int": v}` or `{"double": v}`, which are constants, or
+  * `{"op": name, "args": [...]}`, which applies one of the operations in
+  * [[LocalExpression.operations]] to its arguments.
+  *
+  * The whole tree is evaluated cell by cell, so that no intermediate tiles
+  * are made. The cell type of each node follows that of the GeoTrellis
+  * local operation it stands in for. An operation with a constant keeps the
+  * cell type of its other argument, and an operation on two bands takes the
+  * union of their cell types. A node whose cell type is integral is
+  * evaluated on ints and a node whose cell type is floating point is
+  * evaluated on doubles, with the same NoData handling as GeoTrellis.
+  */
+sealed trait LocalExpression extends Serializable
+
+case class LayerExpression(index: Int) extends LocalExpression
+case class IntConstantExpression(value: Int) extends LocalExpression
+case class DoubleConstantExpression(value: Double) extends LocalExpression
+case class OperationExpression(operation: String, args: Seq[LocalExpression]) extends LocalExpression
+
+
+object LocalExpression {
+  private trait Operation extends Serializable {
+    def combine(z1: Int, z2: Int): Int
+    def combine(z1: Double, z2: Double): Double
+  }
+
+  private object AddOperation extends Operation {
+    def combine(z1: Int, z2: Int): Int = if (isNoData(z1) || isNoData(z2)) NODATA else z1 + z2
+    def combine(z1: Double, z2: Double): Double = z1 + z2
+  }
+
+  private object SubtractOperation extends Operation {
+    def combine(z1: Int, z2: Int): Int = if (isNoData(z1) || isNoData(z2)) NODATA else z1 - z2
+    def combine(z1: Double, z2: Double): Double = z1 - z2
+  }
+
+  private object MultiplyOperation extends Operation {
+    def combine(z1: Int, z2: Int): Int = if (isNoData(z1) || isNoData(z2)) NODATA else z1 * z2
+    def combine(z1: Double, z2: Double): Double = z1 * z2
+  }
+
+  private object DivideOperation extends Operation {
+    def combine(z1: Int, z2: Int): Int =
+      if (isNoData(z1) || isNoData(z2) || z2 == 0) NODATA else z1 / z2
+
+    def combine(z1: Double, z2: Double): Double =
+      if (isNoData(z1) || isNoData(z2) || z2 == 0) Double.NaN else z1 / z2
+  }
+
+  private object PowOperation extends Operation {
+    def combine(z1: Int, z2: Int): Int =
+      if (isNoData(z1) || isNoData(z2)) NODATA else math.pow(z1, z2).toInt
+
+    def combine(z1: Double, z2: Double): Double = math.pow(z1, z2)
+  }
+
+  private object MaxOperation extends Operation {
+    def combine(z1: Int, z2: Int): Int =
+      if (isNoData(z1) || isNoData(z2)) NODATA else math.max(z1, z2)
+
+    def combine(z1: Double, z2: Double): Double =
+      if (isNoData(z1) || isNoData(z2)) Double.NaN else math.max(z1, z2)
+  }
+
+  /** The binary operations that may appear in an expression, by name.
+    * `abs` is the only unary operation.
+    */
+  private val operations: Map[String, Operation] =
+    Map(
+      "add" -> AddOperation,
+      "subtract" -> SubtractOperation,
+      "multiply" -> MultiplyOperation,
+      "divide" -> DivideOperation,
+      "pow" -> PowOperation,
+      "max" -> MaxOperation)
+
+  def fromJson(json: String): LocalExpression =
+    fromJson(json.parseJson)
+
+  private def fromJson(json: JsValue): LocalExpression =
+    json.asJsObject.fields.toList match {
+      case List(("layer", JsNumber(index))) =>
+        LayerExpression(index.toInt)
+      case List(("int", JsNumber(value))) =>
+        IntConstantExpression(value.toInt)
+      case List(("double", JsNumber(value))) =>
+        DoubleConstantExpression(value.toDouble)
+      case List(("double", JsString(value))) =>
+        // NaN and the infinities are not valid JSON numbers
+        DoubleConstantExpression(value.toDouble)
+      case _ =>
+        val fields = json.asJsObject.fields
+
+        (fields.get("op"), fields.get("args")) match {
+          case (Some(JsString("abs")), Some(JsArray(Vector(arg)))) =>
+            OperationExpression("abs", Seq(fromJson(arg)))
+          case (Some(JsString(name)), Some(JsArray(Vector(left, right)))) if operations.contains(name) =>
+            OperationExpression(name, Seq(fromJson(left), fromJson(right)))
+          case _ =>
+            throw new IllegalArgumentException(s"Invalid local expression: $json")
+        }
+    }
+
+  /** A node of an expression that has been bound to the bands it reads.
+    * `cellType` is `None` for constants, which take on the cell type of
+    * the other argument of their operation.
+    */
+  private abstract class Evaluator {
+    def cellType: Option[CellType]
+    def int(i: Int): Int
+    def double(i: Int): Double
+
+    final def isFloatingPoint: Boolean = cellType.exists(_.isFloatingPoint)
+  }
+
+  private class BandEvaluator(band: ArrayTile) extends Evaluator {
+    val cellType = Some(band.cellType)
+    def int(i: Int): Int = band(i)
+    def double(i: Int): Double = band.applyDouble(i)
+  }
+
+  private class ConstantEvaluator(intValue: Int, doubleValue: Double) extends Evaluator {
+    val cellType = None
+    def int(i: Int): Int = intValue
+    def double(i: Int): Double = doubleValue
+  }
+
+  private class AbsEvaluator(arg: Evaluator) extends Evaluator {
+    val cellType = arg.cellType
+
+    def int(i: Int): Int = {
+      val z = arg.int(i)
+      if (isNoData(z)) z else math.abs(z)
+    }
+
+    def double(i: Int): Double = math.abs(arg.double(i))
+  }
+
+  private class OperationEvaluator(operation: Operation, left: Evaluator, right: Evaluator) extends Evaluator {
+    val cellType =
+      (left.cellType, right.cellType) match {
+        case (Some(l), Some(r)) => Some(l.union(r))
+        case (l, r) => l.orElse(r)
+      }
+
+    private val floatingPoint = isFloatingPoint
+
+    def int(i: Int): Int =
+      if (floatingPoint) d2i(double(i)) else operation.combine(left.int(i), right.int(i))
+
+    def double(i: Int): Double =
+      if (floatingPoint) operation.combine(left.double(i), right.double(i)) else i2d(int(i))
+  }
+
+  private def bind(expression: LocalExpression, band: Int => ArrayTile): Evaluator =
+    expression match {
+      case LayerExpression(index) =>
+        new BandEvaluator(band(index))
+      case IntConstantExpression(value) =>
+        new ConstantEvaluator(value, i2d(value))
+      case DoubleConstantExpression(value) =>
+        new ConstantEvaluator(d2i(value), value)
+      case OperationExpression("abs", Seq(arg)) =>
+        new AbsEvaluator(bind(arg, band))
+      case OperationExpression(name, Seq(left, right)) =>
+        new OperationEvaluator(operations(name), bind(left, band), bind(right, band))
+    }
+
+  /** The cell type that the expression evaluates to, given the cell type
+    * of each of the bands it reads. This is `None` if the expression only
+    * has constants.
+    */
+  def cellType(expression: LocalExpression, bandCellType: Int => CellType): Option[CellType] =
+    expression match {
+      case LayerExpression(index) =>
+        Some(bandCellType(index))
+      case IntConstantExpression(_) | DoubleConstantExpression(_) =>
+        None
+      case OperationExpression("abs", Seq(arg)) =>
+        cellType(arg, bandCellType)
+      case OperationExpression(_, Seq(left, right)) =>
+        (cellType(left, bandCellType), cellType(right, bandCellType)) match {
+          case (Some(l), Some(r)) => Some(l.union(r))
+          case (l, r) => l.orElse(r)
+        }
+    }
+
+  private def evaluate(evaluator: Evaluator, cellType: CellType, cols: Int, rows: Int): Tile = {
+    val result = ArrayTile.empty(cellType, cols, rows)
+    val size = cols * rows
+
+    if (cellType.isFloatingPoint)
+      cfor(0)(_ < size, _ + 1) { i => result.updateDouble(i, evaluator.double(i)) }
+    else
+      cfor(0)(_ < size, _ + 1) { i => result.update(i, evaluator.int(i)) }
+
+    result
+  }
+
+  /** Evaluates the expression over the tiles that share a key, one per
+    * layer of the expression. Bands are paired up by index, so the result
+    * has as many bands as the tile with the fewest.
+    */
+  def evaluate(expression: LocalExpression, tiles: Seq[MultibandTile]): MultibandTile = {
+    val bandCount = tiles.map(_.bandCount).min
+
+    val bands =
+      for (b <- 0 until bandCount) yield {
+        val evaluator = bind(expression, { index => tiles(index).band(b).toArrayTile })
+        val cellType = evaluator.cellType.getOrElse(tiles.head.cellType)
+
+        evaluate(evaluator, cellType, tiles.head.cols, tiles.head.rows)
+      }
+
+    MultibandTile(bands)
+  }
+
+  /** Evaluates band math expressions over the bands of a single tile. Here
+    * `{"layer": i}` refers to the `i`th band of the tile. Each expression
+    * gives one band of the result, whose cells are of `cellType`.
+    *
+    * If `inputCellType` is set, the bands that are read are converted to it
+    * before the expressions are evaluated.
+    */
+  def evaluateBands(
+    expressions: Seq[LocalExpression],
+    tile: MultibandTile,
+    inputCellType: Option[CellType],
+    cellType: CellType
+  ): MultibandTile = {
+    val converted = Array.ofDim[ArrayTile](tile.bandCount)
+
+    // Each band is converted at most once, and only if it is read
+    def band(index: Int): ArrayTile = {
+      if (index >= tile.bandCount)
+        throw new IllegalArgumentException(
+          s"The band math expressions read band b$index, but the tile only has ${tile.bandCount} bands.")
+
+      if (converted(index) == null) {
+        val original = tile.band(index)
+        converted(index) = inputCellType.map { cellType => original.convert(cellType) }.getOrElse(original).toArrayTile
+      }
+
+      converted(index)
+    }
+
+    MultibandTile(expressions.map { expression => evaluate(bind(expression, band), cellType, tile.cols, tile.rows) })
+  }
+}
@@ -0,0 +1,219 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster._
+import geotrellis.raster.resample.ResampleMethod
+import geotrellis.spark._
+import geotrellis.spark.tiling._
+import geotrellis.util._
+import geotrellis.vector._
+
+import spire.syntax.cfor._
+
+import org.apache.spark.Partitioner
+import org.apache.spark.rdd._
+
+import scala.collection.mutable
+import scala.collection.mutable.ArrayBuffer
+import scala.reflect.ClassTag
+
+
+/** The tiles of several zoom levels that lie under one tile of the
+  * coarsest of them. Level `0` is the finest of the levels.
+  */
+class PyramidBlock(levelCount: Int) extends Serializable {
+  val levels: Array[mutable.Map[SpatialKey, MultibandTile]] =
+    Array.fill(levelCount)(mutable.Map[SpatialKey, MultibandTile]())
+
+  /** Adds the tiles of `other`, which were built from other source tiles. */
+  def merge(other: PyramidBlock): PyramidBlock = {
+    cfor(0)(_ < levelCount, _ + 1) { level =>
+      val tiles = levels(level)
+
+      other.levels(level).foreach { case (key, tile) =>
+        tiles(key) =
+          tiles.get(key) match {
+            case Some(existing) => existing.merge(tile)
+            case None => tile
+          }
+      }
+    }
+
+    this
+  }
+}
+
+
+/** The layouts of the levels that one shuffle of [[MultiLevelPyramid]]
+  * builds from the source layout, finest first.
+  */
+private class PyramidPass(
+  sourceLayout: LayoutDefinition,
+  layouts: Array[LayoutDefinition],
+  resampleMethod: ResampleMethod
+) extends Serializable {
+  private val topLayout = layouts.last
+
+  /** The tile of the coarsest level whose block builds the given tile. */
+  def blockOf(level: Int, key: SpatialKey): SpatialKey =
+    topLayout.mapTransform(layouts(level).mapTransform(key).center)
+
+  /** The blocks that the source tile contributes to. With a
+    * `ZoomedLayoutScheme` there is only ever one, but the layouts of a
+    * `LocalLayoutScheme` do not nest exactly.
+    */
+  def blocksOf(key: SpatialKey): Seq[SpatialKey] = {
+    val center = sourceLayout.mapTransform(key).center
+
+    layouts.indices.map { level => blockOf(level, layouts(level).mapTransform(center)) }.distinct
+  }
+
+  /** Resamples the source tile into each of the tiles of the block that it
+    * lies under.
+    */
+  def add(block: PyramidBlock, blockKey: SpatialKey, key: SpatialKey, tile: MultibandTile): PyramidBlock = {
+    val extent = sourceLayout.mapTransform(key)
+
+    cfor(0)(_ < layouts.length, _ + 1) { level =>
+      val layout = layouts(level)
+      val parent = layout.mapTransform(extent.center)
+
+      if (blockOf(level, parent) == blockKey) {
+        val tiles = block.levels(level)
+        val parentTile = tiles.getOrElse(parent, tile.prototype(layout.tileCols, layout.tileRows))
+
+        tiles(parent) = parentTile.merge(layout.mapTransform(parent), extent, tile, resampleMethod)
+      }
+    }
+
+    block
+  }
+}
+
+
+/** Builds a pyramid several levels at a time.
+  *
+  * Each pass groups the tiles of a layer by the tile of the coarsest of the
+  * next `levelsPerPass` levels that they lie under, and resamples them
+  * straight into each of those levels. This takes one shuffle per pass,
+  * rather than one per level as `Pyramid.levelStream` does. Each block is
+  * built as its tiles arrive, on both sides of the shuffle, so a block of
+  * `levelsPerPass` levels holds at most about `4^(levelsPerPass - 1) * 4/3`
+  * tiles, and the source tiles are never gathered.
+  */
+object MultiLevelPyramid {
+  /** The bounds of the layer in `nextLayout`, found as `Pyramid.up` finds
+    * them.
+    */
+  private def nextBounds[K: SpatialComponent](
+    bounds: Bounds[K],
+    sourceLayout: LayoutDefinition,
+    nextLayout: LayoutDefinition
+  ): Bounds[K] =
+    bounds match {
+      case EmptyBounds => EmptyBounds
+      case KeyBounds(minKey, maxKey) =>
+        val sourceRe = RasterExtent(sourceLayout.extent, sourceLayout.layoutCols, sourceLayout.layoutRows)
+        val targetRe = RasterExtent(sourceLayout.extent, nextLayout.layoutCols, nextLayout.layoutRows)
+
+        def next(key: K): K = {
+          val SpatialKey(col, row) = key.getComponent[SpatialKey]
+          val (x, y) = sourceRe.gridToMap(col, row)
+          val (nextCol, nextRow) = targetRe.mapToGrid(x, y)
+
+          key.setComponent(SpatialKey(nextCol, nextRow))
+        }
+
+        KeyBounds(next(minKey), next(maxKey))
+    }
+
+  /** Builds the levels from `startZoom - 1` down to `endZoom`, at most
+    * `levelsPerPass` of them in each pass, and returns them after the layer
+    * itself, from the finest to the coarsest.
+    */
+  def apply[K: SpatialComponent: ClassTag](
+    rdd: MultibandTileLayerRDD[K],
+    layoutScheme: LayoutScheme,
+    startZoom: Int,
+    endZoom: Int,
+    levelsPerPass: Int,
+    resampleMethod: ResampleMethod,
+    partitioner: Option[Partitioner]
+  ): Seq[(Int, MultibandTileLayerRDD[K])] = {
+    require(levelsPerPass > 0, s"levelsPerPass must be positive, got $levelsPerPass")
+
+    val levels = ArrayBuffer[(Int, MultibandTileLayerRDD[K])](startZoom -> rdd)
+
+    while (levels.last._1 > endZoom) {
+      val (zoom, source) = levels.last
+      levels ++= pass(source, layoutScheme, zoom, math.min(levelsPerPass, zoom - endZoom), resampleMethod, partitioner)
+    }
+
+    levels
+  }
+
+  private def pass[K: SpatialComponent: ClassTag](
+    rdd: MultibandTileLayerRDD[K],
+    layoutScheme: LayoutScheme,
+    zoom: Int,
+    levelCount: Int,
+    resampleMethod: ResampleMethod,
+    partitioner: Option[Partitioner]
+  ): Seq[(Int, MultibandTileLayerRDD[K])] = {
+    val metadata = rdd.metadata
+    val layoutLevels =
+      Iterator
+        .iterate(LayoutLevel(zoom, metadata.layout))(layoutScheme.zoomOut)
+        .drop(1)
+        .take(levelCount)
+        .toArray
+
+    val pyramidPass = new PyramidPass(metadata.layout, layoutLevels.map { _.layout }, resampleMethod)
+
+    val keyed: RDD[(K, (SpatialKey, SpatialKey, MultibandTile))] =
+      rdd.flatMap { case (key, tile) =>
+        val spatialKey = key.getComponent[SpatialKey]
+
+        pyramidPass.blocksOf(spatialKey).map { blockKey =>
+          (key.setComponent(blockKey), (blockKey, spatialKey, tile))
+        }
+      }
+
+    val createBlock = { (value: (SpatialKey, SpatialKey, MultibandTile)) =>
+      pyramidPass.add(new PyramidBlock(levelCount), value._1, value._2, value._3)
+    }
+
+    val addTile = { (block: PyramidBlock, value: (SpatialKey, SpatialKey, MultibandTile)) =>
+      pyramidPass.add(block, value._1, value._2, value._3)
+    }
+
+    val mergeBlocks = { (left: PyramidBlock, right: PyramidBlock) => left.merge(right) }
+
+    // The blocks are not persisted, as nothing would unpersist them once the
+    // levels are written. Each level below reads the shuffle files again and
+    // rebuilds the blocks from them, so the source is only read once, but
+    // the tiles are resampled once per level of the pass.
+    val blocks: RDD[(K, PyramidBlock)] =
+      partitioner match {
+        case Some(p) => keyed.combineByKey(createBlock, addTile, mergeBlocks, p)
+        case None => keyed.combineByKey(createBlock, addTile, mergeBlocks)
+      }
+
+    var bounds = metadata.bounds
+    var previousLayout = metadata.layout
+
+    layoutLevels.zipWithIndex.map { case (LayoutLevel(levelZoom, layout), level) =>
+      bounds = nextBounds(bounds, previousLayout, layout)
+      previousLayout = layout
+
+      // The tiles of the coarsest level are keyed by their block, and so keep its partitioner
+      val tiles: RDD[(K, MultibandTile)] =
+        blocks.mapPartitions({ iter =>
+          iter.flatMap { case (blockKey, block) =>
+            block.levels(level).iterator.map { case (spatialKey, tile) => blockKey.setComponent(spatialKey) -> tile }
+          }
+        }, preservesPartitioning = level == levelCount - 1)
+
+      levelZoom -> ContextRDD(tiles, metadata.copy(layout = layout, bounds = bounds))
+    }
+  }
+}
@@ -0,0 +1,74 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster.histogram._
+
+import java.nio.{ByteBuffer, ByteOrder}
+
+
+/** Packs the buckets of a histogram into one native-endian buffer so that
+  * they can be read in Python without a call per bucket.
+  *
+  * The buffer holds whether the histogram is of Ints as an Int, the maximum
+  * number of buckets as an Int, the number of buckets as a Long, the min
+  * and the max as Doubles (NaN if the histogram is empty), and then the
+  * label of each bucket as Doubles followed by the count of each bucket as
+  * Longs. Buckets are in ascending order of their labels.
+  */
+object PackedHistogram {
+  def encode(histogram: Histogram[_]): Array[Byte] =
+    histogram match {
+      case h: FastMapHistogram =>
+        val values = h.values.sorted
+
+        encode(
+          isInt = true,
+          h.maxBucketCount,
+          values.map { _.toDouble },
+          values.map { v => h.itemCount(v) },
+          h.minValue.map { _.toDouble },
+          h.maxValue.map { _.toDouble })
+      case h: StreamingHistogram =>
+        val buckets = h.buckets.sortBy { _.label }
+
+        encode(
+          isInt = false,
+          h.maxBucketCount,
+          buckets.map { _.label }.toArray,
+          buckets.map { _.count }.toArray,
+          h.minValue,
+          h.maxValue)
+      case _ =>
+        throw new IllegalArgumentException(s"Unable to pack $histogram.")
+    }
+
+  /** Packs a number of histograms, any of which may be `null`, one after
+    * the other. Each is preceded by its length in bytes as a Long, which is
+    * 0 for a `null` histogram.
+    */
+  def encodeAll(histograms: Seq[Histogram[_]]): Array[Byte] = {
+    val packed = histograms.map { histogram => if (histogram == null) Array[Byte]() else encode(histogram) }
+    val buffer = ByteBuffer.allocate(packed.map { _.length + 8 }.sum).order(ByteOrder.nativeOrder)
+
+    packed.foreach { bytes => buffer.putLong(bytes.length).put(bytes) }
+
+    buffer.array
+  }
+
+  private def encode(
+    isInt: Boolean,
+    maxBucketCount: Int,
+    labels: Array[Double],
+    counts: Array[Long],
+    min: Option[Double],
+    max: Option[Double]
+  ): Array[Byte] = {
+    val buffer = ByteBuffer.allocate(32 + labels.length * 16).order(ByteOrder.nativeOrder)
+
+    buffer.putInt(if (isInt) 1 else 0).putInt(maxBucketCount).putLong(labels.length)
+    buffer.putDouble(min.getOrElse(Double.NaN)).putDouble(max.getOrElse(Double.NaN))
+    labels.foreach { buffer.putDouble(_) }
+    counts.foreach { buffer.putLong(_) }
+
+    buffer.array
+  }
+}
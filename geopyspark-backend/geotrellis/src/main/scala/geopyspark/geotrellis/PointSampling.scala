@@ -0,0 +1,98 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster._
+import geotrellis.raster.resample.{PointResampleMethod, Resample}
+import geotrellis.vector._
+
+import spire.syntax.cfor._
+
+import java.nio.{ByteBuffer, ByteOrder}
+
+
+/** Helpers for sampling the cells of a layer at many points.
+  *
+  * Points are sent from Python as packed records of `(index: Long,
+  * x: Double, y: Double)` in native byte order, where `index` is the
+  * position of the point in the input. The samples are sent back a
+  * partition at a time as a packed chunk: the number of samples and the
+  * number of bands as two Ints, followed by the index of each sample as
+  * Longs, then for temporal layers the instant of each sample in epoch
+  * milliseconds as Longs, and then the values of each sample, band by
+  * band, as Doubles.
+  */
+object PointSampling {
+  final val PointRecordBytes: Int = 24
+
+  def decodePoints(bytes: Array[Byte]): Iterator[(Long, Double, Double)] = {
+    val buffer = ByteBuffer.wrap(bytes).order(ByteOrder.nativeOrder)
+
+    Iterator.fill(bytes.length / PointRecordBytes) {
+      (buffer.getLong, buffer.getDouble, buffer.getDouble)
+    }
+  }
+
+  /** Samples every band of the tile at the point, or returns `None` if the
+    * point does not fall within one of its cells.
+    */
+  def sample(
+    tile: MultibandTile,
+    extent: Extent,
+    x: Double,
+    y: Double,
+    resampleMethod: PointResampleMethod
+  ): Option[Array[Double]] = {
+    val rasterExtent = RasterExtent(extent, tile.cols, tile.rows)
+    val (col, row) = rasterExtent.mapToGrid(x, y)
+
+    if (col < 0 || col >= tile.cols || row < 0 || row >= tile.rows)
+      None
+    else {
+      val values = Array.ofDim[Double](tile.bandCount)
+
+      resampleMethod match {
+        case r: PointResampleMethod =>
+          val point = Point(x, y)
+
+          cfor(0)(_ < tile.bandCount, _ + 1) { b =>
+            values(b) = Resample(r, tile.band(b), extent).resampleDouble(point)
+          }
+        case _ =>
+          cfor(0)(_ < tile.bandCount, _ + 1) { b =>
+            values(b) = tile.band(b).getDouble(col, row)
+          }
+      }
+
+      Some(values)
+    }
+  }
+
+  def encodeSamples(samples: Iterator[(Long, Array[Double])]): Array[Byte] = {
+    val collected = samples.toArray
+
+    encode(collected.map { _._1 }, None, collected.map { _._2 })
+  }
+
+  def encodeTemporalSamples(samples: Iterator[(Long, Long, Array[Double])]): Array[Byte] = {
+    val collected = samples.toArray
+
+    encode(collected.map { _._1 }, Some(collected.map { _._2 }), collected.map { _._3 })
+  }
+
+  private def encode(indices: Array[Long], instants: Option[Array[Long]], values: Array[Array[Double]]): Array[Byte] = {
+    val count = indices.length
+    val bandCount = if (count == 0) 0 else values.head.length
+    val instantBytes = if (instants.isDefined) count * 8 else 0
+
+    val buffer =
+      ByteBuffer
+        .allocate(8 + count * 8 + instantBytes + count * bandCount * 8)
+        .order(ByteOrder.nativeOrder)
+
+    buffer.putInt(count).putInt(bandCount)
+    indices.foreach { buffer.putLong(_) }
+    instants.foreach { _.foreach { buffer.putLong(_) } }
+    values.foreach { _.foreach { buffer.putDouble(_) } }
+
+    buffer.array
+  }
+}
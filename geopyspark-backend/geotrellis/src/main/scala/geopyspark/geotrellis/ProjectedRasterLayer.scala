@@ -157,8 +157,12 @@ class ProjectedRasterLayer(val rdd: RDD[(ProjectedExtent, MultibandTile)]) exten
   def withRDD(result: RDD[(ProjectedExtent, MultibandTile)]): RasterLayer[ProjectedExtent] =
     ProjectedRasterLayer(result)
 
-  def toProtoRDD(): JavaRDD[Array[Byte]] =
-    PythonTranslator.toPython[(ProjectedExtent, MultibandTile), ProtoTuple](rdd)
+  def toProtoRDD(compression: String): JavaRDD[Array[Byte]] =
+    PythonTranslator.toPythonBatched[(ProjectedExtent, MultibandTile), ProtoTuple](rdd)(
+      compressedTupleProtoBufCodec[ProjectedExtent](compression))
+
+  def toArrowRDD(): JavaRDD[Array[Byte]] =
+    ArrowTranslator.toArrow(rdd)
 
   def toPngRDD(pngRDD: RDD[(ProjectedExtent, Array[Byte])]): JavaRDD[Array[Byte]] =
     PythonTranslator.toPython[(ProjectedExtent, Array[Byte]), ProtoTuple](pngRDD)
@@ -189,10 +193,13 @@ class ProjectedRasterLayer(val rdd: RDD[(ProjectedExtent, MultibandTile)]) exten
 object ProjectedRasterLayer {
   def fromProtoEncodedRDD(javaRDD: JavaRDD[Array[Byte]]): ProjectedRasterLayer =
     ProjectedRasterLayer(
-      PythonTranslator.fromPython[
+      PythonTranslator.fromPythonBatched[
         (ProjectedExtent, MultibandTile), ProtoTuple
       ](javaRDD, ProtoTuple.parseFrom))
 
+  def fromArrowEncodedRDD(javaRDD: JavaRDD[Array[Byte]]): ProjectedRasterLayer =
+    ProjectedRasterLayer(ArrowTranslator.fromArrow[ProjectedExtent](javaRDD))
+
   def apply(rdd: RDD[(ProjectedExtent, MultibandTile)]): ProjectedRasterLayer =
     new ProjectedRasterLayer(rdd)
 
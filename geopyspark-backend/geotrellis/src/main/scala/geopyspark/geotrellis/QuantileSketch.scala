@@ -0,0 +1,243 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster._
+
+import spire.syntax.cfor._
+
+import org.apache.spark.rdd._
+
+import java.nio.{ByteBuffer, ByteOrder}
+import java.util.Random
+
+import scala.collection.mutable.ArrayBuffer
+
+
+/** A mergeable streaming quantile sketch, after the KLL sketch of Karnin,
+  * Lang and Liberty.
+  *
+  * Values are added to the compactor at level 0. When the sketch is full,
+  * the compactor of a level is sorted and every other one of its values,
+  * starting at random, is promoted to the next level, where each value
+  * stands for twice as many values. The capacity of a level shrinks by a
+  * factor of 2/3 for each level below the top one, so that the sketch holds
+  * about `3k` values however many are added.
+  */
+class QuantileSketch(val k: Int, seed: Long) extends Serializable {
+  private val random = new Random(seed)
+  private val compactors = ArrayBuffer[Compactor](new Compactor)
+  private var size: Int = 0
+  private var maxSize: Int = capacity(0)
+
+  var count: Long = 0L
+  var min: Double = Double.NaN
+  var max: Double = Double.NaN
+
+  private def capacity(level: Int): Int = {
+    val depth = compactors.length - level - 1
+    math.ceil(math.pow(2.0 / 3.0, depth) * k).toInt + 1
+  }
+
+  private def grow(): Unit = {
+    compactors += new Compactor
+    maxSize = (0 until compactors.length).map(capacity).sum
+  }
+
+  private def compress(): Unit = {
+    var level = 0
+    var done = false
+
+    while (!done && level < compactors.length) {
+      if (compactors(level).length >= capacity(level)) {
+        if (level + 1 >= compactors.length) grow()
+        compactors(level).compact(random, compactors(level + 1))
+        size = compactors.map(_.length).sum
+        done = size < maxSize
+      }
+
+      level += 1
+    }
+  }
+
+  /** Adds the value to the sketch, unless it is NoData. */
+  def update(value: Double): Unit =
+    if (isData(value)) {
+      compactors(0).append(value)
+      size += 1
+      count += 1
+      if (!(value >= min)) min = value
+      if (!(value <= max)) max = value
+      if (size >= maxSize) compress()
+    }
+
+  def update(tile: Tile): Unit =
+    if (tile.cellType.isFloatingPoint)
+      tile.foreachDouble { z => update(z) }
+    else
+      tile.foreach { z => if (isData(z)) update(z.toDouble) }
+
+  def merge(other: QuantileSketch): QuantileSketch = {
+    while (compactors.length < other.compactors.length) grow()
+
+    cfor(0)(_ < other.compactors.length, _ + 1) { level =>
+      compactors(level).appendAll(other.compactors(level))
+    }
+
+    if (count == 0) {
+      min = other.min
+      max = other.max
+    } else if (other.count > 0) {
+      min = math.min(min, other.min)
+      max = math.max(max, other.max)
+    }
+
+    size = compactors.map(_.length).sum
+    count += other.count
+
+    while (size >= maxSize) compress()
+
+    this
+  }
+
+  /** The approximate normalized rank error of the sketch, with 99%
+    * confidence. This is the empirical bound of the KLL sketch of Apache
+    * DataSketches, which compacts in the same way.
+    */
+  def rankError: Double = 2.296 / math.pow(k, 0.9723)
+
+  /** Packs the sketch into a native-endian buffer: `k` and the number of
+    * values held as Ints, the number of values added as a Long, the min and
+    * the max as Doubles, and then the values held as Doubles followed by
+    * the weight of each of them as Longs.
+    */
+  def encode(): Array[Byte] = {
+    val buffer = ByteBuffer.allocate(32 + size * 16).order(ByteOrder.nativeOrder)
+
+    buffer.putInt(k).putInt(size).putLong(count).putDouble(min).putDouble(max)
+    compactors.foreach { compactor => cfor(0)(_ < compactor.length, _ + 1) { i => buffer.putDouble(compactor.items(i)) } }
+    compactors.zipWithIndex.foreach { case (compactor, level) =>
+      cfor(0)(_ < compactor.length, _ + 1) { _ => buffer.putLong(1L << level) }
+    }
+
+    buffer.array
+  }
+}
+
+
+/** The values of one level of a [[QuantileSketch]], in a growable array. */
+private class Compactor extends Serializable {
+  var items: Array[Double] = Array.ofDim[Double](16)
+  var length: Int = 0
+
+  def append(value: Double): Unit = {
+    if (length == items.length) items = java.util.Arrays.copyOf(items, length * 2)
+    items(length) = value
+    length += 1
+  }
+
+  def appendAll(other: Compactor): Unit =
+    cfor(0)(_ < other.length, _ + 1) { i => append(other.items(i)) }
+
+  /** Moves every other value, starting at random, to the next level. If
+    * there is an odd number of values, the smallest one stays.
+    */
+  def compact(random: Random, next: Compactor): Unit = {
+    java.util.Arrays.sort(items, 0, length)
+
+    val start = length % 2
+    val offset = if (random.nextBoolean) 1 else 0
+
+    cfor(start + offset)(_ < length, _ + 2) { i => next.append(items(i)) }
+    length = start
+  }
+}
+
+
+/** The [[QuantileSketch]] of each band of a layer, along with how many of
+  * its tiles were seen and how many of those were sampled.
+  */
+class LayerSketch(k: Int, seed: Long) extends Serializable {
+  var bands: Array[QuantileSketch] = Array()
+  var totalTiles: Long = 0L
+  var sampledTiles: Long = 0L
+
+  def add(tile: MultibandTile): Unit = {
+    if (bands.isEmpty) bands = Array.tabulate(tile.bandCount) { b => new QuantileSketch(k, seed + b) }
+
+    cfor(0)(_ < math.min(bands.length, tile.bandCount), _ + 1) { b => bands(b).update(tile.band(b)) }
+    sampledTiles += 1
+  }
+
+  def merge(other: LayerSketch): LayerSketch = {
+    if (bands.isEmpty)
+      bands = other.bands
+    else
+      bands.zip(other.bands).foreach { case (sketch, otherSketch) => sketch.merge(otherSketch) }
+
+    totalTiles += other.totalTiles
+    sampledTiles += other.sampledTiles
+    this
+  }
+
+  /** Packs the number of bands as an Int followed by four bytes of padding,
+    * the number of tiles seen and sampled as Longs, and then, for each band,
+    * the length of its packed sketch as a Long followed by the sketch as
+    * [[QuantileSketch.encode]] packs it.
+    */
+  def encode(): Array[Byte] = {
+    val encoded = bands.map { _.encode() }
+    val buffer = ByteBuffer.allocate(24 + encoded.map { 8 + _.length }.sum).order(ByteOrder.nativeOrder)
+
+    buffer.putInt(bands.length).putInt(0).putLong(totalTiles).putLong(sampledTiles)
+    encoded.foreach { bytes => buffer.putLong(bytes.length).put(bytes) }
+
+    buffer.array
+  }
+}
+
+
+object LayerSketch {
+  /** Sketches the cells of a sample of the tiles of the layer.
+    *
+    * Each tile is kept with a probability of `sampleFraction`, and each
+    * partition keeps at most `maxTiles` of these, chosen with reservoir
+    * sampling so that the tiles at the start of a partition are not
+    * favoured. The sketches of the partitions are merged with a tree
+    * aggregate.
+    */
+  def apply[K](
+    rdd: RDD[(K, MultibandTile)],
+    sampleFraction: Double,
+    maxTiles: Int,
+    k: Int,
+    seed: Long
+  ): LayerSketch =
+    rdd
+      .mapPartitionsWithIndex { (index, iter) =>
+        val random = new Random(seed + index)
+        val sketch = new LayerSketch(k, random.nextLong)
+        val reservoir = ArrayBuffer[MultibandTile]()
+        var kept = 0L
+
+        for ((_, tile) <- iter) {
+          sketch.totalTiles += 1
+
+          if (sampleFraction >= 1.0 || random.nextDouble < sampleFraction) {
+            kept += 1
+
+            if (maxTiles <= 0)
+              sketch.add(tile)
+            else if (reservoir.length < maxTiles)
+              reservoir += tile
+            else {
+              val slot = (random.nextDouble * kept).toLong
+              if (slot < maxTiles) reservoir(slot.toInt) = tile
+            }
+          }
+        }
+
+        reservoir.foreach(sketch.add)
+
+        Iterator(sketch)
+      }
+      .treeAggregate(new LayerSketch(k, seed))(_ merge _, _ merge _)
+}
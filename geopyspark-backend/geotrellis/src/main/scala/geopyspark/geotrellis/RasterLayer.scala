@@ -46,7 +46,13 @@ abstract class RasterLayer[K](implicit ev0: ClassTag[K], ev1: Component[K, Proje
   def partitionBy(partitionStrategy: PartitionStrategy): RasterLayer[K] =
     withRDD(rdd.partitionBy(partitionStrategy.producePartitioner(rdd.getNumPartitions).get))
 
-  def toProtoRDD(): JavaRDD[Array[Byte]]
+  def toProtoRDD(): JavaRDD[Array[Byte]] =
+    toProtoRDD("none")
+
+  /** Encode RDD as ProtoBuf bytes whose tile cells are compressed with the given method */
+  def toProtoRDD(compression: String): JavaRDD[Array[Byte]]
+
+  def toArrowRDD(): JavaRDD[Array[Byte]]
 
   def collectKeys(): java.util.ArrayList[Array[Byte]]
 
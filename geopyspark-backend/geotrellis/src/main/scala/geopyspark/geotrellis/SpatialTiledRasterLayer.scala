@@ -50,6 +50,7 @@ import org.apache.spark.rdd._
 import org.apache.spark.SparkContext._
 
 import java.util.ArrayList
+import java.nio.{ByteBuffer, ByteOrder}
 import scala.reflect._
 import scala.collection.JavaConverters._
 import scala.collection.mutable.ArrayBuffer
@@ -68,6 +69,11 @@ class SpatialTiledRasterLayer(
     PythonTranslator.toPython[MultibandTile, ProtoMultibandTile](tiles)
   }
 
+  def lookupMany(keys: java.util.ArrayList[Array[Byte]]): java.util.ArrayList[Array[Byte]] = {
+    val decoded = keys.asScala.map { bytes => spatialKeyProtoBufCodec.decode(ProtoSpatialKey.parseFrom(bytes)) }
+    PythonTranslator.toPython[(SpatialKey, MultibandTile), ProtoTuple](lookupKeys(decoded))
+  }
+
   def reproject(
     targetCRS: String,
     resampleMethod: ResampleMethod,
@@ -143,7 +149,17 @@ class SpatialTiledRasterLayer(
     SpatialTiledRasterLayer(zoom, tileLayer)
   }
 
-  def pyramid(resampleMethod: ResampleMethod, partitionStrategy: PartitionStrategy): Array[TiledRasterLayer[SpatialKey]] = {
+  def pyramid(resampleMethod: ResampleMethod, partitionStrategy: PartitionStrategy): Array[TiledRasterLayer[SpatialKey]] =
+    pyramid(resampleMethod, partitionStrategy, 1)
+
+  /** Builds the pyramid one level per shuffle with GeoTrellis' `Pyramid`, or
+    * `levelsPerPass` levels per shuffle with [[MultiLevelPyramid]].
+    */
+  def pyramid(
+    resampleMethod: ResampleMethod,
+    partitionStrategy: PartitionStrategy,
+    levelsPerPass: Int
+  ): Array[TiledRasterLayer[SpatialKey]] = {
     require(! rdd.metadata.bounds.isEmpty, "Can not pyramid an empty RDD")
 
     val partitioner =
@@ -162,10 +178,16 @@ class SpatialTiledRasterLayer(
           zoom -> new LocalLayoutScheme
       }
 
-    Pyramid.levelStream(
-      rdd, scheme, baseZoom, 0,
-      Pyramid.Options(resampleMethod=resampleMethod, partitioner=partitioner)
-    ).map{ x =>
+    val levels =
+      if (levelsPerPass <= 1)
+        Pyramid.levelStream(
+          rdd, scheme, baseZoom, 0,
+          Pyramid.Options(resampleMethod=resampleMethod, partitioner=partitioner)
+        )
+      else
+        MultiLevelPyramid(rdd, scheme, baseZoom, 0, levelsPerPass, resampleMethod, partitioner)
+
+    levels.map{ x =>
       SpatialTiledRasterLayer(Some(x._1), x._2)
     }.toArray
   }
@@ -402,8 +424,12 @@ class SpatialTiledRasterLayer(
   def toDouble(converted: RDD[(SpatialKey, MultibandTile)]): TiledRasterLayer[SpatialKey] =
     SpatialTiledRasterLayer(zoomLevel, MultibandTileLayerRDD(converted, rdd.metadata))
 
-  def toProtoRDD(): JavaRDD[Array[Byte]] =
-    PythonTranslator.toPython[(SpatialKey, MultibandTile), ProtoTuple](rdd)
+  def toProtoRDD(compression: String): JavaRDD[Array[Byte]] =
+    PythonTranslator.toPythonBatched[(SpatialKey, MultibandTile), ProtoTuple](rdd)(
+      compressedTupleProtoBufCodec[SpatialKey](compression))
+
+  def toArrowRDD(): JavaRDD[Array[Byte]] =
+    ArrowTranslator.toArrow(rdd)
 
   def toPngRDD(pngRDD: RDD[(SpatialKey, Array[Byte])]): JavaRDD[Array[Byte]] =
     PythonTranslator.toPython[(SpatialKey, Array[Byte]), ProtoTuple](pngRDD)
@@ -440,6 +466,23 @@ class SpatialTiledRasterLayer(
   def collectKeys(): java.util.ArrayList[Array[Byte]] =
     PythonTranslator.toPython[SpatialKey, ProtoSpatialKey](rdd.keys.collect)
 
+  def collectKeyColumns(): Array[Byte] = {
+    val chunks =
+      rdd.keys.mapPartitions { iter =>
+        val keys = iter.toArray
+        Iterator((keys.map { _.col }, keys.map { _.row }))
+      }.collect
+
+    val count = chunks.map { _._1.length }.sum
+    val buffer = ByteBuffer.allocate(count * 8).order(ByteOrder.nativeOrder)
+    val ints = buffer.asIntBuffer
+
+    chunks.foreach { case (cols, _) => ints.put(cols) }
+    chunks.foreach { case (_, rows) => ints.put(rows) }
+
+    buffer.array
+  }
+
   def getPointValues(
     points: java.util.Map[Long, Array[Byte]],
     resampleMethod: PointResampleMethod
@@ -480,6 +523,42 @@ class SpatialTiledRasterLayer(
       }.asJava
   }
 
+  /** Samples the layer at the points of an RDD, whose elements are packed
+    * as described in [[PointSampling]]. The points are keyed by the tile
+    * they fall in and co-grouped with the layer using its partitioner, so
+    * the tiles of the layer are not shuffled.
+    */
+  def samplePoints(
+    points: JavaRDD[Array[Byte]],
+    resampleMethod: PointResampleMethod
+  ): JavaRDD[Array[Byte]] = {
+    val mapTrans = rdd.metadata.layout.mapTransform
+    val partitioner = rdd.partitioner.getOrElse(new HashPartitioner(rdd.getNumPartitions))
+
+    val keyedPoints: RDD[(SpatialKey, (Long, Double, Double))] =
+      points.rdd.flatMap { bytes =>
+        PointSampling.decodePoints(bytes).map { case point @ (_, x, y) => (mapTrans.pointToKey(x, y), point) }
+      }
+
+    rdd
+      .cogroup(keyedPoints, partitioner)
+      .mapPartitions { iter =>
+        val samples =
+          iter.flatMap { case (key, (tiles, keyPoints)) =>
+            val extent = mapTrans(key)
+
+            for {
+              tile <- tiles.iterator
+              (index, x, y) <- keyPoints.iterator
+              values <- PointSampling.sample(tile, extent, x, y, resampleMethod)
+            } yield (index, values)
+          }
+
+        Iterator(PointSampling.encodeSamples(samples))
+      }
+      .toJavaRDD
+  }
+
   def _getPointValues(
     pointKeys: Map[SpatialKey, Array[(Long, Point)]],
     mapTrans: MapKeyTransform,
@@ -537,7 +616,7 @@ object SpatialTiledRasterLayer {
   ): SpatialTiledRasterLayer = {
     val md = metadata.parseJson.convertTo[TileLayerMetadata[SpatialKey]]
     val tileLayer = MultibandTileLayerRDD(
-      PythonTranslator.fromPython[(SpatialKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
+      PythonTranslator.fromPythonBatched[(SpatialKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
 
     SpatialTiledRasterLayer(None, tileLayer)
   }
@@ -549,7 +628,28 @@ object SpatialTiledRasterLayer {
   ): SpatialTiledRasterLayer = {
     val md = metadata.parseJson.convertTo[TileLayerMetadata[SpatialKey]]
     val tileLayer = MultibandTileLayerRDD(
-      PythonTranslator.fromPython[(SpatialKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
+      PythonTranslator.fromPythonBatched[(SpatialKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
+
+    SpatialTiledRasterLayer(Some(zoomLevel), tileLayer)
+  }
+
+  def fromArrowEncodedRDD(
+    javaRDD: JavaRDD[Array[Byte]],
+    metadata: String
+  ): SpatialTiledRasterLayer = {
+    val md = metadata.parseJson.convertTo[TileLayerMetadata[SpatialKey]]
+    val tileLayer = MultibandTileLayerRDD(ArrowTranslator.fromArrow[SpatialKey](javaRDD), md)
+
+    SpatialTiledRasterLayer(None, tileLayer)
+  }
+
+  def fromArrowEncodedRDD(
+    javaRDD: JavaRDD[Array[Byte]],
+    zoomLevel: Int,
+    metadata: String
+  ): SpatialTiledRasterLayer = {
+    val md = metadata.parseJson.convertTo[TileLayerMetadata[SpatialKey]]
+    val tileLayer = MultibandTileLayerRDD(ArrowTranslator.fromArrow[SpatialKey](javaRDD), md)
 
     SpatialTiledRasterLayer(Some(zoomLevel), tileLayer)
   }
@@ -667,7 +767,7 @@ object SpatialTiledRasterLayer {
     import geotrellis.raster.rasterize.Rasterizer.Options
 
     val scalaRDD =
-      PythonTranslator.fromPython[Feature[Geometry, CellValue], ProtoFeatureCellValue](featureRDD, ProtoFeatureCellValue.parseFrom)
+      PythonTranslator.fromPythonBatched[Feature[Geometry, CellValue], ProtoFeatureCellValue](featureRDD, ProtoFeatureCellValue.parseFrom)
 
     val fullEnvelope = scalaRDD.map(_.geom.envelope).reduce(_ combine _)
 
@@ -156,8 +156,12 @@ class TemporalRasterLayer(val rdd: RDD[(TemporalProjectedExtent, MultibandTile)]
   def withRDD(result: RDD[(TemporalProjectedExtent, MultibandTile)]): RasterLayer[TemporalProjectedExtent] =
     TemporalRasterLayer(result)
 
-  def toProtoRDD(): JavaRDD[Array[Byte]] =
-    PythonTranslator.toPython[(TemporalProjectedExtent, MultibandTile), ProtoTuple](rdd)
+  def toProtoRDD(compression: String): JavaRDD[Array[Byte]] =
+    PythonTranslator.toPythonBatched[(TemporalProjectedExtent, MultibandTile), ProtoTuple](rdd)(
+      compressedTupleProtoBufCodec[TemporalProjectedExtent](compression))
+
+  def toArrowRDD(): JavaRDD[Array[Byte]] =
+    ArrowTranslator.toArrow(rdd)
 
   def toPngRDD(pngRDD: RDD[(TemporalProjectedExtent, Array[Byte])]): JavaRDD[Array[Byte]] =
     PythonTranslator.toPython[(TemporalProjectedExtent, Array[Byte]), ProtoTuple](pngRDD)
@@ -225,10 +229,13 @@ class TemporalRasterLayer(val rdd: RDD[(TemporalProjectedExtent, MultibandTile)]
 object TemporalRasterLayer {
   def fromProtoEncodedRDD(javaRDD: JavaRDD[Array[Byte]]): TemporalRasterLayer =
     TemporalRasterLayer(
-      PythonTranslator.fromPython[
+      PythonTranslator.fromPythonBatched[
         (TemporalProjectedExtent, MultibandTile), ProtoTuple
       ](javaRDD, ProtoTuple.parseFrom))
 
+  def fromArrowEncodedRDD(javaRDD: JavaRDD[Array[Byte]]): TemporalRasterLayer =
+    TemporalRasterLayer(ArrowTranslator.fromArrow[TemporalProjectedExtent](javaRDD))
+
   def apply(rdd: RDD[(TemporalProjectedExtent, MultibandTile)]): TemporalRasterLayer =
     new TemporalRasterLayer(rdd)
 
@@ -50,6 +50,7 @@ import org.apache.spark.rdd._
 import org.apache.spark.SparkContext._
 
 import java.util.ArrayList
+import java.nio.{ByteBuffer, ByteOrder}
 import java.time.{ZonedDateTime, ZoneId}
 
 import scala.reflect._
@@ -193,6 +194,12 @@ class TemporalTiledRasterLayer(
       .sortWith({ (t1, t2) => (t1._1.compareTo(t2._1) <= 0) })
   }
 
+  /** Computes the statistics of every band within each geometry at each
+    * instant in a single job. See [[ZonalStatistics.series]].
+    */
+  def zonalSeries(wkbs: java.util.ArrayList[Array[Byte]], withHistograms: Boolean): JavaRDD[Array[Byte]] =
+    ZonalStatistics.series(rdd, wkbs.asScala.map { wkb => WKB.read(wkb) }.toArray, withHistograms).toJavaRDD
+
   def reproject(
     targetCRS: String,
     resampleMethod: ResampleMethod,
@@ -274,7 +281,17 @@ class TemporalTiledRasterLayer(
     TemporalTiledRasterLayer(zoom, tileLayer)
   }
 
-  def pyramid(resampleMethod: ResampleMethod, partitionStrategy: PartitionStrategy): Array[TiledRasterLayer[SpaceTimeKey]] = {
+  def pyramid(resampleMethod: ResampleMethod, partitionStrategy: PartitionStrategy): Array[TiledRasterLayer[SpaceTimeKey]] =
+    pyramid(resampleMethod, partitionStrategy, 1)
+
+  /** Builds the pyramid one level per shuffle with GeoTrellis' `Pyramid`, or
+    * `levelsPerPass` levels per shuffle with [[MultiLevelPyramid]].
+    */
+  def pyramid(
+    resampleMethod: ResampleMethod,
+    partitionStrategy: PartitionStrategy,
+    levelsPerPass: Int
+  ): Array[TiledRasterLayer[SpaceTimeKey]] = {
     require(! rdd.metadata.bounds.isEmpty, "Can not pyramid an empty RDD")
 
     val partitioner =
@@ -293,10 +310,16 @@ class TemporalTiledRasterLayer(
           zoom -> new LocalLayoutScheme
       }
 
-    Pyramid.levelStream(
-      rdd, scheme, baseZoom, 0,
-      Pyramid.Options(resampleMethod=resampleMethod, partitioner=partitioner)
-    ).map{ x =>
+    val levels =
+      if (levelsPerPass <= 1)
+        Pyramid.levelStream(
+          rdd, scheme, baseZoom, 0,
+          Pyramid.Options(resampleMethod=resampleMethod, partitioner=partitioner)
+        )
+      else
+        MultiLevelPyramid(rdd, scheme, baseZoom, 0, levelsPerPass, resampleMethod, partitioner)
+
+    levels.map{ x =>
       TemporalTiledRasterLayer(Some(x._1), x._2)
     }.toArray
   }
@@ -426,8 +449,12 @@ class TemporalTiledRasterLayer(
   def toDouble(converted: RDD[(SpaceTimeKey, MultibandTile)]): TiledRasterLayer[SpaceTimeKey] =
     TemporalTiledRasterLayer(zoomLevel, MultibandTileLayerRDD(converted, rdd.metadata))
 
-  def toProtoRDD(): JavaRDD[Array[Byte]] =
-    PythonTranslator.toPython[(SpaceTimeKey, MultibandTile), ProtoTuple](rdd)
+  def toProtoRDD(compression: String): JavaRDD[Array[Byte]] =
+    PythonTranslator.toPythonBatched[(SpaceTimeKey, MultibandTile), ProtoTuple](rdd)(
+      compressedTupleProtoBufCodec[SpaceTimeKey](compression))
+
+  def toArrowRDD(): JavaRDD[Array[Byte]] =
+    ArrowTranslator.toArrow(rdd)
 
   def toPngRDD(pngRDD: RDD[(SpaceTimeKey, Array[Byte])]): JavaRDD[Array[Byte]] =
     PythonTranslator.toPython[(SpaceTimeKey, Array[Byte]), ProtoTuple](pngRDD)
@@ -488,85 +515,76 @@ class TemporalTiledRasterLayer(
   def collectKeys(): java.util.ArrayList[Array[Byte]] =
     PythonTranslator.toPython[SpaceTimeKey, ProtoSpaceTimeKey](rdd.keys.collect)
 
-  def getPointValues(
-    points: java.util.Map[Long, Array[Byte]],
-    resampleMethod: PointResampleMethod
-  ): java.util.Map[Long, java.util.Map[String, Array[Double]]] = {
-    val mapTrans = rdd.metadata.layout.mapTransform
+  def lookupMany(keys: java.util.ArrayList[Array[Byte]]): java.util.ArrayList[Array[Byte]] = {
+    val decoded = keys.asScala.map { bytes => spaceTimeKeyProtoBufCodec.decode(ProtoSpaceTimeKey.parseFrom(bytes)) }
+    PythonTranslator.toPython[(SpaceTimeKey, MultibandTile), ProtoTuple](lookupKeys(decoded))
+  }
 
-    val idedKeys: Map[Long, Point] =
-      points
-        .asScala
-        .mapValues { WKB.read(_).asInstanceOf[Point] }
-        .toMap
-
-    val pointKeys =
-      idedKeys
-        .foldLeft(Map[SpatialKey, Array[(Long, Point)]]()) {
-          case (acc, elem) =>
-            val pointKey = mapTrans(elem._2)
-
-            acc.get(pointKey) match {
-              case Some(arr) => acc + (pointKey -> (elem +: arr))
-              case None => acc + (pointKey -> Array(elem))
-            }
-        }
+  def collectKeyColumns(): Array[Byte] = {
+    val chunks =
+      rdd.keys.mapPartitions { iter =>
+        val keys = iter.toArray
+        Iterator((keys.map { _.col }, keys.map { _.row }, keys.map { _.instant }))
+      }.collect
 
-    val matchedKeys =
-      resampleMethod match {
-        case r: PointResampleMethod => _getPointValues(pointKeys, mapTrans, r)
-        case _ => _getPointValues(pointKeys, mapTrans)
-      }
+    val count = chunks.map { _._1.length }.sum
+    val buffer = ByteBuffer.allocate(count * 16).order(ByteOrder.nativeOrder)
+    val ints = buffer.asIntBuffer
 
-    matchedKeys.mapValues { _.asJava }.asJava
-  }
+    chunks.foreach { case (cols, _, _) => ints.put(cols) }
+    chunks.foreach { case (_, rows, _) => ints.put(rows) }
 
-  def _getPointValues(
-    pointKeys: Map[SpatialKey, Array[(Long, Point)]],
-    mapTrans: MapKeyTransform,
-    resampleMethod: PointResampleMethod
-  ): Map[Long, Map[String, Array[Double]]] = {
-    val resamplePoint = (tile: Tile, extent: Extent, point: Point) =>
-      Resample(resampleMethod, tile, extent).resampleDouble(point)
-
-    rdd.flatMap { case (k, v) =>
-      pointKeys.get(k.getComponent[SpatialKey]) match {
-        case Some(arr) =>
-          val keyExtent = mapTrans(k)
-          val rasterExtent = RasterExtent(keyExtent, v.cols, v.rows)
-
-          arr.map { case (id, point) =>
-            (id -> Map(k.time.toString -> v.bands.map { resamplePoint(_, keyExtent, point) }.toArray ))
-          }
-        case None => Seq()
-      }
-    }.reduceByKey { case (m1, m2) => m1 ++ m2 }.collect().toMap
-  }
+    buffer.position(count * 8)
+    val longs = buffer.asLongBuffer
 
-  def _getPointValues(
-    pointKeys: Map[SpatialKey, Array[(Long, Point)]],
-    mapTrans: MapKeyTransform
-  ): Map[Long, Map[String, Array[Double]]] =
-    rdd.flatMap { case (k, v) =>
-      pointKeys.get(k.getComponent[SpatialKey]) match {
-        case Some(arr) =>
-          val keyExtent = mapTrans(k)
-          val rasterExtent = RasterExtent(keyExtent, v.cols, v.rows)
+    chunks.foreach { case (_, _, instants) => longs.put(instants) }
 
-          arr.map { case (id, point) =>
-            val (gridCol, gridRow) = rasterExtent.mapToGrid(point)
+    buffer.array
+  }
 
-            val values = Array.ofDim[Double](v.bandCount)
+  /** Samples the layer at the points of an RDD, whose elements are packed
+    * as described in [[PointSampling]], at every instant of the layer.
+    *
+    * The tiles of a temporal layer cannot be co-partitioned with points,
+    * which only have a spatial key. So only the tiles whose spatial keys
+    * hold points are shuffled to meet them.
+    */
+  def samplePoints(
+    points: JavaRDD[Array[Byte]],
+    resampleMethod: PointResampleMethod
+  ): JavaRDD[Array[Byte]] = {
+    val mapTrans = rdd.metadata.layout.mapTransform
+    val partitioner = new HashPartitioner(rdd.getNumPartitions)
 
-            cfor(0)(_ < v.bandCount, _ + 1){ index =>
-              values(index) = v.band(index).getDouble(gridCol, gridRow)
-            }
+    val keyedPoints: RDD[(SpatialKey, (Long, Double, Double))] =
+      points.rdd.flatMap { bytes =>
+        PointSampling.decodePoints(bytes).map { case point @ (_, x, y) => (mapTrans.pointToKey(x, y), point) }
+      }
 
-            (id -> Map(k.time.toString -> values))
+    // The tiles are keyed by their SpatialKey alone to be grouped with the
+    // points. Tiles without points get an empty group and produce no samples,
+    // so the points are only read once.
+    val keyedTiles: RDD[(SpatialKey, (Long, MultibandTile))] =
+      rdd.map { case (key, tile) => key.spatialKey -> (key.instant, tile) }
+
+    keyedTiles
+      .cogroup(keyedPoints, partitioner)
+      .mapPartitions { iter =>
+        val samples =
+          iter.flatMap { case (key, (tiles, keyPoints)) =>
+            val extent = mapTrans(key)
+
+            for {
+              (instant, tile) <- tiles.iterator
+              (index, x, y) <- keyPoints.iterator
+              values <- PointSampling.sample(tile, extent, x, y, resampleMethod)
+            } yield (index, instant, values)
           }
-        case None => Seq()
+
+        Iterator(PointSampling.encodeTemporalSamples(samples))
       }
-    }.reduceByKey { case (m1, m2) => m1 ++ m2 }.collect().toMap
+      .toJavaRDD
+  }
 
   def getCellValueCounts(areaOfInterest: Array[Byte], targetBand: Int): String = {
     val acc = new CountingAccumulator()
@@ -638,7 +656,7 @@ object TemporalTiledRasterLayer {
   ): TemporalTiledRasterLayer = {
     val md = metadata.parseJson.convertTo[TileLayerMetadata[SpaceTimeKey]]
     val tileLayer = MultibandTileLayerRDD(
-      PythonTranslator.fromPython[(SpaceTimeKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
+      PythonTranslator.fromPythonBatched[(SpaceTimeKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
 
     TemporalTiledRasterLayer(None, tileLayer)
   }
@@ -650,7 +668,28 @@ object TemporalTiledRasterLayer {
   ): TemporalTiledRasterLayer = {
     val md = metadata.parseJson.convertTo[TileLayerMetadata[SpaceTimeKey]]
     val tileLayer = MultibandTileLayerRDD(
-      PythonTranslator.fromPython[(SpaceTimeKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
+      PythonTranslator.fromPythonBatched[(SpaceTimeKey, MultibandTile), ProtoTuple](javaRDD, ProtoTuple.parseFrom), md)
+
+    TemporalTiledRasterLayer(Some(zoomLevel), tileLayer)
+  }
+
+  def fromArrowEncodedRDD(
+    javaRDD: JavaRDD[Array[Byte]],
+    metadata: String
+  ): TemporalTiledRasterLayer = {
+    val md = metadata.parseJson.convertTo[TileLayerMetadata[SpaceTimeKey]]
+    val tileLayer = MultibandTileLayerRDD(ArrowTranslator.fromArrow[SpaceTimeKey](javaRDD), md)
+
+    TemporalTiledRasterLayer(None, tileLayer)
+  }
+
+  def fromArrowEncodedRDD(
+    javaRDD: JavaRDD[Array[Byte]],
+    zoomLevel: Int,
+    metadata: String
+  ): TemporalTiledRasterLayer = {
+    val md = metadata.parseJson.convertTo[TileLayerMetadata[SpaceTimeKey]]
+    val tileLayer = MultibandTileLayerRDD(ArrowTranslator.fromArrow[SpaceTimeKey](javaRDD), md)
 
     TemporalTiledRasterLayer(Some(zoomLevel), tileLayer)
   }
@@ -227,6 +227,17 @@ abstract class TileLayer[K: ClassTag] {
       .quantileBreaks(n)
 
 
+  /** Sketches the quantiles of each band from a sample of the tiles. See
+    * [[LayerSketch]]. A `maxTiles` of 0 or less sets no limit.
+    */
+  def getQuantileSketch(sampleFraction: Double, maxTiles: Int, k: Int, seed: Long): Array[Byte] =
+    LayerSketch(rdd, sampleFraction, maxTiles, k, seed).encode()
+
+  /** The [[LayerStatistics]] of the layer as JSON, in the form in which
+    * they are stored as the `statistics` attribute of a layer.
+    */
+  def getStatistics(): String = LayerStatistics(rdd).toJson.compactPrint
+
   def getIntHistograms(): Array[Histogram[Int]] = rdd.histogramExactInt
 
   def getDoubleHistograms(): Array[Histogram[Double]] = rdd.histogram
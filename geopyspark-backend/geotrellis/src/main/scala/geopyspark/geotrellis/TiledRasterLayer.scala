@@ -70,6 +70,31 @@ abstract class TiledRasterLayer[K: SpatialComponent: JsonFormat: ClassTag: Bound
   def bands(bands: java.util.ArrayList[Int]): TiledRasterLayer[K] =
     withRDD(rdd.mapValues { multibandTile => multibandTile.subsetBands(bands.asScala) })
 
+  /** Finds the tiles of the given keys in a single job. If the layer has
+    * a partitioner, then only the partitions that the keys belong to are
+    * read.
+    */
+  protected def lookupKeys(keys: Seq[K]): Array[(K, MultibandTile)] = {
+    val wanted = keys.toSet
+
+    rdd.partitioner match {
+      case Some(partitioner) =>
+        val keysByPartition: Map[Int, Set[K]] = wanted.groupBy { key => partitioner.getPartition(key) }
+
+        rdd.sparkContext.runJob(
+          rdd,
+          (context: TaskContext, iter: Iterator[(K, MultibandTile)]) => {
+            val partitionKeys = keysByPartition(context.partitionId)
+            iter.filter { case (key, _) => partitionKeys.contains(key) }.toArray
+          },
+          keysByPartition.keys.toSeq.sorted
+        ).flatten
+
+      case None =>
+        rdd.filter { case (key, _) => wanted.contains(key) }.collect()
+    }
+  }
+
   def getZoom: Integer =
     zoomLevel match {
       case None => null
@@ -77,10 +102,22 @@ abstract class TiledRasterLayer[K: SpatialComponent: JsonFormat: ClassTag: Bound
     }
 
   /** Encode RDD as Avro bytes and return it with avro schema used */
-  def toProtoRDD(): JavaRDD[Array[Byte]]
+  def toProtoRDD(): JavaRDD[Array[Byte]] =
+    toProtoRDD("none")
+
+  /** Encode RDD as ProtoBuf bytes whose tile cells are compressed with the given method */
+  def toProtoRDD(compression: String): JavaRDD[Array[Byte]]
+
+  def toArrowRDD(): JavaRDD[Array[Byte]]
 
   def collectKeys(): java.util.ArrayList[Array[Byte]]
 
+  /** Collects the keys as native-endian columns packed into one buffer: the
+    * `col`s as Ints, then the `row`s as Ints and, for SpaceTimeKeys, the
+    * `instant`s as Longs.
+    */
+  def collectKeyColumns(): Array[Byte]
+
   def layerMetadata: String = rdd.metadata.toJson.prettyPrint
 
   def mask(wkbs: java.util.ArrayList[Array[Byte]]): TiledRasterLayer[K] = {
@@ -171,6 +208,7 @@ abstract class TiledRasterLayer[K: SpatialComponent: JsonFormat: ClassTag: Bound
   ): TiledRasterLayer[K]
 
   def pyramid(resampleMethod: ResampleMethod, partitionStrategy: PartitionStrategy): Array[_] // Array[TiledRasterLayer[K]]
+  def pyramid(resampleMethod: ResampleMethod, partitionStrategy: PartitionStrategy, levelsPerPass: Int): Array[_] // Array[TiledRasterLayer[K]]
 
   def focal(
     operation: String,
@@ -320,6 +358,51 @@ abstract class TiledRasterLayer[K: SpatialComponent: JsonFormat: ClassTag: Bound
   def reverseLocalPow(d: Double): TiledRasterLayer[K] =
     withRDD(rdd.mapValues { x => MultibandTile(x.bands.map { y => y.localPowValue(d) }) })
 
+  /** Evaluates a [[LocalExpression]], sent as JSON, in a single pass.
+    *
+    * This layer is layer 0 of the expression and `others` are the layers
+    * after it. The layers are co-grouped once, and only keys found in
+    * every layer are kept, as with the local operations above.
+    */
+  def localExpression(expression: String, others: ArrayList[TiledRasterLayer[K]]): TiledRasterLayer[K] = {
+    val parsed = LocalExpression.fromJson(expression)
+    val otherRDDs = others.asScala.map(_.rdd)
+
+    if (otherRDDs.isEmpty)
+      withRDD(rdd.mapValues { tile => LocalExpression.evaluate(parsed, Seq(tile)) })
+    else {
+      val partitioner = Partitioner.defaultPartitioner(rdd, otherRDDs: _*)
+
+      withRDD(
+        new CoGroupedRDD[K](rdd +: otherRDDs, partitioner)
+          .flatMapValues { groups =>
+            if (groups.forall(_.nonEmpty))
+              Some(LocalExpression.evaluate(parsed, groups.map(_.head.asInstanceOf[MultibandTile])))
+            else
+              None
+          }
+      )
+    }
+  }
+
+  def bandMath(expressions: ArrayList[String], cellType: String): TiledRasterLayer[K] = {
+    val parsed = expressions.asScala.map(LocalExpression.fromJson).toList
+    val inputCellType = Option(cellType).map(CellType.fromName)
+    val bandCellType = inputCellType.getOrElse(rdd.metadata.cellType)
+
+    // All of the bands of the result share the union of the cell types of the expressions
+    val outputCellType =
+      parsed
+        .flatMap { expression => LocalExpression.cellType(expression, { _ => bandCellType }) }
+        .reduceOption(_ union _)
+        .getOrElse(bandCellType)
+
+    val result =
+      rdd.mapValues { tile => LocalExpression.evaluateBands(parsed, tile, inputCellType, outputCellType) }
+
+    withContextRDD(ContextRDD(result, rdd.metadata.copy(cellType = outputCellType)))
+  }
+
   def convertDataType(newType: String): TiledRasterLayer[K] =
     withContextRDD(rdd.convert(CellType.fromName(newType)).asInstanceOf[ContextRDD[K, MultibandTile, TileLayerMetadata[K]]])
 
@@ -382,6 +465,18 @@ abstract class TiledRasterLayer[K: SpatialComponent: JsonFormat: ClassTag: Bound
       case multi: MultiPolygon => rdd.polygonalSumDouble(multi)
     }
 
+  /** Computes the statistics of every band within each of the geometries
+    * in a single job. See [[ZonalStatistics]].
+    */
+  def zonalStatistics(wkbs: ArrayList[Array[Byte]], withHistograms: Boolean): ZonalAccumulator =
+    ZonalStatistics(rdd, wkbs.asScala.map { wkb => WKB.read(wkb) }.toArray, withHistograms)
+
+  /** Computes the statistics of every band within each zone of a layer
+    * that shares the layout of this one. See [[ZonalStatistics.byZones]].
+    */
+  def zonalStatisticsBy(zones: TiledRasterLayer[K], withHistograms: Boolean): RasterZoneAccumulator =
+    ZonalStatistics.byZones(rdd, zones.rdd, withHistograms)
+
   def tobler(): TiledRasterLayer[K] = withRDD {
     rdd.withContext { rdd =>
       rdd.mapValues { bands =>
@@ -451,6 +546,9 @@ abstract class TiledRasterLayer[K: SpatialComponent: JsonFormat: ClassTag: Bound
 
   def isFloatingPointLayer(): Boolean = rdd.metadata.cellType.isFloatingPoint
 
+  /** The number of bands in the tiles of the layer, or 0 if it has no tiles. */
+  def bandCount(): Int = rdd.map { case (_, tile) => tile.bandCount }.take(1).headOption.getOrElse(0)
+
   protected def withRDD(result: RDD[(K, MultibandTile)]): TiledRasterLayer[K]
 
   def withContextRDD(result: ContextRDD[K, MultibandTile, TileLayerMetadata[K]]): TiledRasterLayer[K]
@@ -0,0 +1,465 @@
+package geopyspark.geotrellis
+
+import geotrellis.raster._
+import geotrellis.raster.histogram.StreamingHistogram
+import geotrellis.raster.rasterize._
+import geotrellis.spark._
+import geotrellis.spark.tiling._
+import geotrellis.util._
+import geotrellis.vector._
+
+import spire.syntax.cfor._
+
+import org.apache.spark.Partitioner
+import org.apache.spark.rdd._
+
+import java.nio.{ByteBuffer, ByteOrder}
+
+import scala.collection.mutable
+import scala.collection.mutable.ArrayBuffer
+import scala.reflect._
+
+
+/** Accumulates the statistics of the cells of each band of a number of
+  * zones in primitive arrays, indexed by `zone * bandCount + band`.
+  *
+  * The arrays are allocated when the first cell is added, as that is when
+  * the number of bands is known. The mean and the sum of squared
+  * differences from it are kept rather than the sum of squares so that the
+  * standard deviation stays accurate when accumulators are merged.
+  */
+class ZonalAccumulator(private var _zoneCount: Int, withHistograms: Boolean) extends Serializable {
+  private var bandCount: Int = 0
+  private var capacity: Int = 0
+
+  private var counts: Array[Long] = Array()
+  private var sums: Array[Double] = Array()
+  private var means: Array[Double] = Array()
+  private var squaredDifferences: Array[Double] = Array()
+  private var mins: Array[Double] = Array()
+  private var maxs: Array[Double] = Array()
+  private var histograms: Array[StreamingHistogram] = Array()
+
+  def zoneCount: Int = _zoneCount
+
+  private def allocate(bands: Int): Unit = {
+    bandCount = bands
+    resize(math.max(_zoneCount, 1))
+  }
+
+  private def resize(zones: Int): Unit = {
+    val size = zones * bandCount
+    val filled = capacity * bandCount
+
+    counts = java.util.Arrays.copyOf(counts, size)
+    sums = java.util.Arrays.copyOf(sums, size)
+    means = java.util.Arrays.copyOf(means, size)
+    squaredDifferences = java.util.Arrays.copyOf(squaredDifferences, size)
+    mins = java.util.Arrays.copyOf(mins, size)
+    maxs = java.util.Arrays.copyOf(maxs, size)
+    java.util.Arrays.fill(mins, filled, size, Double.PositiveInfinity)
+    java.util.Arrays.fill(maxs, filled, size, Double.NegativeInfinity)
+
+    if (withHistograms)
+      histograms = java.util.Arrays.copyOf(histograms, size)
+
+    capacity = zones
+  }
+
+  /** Adds a zone after the last one, and returns its index. */
+  def addZone(): Int = {
+    if (bandCount > 0 && _zoneCount == capacity)
+      resize(capacity * 2)
+
+    _zoneCount += 1
+    _zoneCount - 1
+  }
+
+  /** Adds the value of a cell of the band of the zone, unless it is NoData. */
+  def add(zone: Int, band: Int, value: Double): Unit =
+    if (isData(value)) {
+      val i = zone * bandCount + band
+      val count = counts(i) + 1
+      val delta = value - means(i)
+
+      counts(i) = count
+      sums(i) += value
+      means(i) += delta / count
+      squaredDifferences(i) += delta * (value - means(i))
+      if (value < mins(i)) mins(i) = value
+      if (value > maxs(i)) maxs(i) = value
+
+      if (withHistograms) {
+        if (histograms(i) == null) histograms(i) = StreamingHistogram()
+        histograms(i).countItem(value, 1)
+      }
+    }
+
+  /** Prepares the accumulator for the cells of the tile. This returns the
+    * bands that can be accumulated, which are those of the first tile.
+    */
+  def bandsOf(tile: MultibandTile): Array[Tile] = {
+    if (bandCount == 0) allocate(tile.bandCount)
+
+    tile.bands.take(bandCount).toArray
+  }
+
+  /** Adds every cell of the tile that the geometry covers to the zone. */
+  def add(zone: Int, geometry: Geometry, tile: MultibandTile, rasterExtent: RasterExtent): Unit = {
+    val bands = bandsOf(tile)
+
+    Rasterizer.foreachCellByGeometry(geometry, rasterExtent) { (col, row) =>
+      cfor(0)(_ < bands.length, _ + 1) { b =>
+        add(zone, b, bands(b).getDouble(col, row))
+      }
+    }
+  }
+
+  def merge(other: ZonalAccumulator): ZonalAccumulator =
+    merge(other, { zone => zone })
+
+  /** A copy of the statistics of one zone, as an accumulator with a single
+    * zone.
+    */
+  def zone(index: Int): ZonalAccumulator = {
+    val result = new ZonalAccumulator(1, withHistograms)
+
+    if (bandCount > 0) {
+      val from = index * bandCount
+
+      result.allocate(bandCount)
+      System.arraycopy(counts, from, result.counts, 0, bandCount)
+      System.arraycopy(sums, from, result.sums, 0, bandCount)
+      System.arraycopy(means, from, result.means, 0, bandCount)
+      System.arraycopy(squaredDifferences, from, result.squaredDifferences, 0, bandCount)
+      System.arraycopy(mins, from, result.mins, 0, bandCount)
+      System.arraycopy(maxs, from, result.maxs, 0, bandCount)
+
+      if (withHistograms)
+        System.arraycopy(histograms, from, result.histograms, 0, bandCount)
+    }
+
+    result
+  }
+
+  /** Merges the statistics of the zones of `other` into this accumulator,
+    * where `zoneOf` gives the index in this accumulator of each zone of
+    * `other`.
+    */
+  def merge(other: ZonalAccumulator, zoneOf: Int => Int): ZonalAccumulator =
+    if (other.bandCount == 0)
+      this
+    else {
+      if (bandCount == 0) allocate(other.bandCount)
+
+      cfor(0)(_ < other._zoneCount, _ + 1) { zone =>
+        val offset = zoneOf(zone) * bandCount - zone * bandCount
+
+        cfor(zone * bandCount)(_ < (zone + 1) * bandCount, _ + 1) { j =>
+          val i = j + offset
+          val count = counts(i) + other.counts(j)
+
+          if (other.counts(j) > 0) {
+            val delta = other.means(j) - means(i)
+
+            squaredDifferences(i) +=
+              other.squaredDifferences(j) + delta * delta * counts(i) * other.counts(j) / count
+            means(i) += delta * other.counts(j) / count
+          }
+
+          counts(i) = count
+          sums(i) += other.sums(j)
+          mins(i) = math.min(mins(i), other.mins(j))
+          maxs(i) = math.max(maxs(i), other.maxs(j))
+
+          if (withHistograms && other.histograms(j) != null)
+            histograms(i) = if (histograms(i) == null) other.histograms(j) else histograms(i) + other.histograms(j)
+        }
+      }
+
+      this
+    }
+
+  /** Packs the statistics into one native-endian buffer: the number of
+    * zones and the number of bands as two Ints, followed by the counts as
+    * Longs and then the sums, means, sums of squared differences from the
+    * means, mins and maxs as Doubles.
+    */
+  def encode(): Array[Byte] = {
+    val size = _zoneCount * bandCount
+    val buffer = ByteBuffer.allocate(8 + size * 6 * 8).order(ByteOrder.nativeOrder)
+
+    buffer.putInt(_zoneCount).putInt(bandCount)
+    cfor(0)(_ < size, _ + 1) { i => buffer.putLong(counts(i)) }
+
+    for (column <- Seq(sums, means, squaredDifferences, mins, maxs))
+      cfor(0)(_ < size, _ + 1) { i => buffer.putDouble(column(i)) }
+
+    buffer.array
+  }
+
+  /** Packs the histogram of each band of each zone with
+    * [[PackedHistogram.encodeAll]], in the order of [[encode]]. The
+    * histograms of bands without cells are `null`.
+    */
+  def encodeHistograms(): Array[Byte] = {
+    val size = _zoneCount * bandCount
+
+    if (withHistograms)
+      PackedHistogram.encodeAll(histograms.take(size).toSeq)
+    else
+      PackedHistogram.encodeAll(Seq.fill(size)(null))
+  }
+}
+
+
+/** A [[ZonalAccumulator]] whose zones are found as the cells are added,
+  * rather than known ahead of time. Each zone is given the next index of
+  * the accumulator when it is first seen.
+  */
+abstract class KeyedZonalAccumulator[Z](withHistograms: Boolean) extends Serializable {
+  protected val statistics = new ZonalAccumulator(0, withHistograms)
+  protected val zones = ArrayBuffer[Z]()
+  private val indices = mutable.HashMap[Z, Int]()
+
+  protected def indexOf(zone: Z): Int =
+    indices.getOrElseUpdate(zone, { zones += zone; statistics.addZone() })
+
+  protected def mergeZones(other: KeyedZonalAccumulator[Z]): Unit = {
+    val otherIndices = other.zones.map(indexOf).toArray
+
+    statistics.merge(other.statistics, { zone => otherIndices(zone) })
+  }
+
+  /** Packs the statistics as [[ZonalAccumulator.encode]] does. */
+  def encode(): Array[Byte] = statistics.encode()
+
+  /** Packs the histograms as [[ZonalAccumulator.encodeHistograms]] does. */
+  def encodeHistograms(): Array[Byte] = statistics.encodeHistograms()
+
+  /** The statistics of each zone, as accumulators with a single zone. */
+  def zoneStatistics: Iterator[(Z, ZonalAccumulator)] =
+    zones.iterator.zipWithIndex.map { case (zone, index) => (zone, statistics.zone(index)) }
+
+  /** Merges the statistics of a single zone into the zone. */
+  def add(zone: Z, zoneStatistics: ZonalAccumulator): Unit = {
+    val index = indexOf(zone)
+
+    statistics.merge(zoneStatistics, { _ => index })
+  }
+
+  /** Packs [[encodeZones]], [[encode]] and, if they are kept,
+    * [[encodeHistograms]] into one buffer, each preceded by its length in
+    * bytes as a Long.
+    */
+  def encodeAll(): Array[Byte] = {
+    val sections = Seq(encodeZones(), encode(), if (withHistograms) encodeHistograms() else Array[Byte]())
+    val buffer = ByteBuffer.allocate(sections.map { _.length + 8 }.sum).order(ByteOrder.nativeOrder)
+
+    sections.foreach { section => buffer.putLong(section.length).put(section) }
+
+    buffer.array
+  }
+
+  /** Packs the zones as native-endian columns, in the order of the zones
+    * of [[encode]].
+    */
+  def encodeZones(): Array[Byte]
+}
+
+
+/** Accumulates the statistics of the zones given by the cells of a zone
+  * tile.
+  */
+class RasterZoneAccumulator(withHistograms: Boolean) extends KeyedZonalAccumulator[Int](withHistograms) {
+  /** Adds the cells of the tile to the zones given by the cells of the
+    * zone tile. Cells whose zone is NoData are skipped.
+    */
+  def add(zoneTile: Tile, tile: MultibandTile): Unit = {
+    val bands = statistics.bandsOf(tile)
+    val cols = math.min(zoneTile.cols, tile.cols)
+    val rows = math.min(zoneTile.rows, tile.rows)
+
+    cfor(0)(_ < rows, _ + 1) { row =>
+      cfor(0)(_ < cols, _ + 1) { col =>
+        val zone = zoneTile.get(col, row)
+
+        if (isData(zone)) {
+          val index = indexOf(zone)
+
+          cfor(0)(_ < bands.length, _ + 1) { b =>
+            statistics.add(index, b, bands(b).getDouble(col, row))
+          }
+        }
+      }
+    }
+  }
+
+  def merge(other: RasterZoneAccumulator): RasterZoneAccumulator = {
+    mergeZones(other)
+    this
+  }
+
+  /** Packs the value of each zone as Ints. */
+  def encodeZones(): Array[Byte] = {
+    val buffer = ByteBuffer.allocate(zones.length * 4).order(ByteOrder.nativeOrder)
+
+    zones.foreach { buffer.putInt(_) }
+    buffer.array
+  }
+}
+
+
+/** Accumulates the statistics of each geometry at each instant of a
+  * temporal layer, where the zones are `(geometry index, instant)` pairs.
+  */
+class ZonalSeriesAccumulator(withHistograms: Boolean) extends KeyedZonalAccumulator[(Int, Long)](withHistograms) {
+  /** Adds every cell of the tile that the geometry covers to the geometry
+    * at the instant of the tile.
+    */
+  def add(geometryIndex: Int, instant: Long, geometry: Geometry, tile: MultibandTile, rasterExtent: RasterExtent): Unit = {
+    statistics.bandsOf(tile)
+    statistics.add(indexOf((geometryIndex, instant)), geometry, tile, rasterExtent)
+  }
+
+  def merge(other: ZonalSeriesAccumulator): ZonalSeriesAccumulator = {
+    mergeZones(other)
+    this
+  }
+
+  /** Packs the index of the geometry of each zone as Ints, followed by the
+    * instant of each zone in epoch milliseconds as Longs.
+    */
+  def encodeZones(): Array[Byte] = {
+    val buffer = ByteBuffer.allocate(zones.length * 12).order(ByteOrder.nativeOrder)
+
+    zones.foreach { case (geometryIndex, _) => buffer.putInt(geometryIndex) }
+    zones.foreach { case (_, instant) => buffer.putLong(instant) }
+    buffer.array
+  }
+}
+
+
+object ZonalStatistics {
+  /** Keys the index of each geometry by the `SpatialKey`s that it intersects. */
+  def keyGeometries(geometries: Array[Geometry], layout: LayoutDefinition): Map[SpatialKey, Array[Int]] =
+    geometries
+      .zipWithIndex
+      .flatMap { case (geometry, index) => layout.mapTransform.keysForGeometry(geometry).map { (_, index) } }
+      .groupBy { _._1 }
+      .map { case (key, indices) => (key, indices.map { _._2 }) }
+
+  /** Computes the statistics of every geometry in one pass over the layer.
+    *
+    * The geometries are keyed by the `SpatialKey`s they intersect on the
+    * driver and broadcast, so the tiles of the layer are not moved. Each
+    * partition accumulates the statistics of all of the geometries, and the
+    * accumulators of the partitions are merged with a tree aggregate.
+    */
+  def apply[K: SpatialComponent: ClassTag](
+    rdd: RDD[(K, MultibandTile)] with Metadata[TileLayerMetadata[K]],
+    geometries: Array[Geometry],
+    withHistograms: Boolean
+  ): ZonalAccumulator = {
+    val layout = rdd.metadata.layout
+    val index = rdd.sparkContext.broadcast(keyGeometries(geometries, layout))
+    val broadcastGeometries = rdd.sparkContext.broadcast(geometries)
+    val zoneCount = geometries.length
+
+    rdd
+      .mapPartitions { iter =>
+        val accumulator = new ZonalAccumulator(zoneCount, withHistograms)
+        val geometriesByKey = index.value
+        val allGeometries = broadcastGeometries.value
+
+        for ((key, tile) <- iter) {
+          val spatialKey = key.getComponent[SpatialKey]
+
+          for (zones <- geometriesByKey.get(spatialKey)) {
+            val rasterExtent = RasterExtent(layout.mapTransform(spatialKey), tile.cols, tile.rows)
+
+            zones.foreach { zone => accumulator.add(zone, allGeometries(zone), tile, rasterExtent) }
+          }
+        }
+
+        Iterator(accumulator)
+      }
+      .treeAggregate(new ZonalAccumulator(zoneCount, withHistograms))(_ merge _, _ merge _)
+  }
+
+  /** Computes the statistics of the layer within each zone of a zone layer
+    * that shares its layout, where the zones are the values of the first
+    * band of the zone layer.
+    *
+    * The two layers are co-grouped by key, which does not move the tiles of
+    * either layer if they already share a partitioner. Each partition
+    * accumulates the statistics of the zones it sees, and the accumulators
+    * of the partitions are merged with a tree aggregate.
+    */
+  def byZones[K: ClassTag](
+    rdd: RDD[(K, MultibandTile)],
+    zones: RDD[(K, MultibandTile)],
+    withHistograms: Boolean
+  ): RasterZoneAccumulator = {
+    val partitioner = Partitioner.defaultPartitioner(rdd, zones)
+
+    new CoGroupedRDD[K](Seq(rdd, zones), partitioner)
+      .mapPartitions { iter =>
+        val accumulator = new RasterZoneAccumulator(withHistograms)
+
+        for ((_, Array(tiles, zoneTiles)) <- iter; tile <- tiles; zoneTile <- zoneTiles)
+          accumulator.add(zoneTile.asInstanceOf[MultibandTile].band(0), tile.asInstanceOf[MultibandTile])
+
+        Iterator(accumulator)
+      }
+      .treeAggregate(new RasterZoneAccumulator(withHistograms))(_ merge _, _ merge _)
+  }
+
+  /** Computes the statistics of every geometry at every instant of a
+    * temporal layer in one pass over the layer.
+    *
+    * As in [[apply]], the geometries are indexed by the `SpatialKey`s they
+    * intersect and broadcast. Only the geometries and instants that are
+    * seen by a partition are accumulated by it. The statistics of each
+    * `(geometry, instant)` zone are then reduced by key, so no one task or
+    * the driver has to hold all of them, and each partition of the result
+    * is packed with [[KeyedZonalAccumulator.encodeAll]].
+    */
+  def series(
+    rdd: RDD[(SpaceTimeKey, MultibandTile)] with Metadata[TileLayerMetadata[SpaceTimeKey]],
+    geometries: Array[Geometry],
+    withHistograms: Boolean
+  ): RDD[Array[Byte]] = {
+    val layout = rdd.metadata.layout
+    val index = rdd.sparkContext.broadcast(keyGeometries(geometries, layout))
+    val broadcastGeometries = rdd.sparkContext.broadcast(geometries)
+
+    rdd
+      .mapPartitions { iter =>
+        val accumulator = new ZonalSeriesAccumulator(withHistograms)
+        val geometriesByKey = index.value
+        val allGeometries = broadcastGeometries.value
+
+        for ((key, tile) <- iter) {
+          val spatialKey = key.spatialKey
+
+          for (zones <- geometriesByKey.get(spatialKey)) {
+            val rasterExtent = RasterExtent(layout.mapTransform(spatialKey), tile.cols, tile.rows)
+
+            zones.foreach { zone => accumulator.add(zone, key.instant, allGeometries(zone), tile, rasterExtent) }
+          }
+        }
+
+        accumulator.zoneStatistics
+      }
+      .reduceByKey(_ merge _)
+      .mapPartitions { iter =>
+        val accumulator = new ZonalSeriesAccumulator(withHistograms)
+
+        for ((zone, statistics) <- iter)
+          accumulator.add(zone, statistics)
+
+        Iterator(accumulator.encodeAll())
+      }
+  }
+}
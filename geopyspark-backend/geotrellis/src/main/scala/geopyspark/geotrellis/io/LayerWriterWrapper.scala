@@ -14,6 +14,7 @@ import geotrellis.spark.io.s3._
 import geotrellis.vector._
 
 import spray.json._
+import spray.json.DefaultJsonProtocol._
 
 import org.apache.spark._
 import org.apache.spark.api.java.JavaRDD
@@ -21,6 +22,9 @@ import org.apache.spark.rdd.RDD
 
 import java.time.ZonedDateTime
 
+import scala.reflect.ClassTag
+import scala.util.Try
+
 
 /**
   * Base wrapper class for all backends that provide a
@@ -33,6 +37,28 @@ class LayerWriterWrapper(attributeStore: AttributeStore, uri: String, useCOGs: B
     else
       Right(LayerWriter(attributeStore, uri))
 
+  private var schedulerPool: Option[String] = None
+
+  /** Runs the jobs of the writes of this writer in the given scheduler
+    * pool, or in the default pool if it is `null`.
+    */
+  def setSchedulerPool(pool: String): Unit =
+    schedulerPool = Option(pool)
+
+  /** Sets the scheduler pool of the calling thread for the jobs run by
+    * `write`. Each write from Python runs in a thread of its own, so the
+    * pool is set and restored around it.
+    */
+  private def inSchedulerPool[T](sc: SparkContext)(write: => T): T =
+    schedulerPool match {
+      case None => write
+      case Some(pool) =>
+        val previous = sc.getLocalProperty("spark.scheduler.pool")
+        sc.setLocalProperty("spark.scheduler.pool", pool)
+
+        try write finally sc.setLocalProperty("spark.scheduler.pool", previous)
+    }
+
   private def getSpatialIndexMethod(indexStrategy: String): KeyIndexMethod[SpatialKey] =
     indexStrategy match {
       case "zorder" => ZCurveKeyIndexMethod
@@ -83,23 +109,55 @@ class LayerWriterWrapper(attributeStore: AttributeStore, uri: String, useCOGs: B
       case None => LayerId(layerName, 0)
     }
 
+  /** Writes the layer with `write`. If `computeStatistics` is true, the
+    * [[LayerStatistics]] of the layer are collected as the writer reads its
+    * tiles, and are then stored as the `statistics` attribute of the layer.
+    */
+  private def writeWithStatistics[K: ClassTag](
+    id: LayerId,
+    layer: TiledRasterLayer[K],
+    computeStatistics: Boolean
+  )(write: RDD[(K, MultibandTile)] with Metadata[TileLayerMetadata[K]] => Unit): Unit =
+    inSchedulerPool(layer.rdd.sparkContext) {
+      if (computeStatistics) {
+        val rdd = layer.rdd
+        val accumulator = new LayerStatisticsAccumulator
+
+        rdd.sparkContext.register(accumulator, s"statistics of ${id.name} at ${id.zoom}")
+        write(ContextRDD(LayerStatistics.collecting(rdd, accumulator), rdd.metadata))
+        attributeStore.write(id, "statistics", accumulator.value.toJson)
+      } else
+        write(layer.rdd)
+    }
+
+  /** Removes the stored statistics of a layer whose tiles have changed.
+    * Not every backend tolerates deleting a missing attribute, so failures
+    * are ignored.
+    */
+  private def clearStatistics(id: LayerId): Unit =
+    Try(attributeStore.delete(id, "statistics"))
+
   def writeSpatial(
     layerName: String,
     spatialRDD: TiledRasterLayer[SpatialKey],
     indexStrategy: String
+  ): Unit =
+    writeSpatial(layerName, spatialRDD, indexStrategy, false)
+
+  def writeSpatial(
+    layerName: String,
+    spatialRDD: TiledRasterLayer[SpatialKey],
+    indexStrategy: String,
+    computeStatistics: Boolean
   ): Unit = {
     val indexMethod = getSpatialIndexMethod(indexStrategy)
-    layerWriter match {
-      case Left(cogWriter) =>
-        val zoom = spatialRDD.zoomLevel.getOrElse(0)
-        cogWriter.write(layerName, spatialRDD.rdd, zoom, indexMethod)
-      case Right(avroWriter) =>
-        val id =
-          spatialRDD.zoomLevel match {
-            case Some(zoom) => LayerId(layerName, zoom)
-            case None => LayerId(layerName, 0)
-          }
-        avroWriter.write(id, spatialRDD.rdd, indexMethod)
+    val id = getLayerId(layerName, spatialRDD)
+
+    writeWithStatistics(id, spatialRDD, computeStatistics) { rdd =>
+      layerWriter match {
+        case Left(cogWriter) => cogWriter.write(layerName, rdd, id.zoom, indexMethod)
+        case Right(avroWriter) => avroWriter.write(id, rdd, indexMethod)
+      }
     }
   }
 
@@ -109,26 +167,32 @@ class LayerWriterWrapper(attributeStore: AttributeStore, uri: String, useCOGs: B
     timeString: String,
     timeResolution: String,
     indexStrategy: String
+  ): Unit =
+    writeTemporal(layerName, temporalRDD, timeString, timeResolution, indexStrategy, false)
+
+  def writeTemporal(
+    layerName: String,
+    temporalRDD: TiledRasterLayer[SpaceTimeKey],
+    timeString: String,
+    timeResolution: String,
+    indexStrategy: String,
+    computeStatistics: Boolean
   ): Unit = {
     val indexMethod = getTemporalIndexMethod(timeString, timeResolution, indexStrategy)
-    layerWriter match {
-      case Left(cogWriter) =>
-        val zoom = temporalRDD.zoomLevel.getOrElse(0)
-        cogWriter.write(layerName, temporalRDD.rdd, zoom, indexMethod)
-      case Right(avroWriter) =>
-        val id =
-          temporalRDD.zoomLevel match {
-            case Some(zoom) => LayerId(layerName, zoom)
-            case None => LayerId(layerName, 0)
-          }
-        avroWriter.write(id, temporalRDD.rdd, indexMethod)
+    val id = getLayerId(layerName, temporalRDD)
+
+    writeWithStatistics(id, temporalRDD, computeStatistics) { rdd =>
+      layerWriter match {
+        case Left(cogWriter) => cogWriter.write(layerName, rdd, id.zoom, indexMethod)
+        case Right(avroWriter) => avroWriter.write(id, rdd, indexMethod)
+      }
     }
   }
 
   def updateSpatial(
     layerName: String,
     spatialRDD: TiledRasterLayer[SpatialKey]
-  ): Unit =
+  ): Unit = {
     layerWriter match {
       case Left(cogWriter) =>
         val id = getLayerId(layerName, spatialRDD)
@@ -136,14 +200,20 @@ class LayerWriterWrapper(attributeStore: AttributeStore, uri: String, useCOGs: B
       case Right(avroWriter) => avroWriter.update(getLayerId(layerName, spatialRDD), spatialRDD.rdd)
     }
 
+    clearStatistics(getLayerId(layerName, spatialRDD))
+  }
+
   def updateTemporal(
     layerName: String,
     temporalRDD: TiledRasterLayer[SpaceTimeKey]
-  ): Unit =
+  ): Unit = {
     layerWriter match {
       case Left(cogWriter) =>
         val id = getLayerId(layerName, temporalRDD)
         cogWriter.update[SpaceTimeKey, MultibandTile](id.name, temporalRDD.rdd, id.zoom, None)
       case Right(avroWriter) => avroWriter.update(getLayerId(layerName, temporalRDD), temporalRDD.rdd)
     }
+
+    clearStatistics(getLayerId(layerName, temporalRDD))
+  }
 }
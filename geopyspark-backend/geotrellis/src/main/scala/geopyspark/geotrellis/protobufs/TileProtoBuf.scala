@@ -6,144 +6,372 @@ import geotrellis.raster._
 
 import geotrellis.contrib.vlm.PaddedTile
 
+import com.google.protobuf.UnsafeByteOperations
+import com.github.luben.zstd.Zstd
+import net.jpountz.lz4.LZ4Factory
+
+import java.nio.{ByteBuffer, ByteOrder}
+
 
 trait TileProtoBuf {
-  implicit def tileProtoBufCodec = new ProtoBufCodec[Tile, ProtoTile] {
-    private def cellTypeToMessage(ct: CellType): ProtoCellType = {
-      ct match {
-        case BitCellType =>
-          ProtoCellType(ProtoCellType.DataType.BIT, Byte.MinValue, false)
-
-        case ByteConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.BYTE, Byte.MinValue, true)
-        case ByteCellType =>
-          ProtoCellType(ProtoCellType.DataType.BYTE, hasNoData = false)
-        case ByteUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.BYTE, v, true)
-
-        case UByteConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.UBYTE, 0, true)
-        case UByteCellType =>
-          ProtoCellType(ProtoCellType.DataType.UBYTE, hasNoData = false)
-        case UByteUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.UBYTE, v, true)
-
-        case ShortConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.SHORT, Short.MinValue, true)
-        case ShortCellType =>
-          ProtoCellType(ProtoCellType.DataType.SHORT, hasNoData = false)
-        case ShortUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.SHORT, v, true)
-
-        case UShortConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.USHORT, 0, true)
-        case UShortCellType =>
-          ProtoCellType(ProtoCellType.DataType.USHORT, hasNoData = false)
-        case UShortUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.USHORT, v, true)
-
-        case IntConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.INT, Int.MinValue, true)
-        case IntCellType =>
-          ProtoCellType(ProtoCellType.DataType.INT, hasNoData = false)
-        case IntUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.INT, v, true)
-
-        case FloatConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.FLOAT, Float.NaN, true)
-        case FloatCellType =>
-          ProtoCellType(ProtoCellType.DataType.FLOAT, hasNoData = false)
-        case FloatUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.FLOAT, v, true)
-
-        case DoubleConstantNoDataCellType =>
-          ProtoCellType(ProtoCellType.DataType.DOUBLE, Double.NaN, true)
-        case DoubleCellType =>
-          ProtoCellType(ProtoCellType.DataType.DOUBLE, hasNoData = false)
-        case DoubleUserDefinedNoDataCellType(v) =>
-          ProtoCellType(ProtoCellType.DataType.DOUBLE, v, true)
+  // Low levels keep compression cheaper than the socket transfer it saves
+  final val ZstdLevel: Int = 1
+
+  /** Parses the name of a compression method, such as "lz4", as sent from Python. */
+  def compressionFromName(name: String): ProtoTile.Compression =
+    ProtoTile.Compression.fromName(name.toUpperCase) match {
+      case Some(compression) => compression
+      case None => throw new IllegalArgumentException(s"Unknown tile compression: $name")
+    }
+
+  /** Compresses the raw cells of an encoded tile. The tile is returned
+    * unchanged if compression does not make its cells smaller.
+    */
+  def compressTile(message: ProtoTile, compression: ProtoTile.Compression): ProtoTile =
+    if (compression == ProtoTile.Compression.NONE || message.rawCells.isEmpty)
+      message
+    else {
+      val rawCells = message.rawCells.toByteArray
+      val compressed =
+        compression match {
+          case ProtoTile.Compression.LZ4 =>
+            LZ4Factory.fastestInstance.fastCompressor.compress(rawCells)
+          case ProtoTile.Compression.ZSTD =>
+            Zstd.compress(rawCells, ZstdLevel)
+          case _ =>
+            throw new IllegalArgumentException(s"Unknown tile compression: $compression")
+        }
+
+      if (compressed.length < rawCells.length)
+        message.copy(
+          rawCells = UnsafeByteOperations.unsafeWrap(compressed),
+          compression = compression,
+          rawSize = rawCells.length)
+      else
+        message
+    }
+
+  /** The raw cells of an encoded tile, decompressed if needed. */
+  def decompressRawCells(message: ProtoTile): ByteBuffer =
+    message.compression match {
+      case ProtoTile.Compression.NONE =>
+        message.rawCells.asReadOnlyByteBuffer
+      case ProtoTile.Compression.LZ4 =>
+        ByteBuffer.wrap(LZ4Factory.fastestInstance.fastDecompressor.decompress(message.rawCells.toByteArray, message.rawSize))
+      case ProtoTile.Compression.ZSTD =>
+        ByteBuffer.wrap(Zstd.decompress(message.rawCells.toByteArray, message.rawSize))
+      case compression =>
+        throw new IllegalArgumentException(s"Unknown tile compression: $compression")
+    }
+
+  def cellTypeToMessage(ct: CellType): ProtoCellType = {
+    ct match {
+      case BitCellType =>
+        ProtoCellType(ProtoCellType.DataType.BIT, Byte.MinValue, false)
+
+      case ByteConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.BYTE, Byte.MinValue, true)
+      case ByteCellType =>
+        ProtoCellType(ProtoCellType.DataType.BYTE, hasNoData = false)
+      case ByteUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.BYTE, v, true)
+
+      case UByteConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.UBYTE, 0, true)
+      case UByteCellType =>
+        ProtoCellType(ProtoCellType.DataType.UBYTE, hasNoData = false)
+      case UByteUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.UBYTE, v, true)
+
+      case ShortConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.SHORT, Short.MinValue, true)
+      case ShortCellType =>
+        ProtoCellType(ProtoCellType.DataType.SHORT, hasNoData = false)
+      case ShortUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.SHORT, v, true)
+
+      case UShortConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.USHORT, 0, true)
+      case UShortCellType =>
+        ProtoCellType(ProtoCellType.DataType.USHORT, hasNoData = false)
+      case UShortUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.USHORT, v, true)
+
+      case IntConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.INT, Int.MinValue, true)
+      case IntCellType =>
+        ProtoCellType(ProtoCellType.DataType.INT, hasNoData = false)
+      case IntUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.INT, v, true)
+
+      case FloatConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.FLOAT, Float.NaN, true)
+      case FloatCellType =>
+        ProtoCellType(ProtoCellType.DataType.FLOAT, hasNoData = false)
+      case FloatUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.FLOAT, v, true)
+
+      case DoubleConstantNoDataCellType =>
+        ProtoCellType(ProtoCellType.DataType.DOUBLE, Double.NaN, true)
+      case DoubleCellType =>
+        ProtoCellType(ProtoCellType.DataType.DOUBLE, hasNoData = false)
+      case DoubleUserDefinedNoDataCellType(v) =>
+        ProtoCellType(ProtoCellType.DataType.DOUBLE, v, true)
+    }
+  }
+
+  def messageToCellType(ctm: ProtoCellType): CellType = {
+    ctm match {
+      case ProtoCellType(ProtoCellType.DataType.BIT, nd, false) =>
+        BitCellType
+
+      case ProtoCellType(ProtoCellType.DataType.BYTE, nd, true) =>
+        ByteCells.withNoData(Some(nd.toByte))
+      case ProtoCellType(ProtoCellType.DataType.BYTE, nd, false) =>
+        ByteCells.withNoData(None)
+
+      case ProtoCellType(ProtoCellType.DataType.UBYTE, nd, true) =>
+        UByteCells.withNoData(Some(nd.toByte))
+      case ProtoCellType(ProtoCellType.DataType.UBYTE, nd, false) =>
+        UByteCells.withNoData(None)
+
+      case ProtoCellType(ProtoCellType.DataType.SHORT, nd, true) =>
+        ShortCells.withNoData(Some(nd.toShort))
+      case ProtoCellType(ProtoCellType.DataType.SHORT, nd, false) =>
+        ShortCells.withNoData(None)
+
+      case ProtoCellType(ProtoCellType.DataType.USHORT, nd, true) =>
+        UShortCells.withNoData(Some(nd.toShort))
+      case ProtoCellType(ProtoCellType.DataType.USHORT, nd, false) =>
+        UShortCells.withNoData(None)
+
+      case ProtoCellType(ProtoCellType.DataType.INT, nd, true) =>
+        IntCells.withNoData(Some(nd.toInt))
+      case ProtoCellType(ProtoCellType.DataType.INT, nd, false) =>
+        IntCells.withNoData(None)
+
+      case ProtoCellType(ProtoCellType.DataType.FLOAT, nd, true) =>
+        FloatCells.withNoData(Some(nd.toFloat))
+      case ProtoCellType(ProtoCellType.DataType.FLOAT, nd, false) =>
+        FloatCells.withNoData(None)
+
+      case ProtoCellType(ProtoCellType.DataType.DOUBLE, nd, true) =>
+        DoubleCells.withNoData(Some(nd.toDouble))
+      case ProtoCellType(ProtoCellType.DataType.DOUBLE, nd, false) =>
+        DoubleCells.withNoData(None)
+    }
+  }
+
+  /** The cells of the tile as a native-endian buffer, at the width of the given data type.
+    * BIT cells take up one byte each; see [[toPackedBits]] for the packed form.
+    */
+  def toRawCells(targetTile: Tile, dataType: ProtoCellType.DataType): Array[Byte] = {
+    val tile =
+      targetTile match {
+        case padded: PaddedTile =>
+          val chunk = padded.chunk
+          if (chunk.cols != padded.cols || chunk.rows != padded.rows)
+            padded.toArrayTile()
+          else
+            chunk
+        case _ => targetTile
       }
+
+    val size = tile.cols * tile.rows
+
+    dataType.toString match {
+      case "BIT" =>
+        tile.toArray().map(_.toByte)
+      case "BYTE" =>
+        tile.interpretAs(ByteCellType).toArray().map(_.toByte)
+      case "UBYTE" =>
+        tile.interpretAs(UByteCellType).toArray().map(_.toByte)
+      case "SHORT" =>
+        val buffer = ByteBuffer.allocate(size * 2).order(ByteOrder.nativeOrder)
+        buffer.asShortBuffer.put(tile.interpretAs(ShortCellType).toArray().map(_.toShort))
+        buffer.array
+      case "USHORT" =>
+        val buffer = ByteBuffer.allocate(size * 2).order(ByteOrder.nativeOrder)
+        buffer.asShortBuffer.put(tile.interpretAs(UShortCellType).toArray().map(_.toShort))
+        buffer.array
+      case "INT" =>
+        val buffer = ByteBuffer.allocate(size * 4).order(ByteOrder.nativeOrder)
+        buffer.asIntBuffer.put(tile.toArray())
+        buffer.array
+      case "FLOAT" =>
+        val buffer = ByteBuffer.allocate(size * 4).order(ByteOrder.nativeOrder)
+        buffer.asFloatBuffer.put(
+          tile.toArrayTile match {
+            case floats: FloatArrayTile => floats.array
+            case arrayTile => arrayTile.interpretAs(FloatCellType).toArrayDouble().map(_.toFloat)
+          })
+        buffer.array
+      case "DOUBLE" =>
+        val buffer = ByteBuffer.allocate(size * 8).order(ByteOrder.nativeOrder)
+        buffer.asDoubleBuffer.put(
+          tile.toArrayTile match {
+            case doubles: DoubleArrayTile => doubles.array
+            case arrayTile => arrayTile.interpretAs(DoubleCellType).toArrayDouble()
+          })
+        buffer.array
+    }
+  }
+
+  /** Reads a tile from cells written by [[toRawCells]]. */
+  def fromRawCells(
+    rawCells: ByteBuffer,
+    dataType: ProtoCellType.DataType,
+    cols: Int,
+    rows: Int,
+    ct: CellType
+  ): Tile = {
+    val size = cols * rows
+    val buffer = rawCells.order(ByteOrder.nativeOrder)
+
+    dataType.toString match {
+      case "BIT" =>
+        val cells = Array.ofDim[Byte](size)
+        buffer.get(cells)
+        RawArrayTile(cells.map(_.toInt), cols, rows).interpretAs(ct)
+      case "BYTE" =>
+        val cells = Array.ofDim[Byte](size)
+        buffer.get(cells)
+        ByteArrayTile(cells, cols, rows, ct.asInstanceOf[ByteCells with NoDataHandling])
+      case "UBYTE" =>
+        val cells = Array.ofDim[Byte](size)
+        buffer.get(cells)
+        UByteArrayTile(cells, cols, rows, ct.asInstanceOf[UByteCells with NoDataHandling])
+      case "SHORT" =>
+        val cells = Array.ofDim[Short](size)
+        buffer.asShortBuffer.get(cells)
+        ShortArrayTile(cells, cols, rows, ct.asInstanceOf[ShortCells with NoDataHandling])
+      case "USHORT" =>
+        val cells = Array.ofDim[Short](size)
+        buffer.asShortBuffer.get(cells)
+        UShortArrayTile(cells, cols, rows, ct.asInstanceOf[UShortCells with NoDataHandling])
+      case "INT" =>
+        val cells = Array.ofDim[Int](size)
+        buffer.asIntBuffer.get(cells)
+        IntArrayTile(cells, cols, rows, ct.asInstanceOf[IntCells with NoDataHandling])
+      case "FLOAT" =>
+        val cells = Array.ofDim[Float](size)
+        buffer.asFloatBuffer.get(cells)
+        FloatArrayTile(cells, cols, rows, ct.asInstanceOf[FloatCells with NoDataHandling])
+      case "DOUBLE" =>
+        val cells = Array.ofDim[Double](size)
+        buffer.asDoubleBuffer.get(cells)
+        DoubleArrayTile(cells, cols, rows, ct.asInstanceOf[DoubleCells with NoDataHandling])
     }
+  }
+
+  /** The cells of a BIT tile packed eight to a byte, least significant bit
+    * first, which is the layout of a [[BitArrayTile]].
+    */
+  def toPackedBits(tile: Tile): Array[Byte] =
+    tile.toArrayTile match {
+      case bits: BitArrayTile => bits.array
+      case arrayTile =>
+        val cells = arrayTile.toArray()
+        val packed = Array.ofDim[Byte]((cells.length + 7) / 8)
+        var i = 0
+
+        while (i < cells.length) {
+          if (cells(i) != 0)
+            packed(i >> 3) = (packed(i >> 3) | (1 << (i & 7))).toByte
+          i += 1
+        }
 
-    private def messageToCellType(ctm: ProtoCellType): CellType = {
-      ctm match {
-        case ProtoCellType(ProtoCellType.DataType.BIT, nd, false) =>
-          BitCellType
-
-        case ProtoCellType(ProtoCellType.DataType.BYTE, nd, true) =>
-          ByteCells.withNoData(Some(nd.toByte))
-        case ProtoCellType(ProtoCellType.DataType.BYTE, nd, false) =>
-          ByteCells.withNoData(None)
-
-        case ProtoCellType(ProtoCellType.DataType.UBYTE, nd, true) =>
-          UByteCells.withNoData(Some(nd.toByte))
-        case ProtoCellType(ProtoCellType.DataType.UBYTE, nd, false) =>
-          UByteCells.withNoData(None)
-
-        case ProtoCellType(ProtoCellType.DataType.SHORT, nd, true) =>
-          ShortCells.withNoData(Some(nd.toShort))
-        case ProtoCellType(ProtoCellType.DataType.SHORT, nd, false) =>
-          ShortCells.withNoData(None)
-
-        case ProtoCellType(ProtoCellType.DataType.USHORT, nd, true) =>
-          UShortCells.withNoData(Some(nd.toShort))
-        case ProtoCellType(ProtoCellType.DataType.USHORT, nd, false) =>
-          UShortCells.withNoData(None)
-
-        case ProtoCellType(ProtoCellType.DataType.INT, nd, true) =>
-          IntCells.withNoData(Some(nd.toInt))
-        case ProtoCellType(ProtoCellType.DataType.INT, nd, false) =>
-          IntCells.withNoData(None)
-
-        case ProtoCellType(ProtoCellType.DataType.FLOAT, nd, true) =>
-          FloatCells.withNoData(Some(nd.toFloat))
-        case ProtoCellType(ProtoCellType.DataType.FLOAT, nd, false) =>
-          FloatCells.withNoData(None)
-
-        case ProtoCellType(ProtoCellType.DataType.DOUBLE, nd, true) =>
-          DoubleCells.withNoData(Some(nd.toDouble))
-        case ProtoCellType(ProtoCellType.DataType.DOUBLE, nd, false) =>
-          DoubleCells.withNoData(None)
+        packed
+    }
+
+  /** Reads a tile from cells written by [[toPackedBits]]. */
+  def fromPackedBits(packedCells: ByteBuffer, cols: Int, rows: Int): Tile = {
+    val cells = Array.ofDim[Byte](packedCells.remaining)
+    packedCells.get(cells)
+    BitArrayTile(cells, cols, rows)
+  }
+
+  /** The raw value of every cell of the tile, if they are all the same.
+    * NoData cells are reported as the NoData value of the cell type.
+    */
+  def constantCellValue(tile: Tile, protoCellType: ProtoCellType): Option[Double] =
+    if (tile.cols == 0 || tile.rows == 0)
+      None
+    else {
+      val isFloat = tile.cellType.isFloatingPoint
+      val first = if (isFloat) tile.getDouble(0, 0) else tile.get(0, 0).toDouble
+      var constant = true
+      var row = 0
+
+      while (constant && row < tile.rows) {
+        var col = 0
+        while (constant && col < tile.cols) {
+          val value = if (isFloat) tile.getDouble(col, row) else tile.get(col, row).toDouble
+          constant = value == first || (value.isNaN && first.isNaN)
+          col += 1
+        }
+        row += 1
       }
+
+      if (!constant)
+        None
+      else if (protoCellType.hasNoData && (if (isFloat) isNoData(first) else isNoData(first.toInt)))
+        Some(protoCellType.nd)
+      else
+        Some(first)
     }
 
-    def encode(targetTile: Tile): ProtoTile = {
-      val protoCellType = cellTypeToMessage(targetTile.cellType)
+  /** A [[ConstantTile]] whose cells are all the given raw value. */
+  def constantTile(
+    value: Double,
+    dataType: ProtoCellType.DataType,
+    cols: Int,
+    rows: Int,
+    ct: CellType
+  ): Tile =
+    dataType.toString match {
+      case "BIT" =>
+        BitConstantTile(value != 0, cols, rows)
+      case "BYTE" =>
+        ByteConstantTile(value.toByte, cols, rows, ct.asInstanceOf[ByteCells with NoDataHandling])
+      case "UBYTE" =>
+        UByteConstantTile(value.toInt.toByte, cols, rows, ct.asInstanceOf[UByteCells with NoDataHandling])
+      case "SHORT" =>
+        ShortConstantTile(value.toShort, cols, rows, ct.asInstanceOf[ShortCells with NoDataHandling])
+      case "USHORT" =>
+        UShortConstantTile(value.toInt.toShort, cols, rows, ct.asInstanceOf[UShortCells with NoDataHandling])
+      case "INT" =>
+        IntConstantTile(value.toInt, cols, rows, ct.asInstanceOf[IntCells with NoDataHandling])
+      case "FLOAT" =>
+        FloatConstantTile(value.toFloat, cols, rows, ct.asInstanceOf[FloatCells with NoDataHandling])
+      case "DOUBLE" =>
+        DoubleConstantTile(value, cols, rows, ct.asInstanceOf[DoubleCells with NoDataHandling])
+    }
+
+  implicit def tileProtoBufCodec = new ProtoBufCodec[Tile, ProtoTile] {
+    def encode(tile: Tile): ProtoTile = {
+      val protoCellType = cellTypeToMessage(tile.cellType)
 
-      val tile =
-        targetTile match {
-          case padded: PaddedTile =>
-            val chunk = padded.chunk
-            if (chunk.cols != padded.cols || chunk.rows != padded.rows)
-              padded.toArrayTile()
+      constantCellValue(tile, protoCellType) match {
+        case Some(value) =>
+          ProtoTile(
+            cols = tile.cols,
+            rows = tile.rows,
+            cellType = Some(protoCellType),
+            constant = true,
+            constantValue = value)
+        case None =>
+          val rawCells =
+            if (protoCellType.dataType == ProtoCellType.DataType.BIT)
+              toPackedBits(tile)
             else
-              chunk
-          case _ => targetTile
-        }
+              toRawCells(tile, protoCellType.dataType)
 
-      val initialProtoTile =
-        ProtoTile(
-          cols = tile.cols,
-          rows = tile.rows,
-          cellType = Some(protoCellType))
-
-      protoCellType.dataType.toString match {
-        case "BIT" =>
-          initialProtoTile.withUint32Cells(tile.toArray())
-        case "BYTE" =>
-          initialProtoTile.withSint32Cells(tile.interpretAs(ByteCellType).toArray())
-        case "UBYTE" =>
-          initialProtoTile.withUint32Cells(tile.interpretAs(UByteCellType).toArray())
-        case "SHORT" =>
-          initialProtoTile.withSint32Cells(tile.interpretAs(ShortCellType).toArray())
-        case "USHORT" =>
-          initialProtoTile.withUint32Cells(tile.interpretAs(UShortCellType).toArray())
-        case "INT" =>
-          initialProtoTile.withSint32Cells(tile.toArray())
-        case "FLOAT" =>
-          initialProtoTile.withFloatCells(tile.asInstanceOf[FloatArrayTile].array)
-        case "DOUBLE" =>
-          initialProtoTile.withDoubleCells(tile.asInstanceOf[DoubleArrayTile].array)
+          ProtoTile(
+            cols = tile.cols,
+            rows = tile.rows,
+            cellType = Some(protoCellType),
+            rawCells = UnsafeByteOperations.unsafeWrap(rawCells))
       }
     }
 
@@ -151,16 +379,24 @@ trait TileProtoBuf {
       val messageCellType = message.cellType.get
       val ct = messageToCellType(messageCellType)
 
-      message.cellType.get.dataType.toString match {
-        case ("BYTE" | "SHORT" | "INT") =>
-          RawArrayTile(message.sint32Cells.toArray, message.cols, message.rows).interpretAs(ct)
-        case ("BIT" | "UBYTE" | "USHORT") =>
-          RawArrayTile(message.uint32Cells.toArray, message.cols, message.rows).interpretAs(ct)
-        case "FLOAT" =>
-          ArrayTile(message.floatCells.toArray, message.cols, message.rows).interpretAs(ct)
-        case "DOUBLE" =>
-          ArrayTile(message.doubleCells.toArray, message.cols, message.rows).interpretAs(ct)
-      }
+      if (message.constant)
+        constantTile(message.constantValue, messageCellType.dataType, message.cols, message.rows, ct)
+      else if (!message.rawCells.isEmpty && messageCellType.dataType == ProtoCellType.DataType.BIT)
+        fromPackedBits(decompressRawCells(message), message.cols, message.rows)
+      else if (!message.rawCells.isEmpty)
+        fromRawCells(decompressRawCells(message), messageCellType.dataType, message.cols, message.rows, ct)
+      else
+        // Tiles encoded with the repeated cell fields
+        message.cellType.get.dataType.toString match {
+          case ("BYTE" | "SHORT" | "INT") =>
+            RawArrayTile(message.sint32Cells.toArray, message.cols, message.rows).interpretAs(ct)
+          case ("BIT" | "UBYTE" | "USHORT") =>
+            RawArrayTile(message.uint32Cells.toArray, message.cols, message.rows).interpretAs(ct)
+          case "FLOAT" =>
+            ArrayTile(message.floatCells.toArray, message.cols, message.rows).interpretAs(ct)
+          case "DOUBLE" =>
+            ArrayTile(message.doubleCells.toArray, message.cols, message.rows).interpretAs(ct)
+        }
     }
   }
 }
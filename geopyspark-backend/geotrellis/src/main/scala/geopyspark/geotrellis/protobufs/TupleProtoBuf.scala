@@ -16,6 +16,28 @@ import com.google.protobuf.ByteString
 
 trait TupleProtoBuf {
 
+  /** Wraps a tuple codec so that the cells of each band are compressed
+    * when encoded. Decoding is left to the wrapped codec, as compressed
+    * tiles are read by [[TileProtoBuf]] regardless.
+    */
+  def compressedTupleProtoBufCodec[K](
+    compression: String
+  )(implicit codec: ProtoBufCodec[(K, MultibandTile), ProtoTuple]): ProtoBufCodec[(K, MultibandTile), ProtoTuple] = {
+    val method = TileProtoBuf.compressionFromName(compression)
+
+    new ProtoBufCodec[(K, MultibandTile), ProtoTuple] {
+      def encode(tuple: (K, MultibandTile)): ProtoTuple = {
+        val message = codec.encode(tuple)
+        val tiles = message.getTiles.tiles.map { tile => TileProtoBuf.compressTile(tile, method) }
+
+        message.withTiles(ProtoMultibandTile(tiles = tiles))
+      }
+
+      def decode(message: ProtoTuple): (K, MultibandTile) =
+        codec.decode(message)
+    }
+  }
+
   implicit def tupleProjectedExtentProtoBufCodec =
     new ProtoBufCodec[(ProjectedExtent, MultibandTile), ProtoTuple] {
     def encode(tuple: (ProjectedExtent, MultibandTile)): ProtoTuple =
@@ -0,0 +1,159 @@
+package geopyspark.geotrellis.testkit
+
+import geopyspark.util.ProtoBufCodec
+import geopyspark.geotrellis._
+import geopyspark.geotrellis.protobufs.TileProtoBuf
+
+import protos.tileMessages._
+import protos.tupleMessages._
+
+import geotrellis.proj4._
+import geotrellis.raster._
+import geotrellis.spark._
+import geotrellis.vector._
+
+import spire.syntax.cfor._
+
+import scala.util.Random
+
+
+/** Times the JVM side of the tuple [[ProtoBufCodec]]s, without Spark.
+  *
+  * The parameters mirror those of `benchmarks/codec_benchmark.py` so that
+  * the encode/decode cost of the same tiles can be compared between Python
+  * and the JVM. The script calls [[run]] when given `--jvm`. The whole grid
+  * can also be run on its own with:
+  *
+  *   ./sbt "project geotrellis-backend" "runMain geopyspark.geotrellis.testkit.CodecBenchmark"
+  */
+object CodecBenchmark {
+  final val DataTypes = Seq("BIT", "BYTE", "UBYTE", "SHORT", "USHORT", "INT", "FLOAT", "DOUBLE")
+  final val KeyTypes = Seq("SpatialKey", "SpaceTimeKey", "ProjectedExtent", "TemporalProjectedExtent")
+  final val Sizes = Seq(256, 512, 1024)
+  final val BandCounts = Seq(1, 4)
+
+  // 2016-08-24T09:00:00Z
+  private final val Instant = 1472029200000L
+  private final val KeyExtent = Extent(0.0, 0.0, 1.0, 1.0)
+
+  private def rawCellType(dataType: String): CellType =
+    ProtoCellType.DataType.fromName(dataType) match {
+      case Some(dt) => TileProtoBuf.messageToCellType(ProtoCellType(dt, hasNoData = false))
+      case None => throw new IllegalArgumentException(s"Unknown data type: $dataType")
+    }
+
+  /** Creates a raw (no NoData) tile of the given data type.
+    *
+    * `pattern` is one of "random", which is incompressible, "gradient",
+    * which compresses well, or "constant".
+    */
+  def createTile(dataType: String, size: Int, pattern: String, random: Random): Tile = {
+    val cellType = rawCellType(dataType)
+    val tile = ArrayTile.empty(cellType, size, size)
+
+    cfor(0)(_ < size, _ + 1) { row =>
+      cfor(0)(_ < size, _ + 1) { col =>
+        pattern match {
+          case "constant" =>
+            tile.set(col, row, 1)
+          case "gradient" =>
+            if (cellType == BitCellType) tile.set(col, row, (col / 16) % 2)
+            else if (cellType.isFloatingPoint) tile.setDouble(col, row, (col + row) / 8.0)
+            else tile.set(col, row, ((col + row) / 8) % 100)
+          case "random" =>
+            if (cellType == BitCellType) tile.set(col, row, random.nextInt(2))
+            else if (cellType.isFloatingPoint) tile.setDouble(col, row, random.nextGaussian)
+            else tile.set(col, row, random.nextInt)
+          case _ =>
+            throw new IllegalArgumentException(s"Unknown pattern: $pattern")
+        }
+      }
+    }
+
+    tile
+  }
+
+  private def time[K](
+    key: K,
+    tiles: Seq[MultibandTile],
+    compression: String,
+    repeat: Int
+  )(implicit codec: ProtoBufCodec[(K, MultibandTile), ProtoTuple]): Array[Double] = {
+    val compressedCodec = compressedTupleProtoBufCodec[K](compression)
+
+    var encodeSeconds = Double.MaxValue
+    var decodeSeconds = Double.MaxValue
+    var encoded: Seq[Array[Byte]] = Seq()
+
+    for (_ <- 0 until repeat) {
+      val encodeStart = System.nanoTime
+      encoded = tiles.map { tile => compressedCodec.encode(key -> tile).toByteArray }
+      encodeSeconds = math.min(encodeSeconds, (System.nanoTime - encodeStart) / 1e9)
+
+      val decodeStart = System.nanoTime
+      encoded.foreach { bytes => compressedCodec.decode(ProtoTuple.parseFrom(bytes)) }
+      decodeSeconds = math.min(decodeSeconds, (System.nanoTime - decodeStart) / 1e9)
+    }
+
+    Array(encodeSeconds, decodeSeconds, encoded.map { _.length.toDouble }.sum)
+  }
+
+  /** Encodes and decodes `tileCount` tuples of the given parameters `repeat`
+    * times, each time through bytes, as is done when moving to and from Python.
+    *
+    * @return The fastest encode time in seconds, the fastest decode time in
+    *         seconds, and the total number of encoded bytes.
+    */
+  def run(
+    dataType: String,
+    size: Int,
+    bandCount: Int,
+    keyType: String,
+    compression: String,
+    pattern: String,
+    tileCount: Int,
+    repeat: Int
+  ): Array[Double] = {
+    val random = new Random(0)
+    val tiles =
+      for (_ <- 0 until tileCount) yield
+        MultibandTile((0 until bandCount).map { _ => createTile(dataType, size, pattern, random) })
+
+    keyType match {
+      case "SpatialKey" =>
+        time(SpatialKey(0, 0), tiles, compression, repeat)
+      case "SpaceTimeKey" =>
+        time(SpaceTimeKey(0, 0, Instant), tiles, compression, repeat)
+      case "ProjectedExtent" =>
+        time(ProjectedExtent(KeyExtent, LatLng), tiles, compression, repeat)
+      case "TemporalProjectedExtent" =>
+        time(TemporalProjectedExtent(KeyExtent, LatLng, Instant), tiles, compression, repeat)
+      case _ =>
+        throw new IllegalArgumentException(s"Unknown key type: $keyType")
+    }
+  }
+
+  def main(args: Array[String]): Unit = {
+    val compression = args.headOption.getOrElse("none")
+    val pattern = if (args.length > 1) args(1) else "random"
+    val (tileCount, repeat) = (8, 5)
+
+    println(f"${"cell type"}%-8s ${"size"}%5s ${"bands"}%5s ${"key type"}%-24s ${"op"}%-6s ${"MB/s"}%10s ${"tiles/s"}%10s")
+
+    for {
+      dataType <- DataTypes
+      size <- Sizes
+      bandCount <- BandCounts
+      keyType <- KeyTypes
+    } {
+      val Array(encodeSeconds, decodeSeconds, _) =
+        run(dataType, size, bandCount, keyType, compression, pattern, tileCount, repeat)
+
+      // BIT cells are counted as a byte each, as they are held in numpy
+      val cellBytes = tileCount.toDouble * bandCount * size * size * math.max(1, rawCellType(dataType).bytes)
+
+      for ((op, seconds) <- Seq("encode" -> encodeSeconds, "decode" -> decodeSeconds))
+        println(f"$dataType%-8s $size%5d $bandCount%5d $keyType%-24s $op%-6s ${cellBytes / seconds / 1e6}%10.1f ${tileCount / seconds}%10.1f")
+    }
+  }
+}
@@ -22,8 +22,8 @@ object BitArrayTileWrapper extends Wrapper2[Tile, ProtoTile] {
   def testRdd(sc: SparkContext): RDD[Tile] = {
     val arr = Array(
       BitArrayTile(Array[Byte](0), 1, 1),
-      BitArrayTile(Array[Byte](1), 1, 1),
-      BitArrayTile(Array[Byte](0), 1, 1))
+      BitArrayTile(Array[Byte](5), 2, 2),
+      BitArrayTile(Array[Byte](3, 1), 3, 3))
     sc.parallelize(arr)
   }
 }
@@ -8,9 +8,15 @@ import org.apache.spark.api.java.JavaRDD
 import scala.reflect.ClassTag
 
 import com.trueaccord.scalapb.GeneratedMessage
+import com.google.protobuf.ByteString
+
+import protos.batchMessages._
 
 
 object PythonTranslator {
+  // The number of encoded bytes at which a batch is closed and sent to Python
+  final val DefaultBatchBytes: Int = 1 << 16
+
   def toPython[T, M <: GeneratedMessage](
     rdd: RDD[T]
   )(implicit codec: ProtoBufCodec[T, M]): JavaRDD[Array[Byte]] = {
@@ -38,4 +44,44 @@ object PythonTranslator {
     toProtoClass: Array[Byte] => M
   )(implicit codec: ProtoBufCodec[T, M]): RDD[T] =
     rdd.map { bytes => codec.decode(toProtoClass(bytes)) }
+
+  /** Encodes the values of each partition into [[ProtoBatch]]es so that
+    * many records are sent to Python in a single frame. A batch is closed
+    * once its records take up at least `maxBatchBytes`.
+    */
+  def toPythonBatched[T, M <: GeneratedMessage](
+    rdd: RDD[T],
+    maxBatchBytes: Int = DefaultBatchBytes
+  )(implicit codec: ProtoBufCodec[T, M]): JavaRDD[Array[Byte]] =
+    rdd.mapPartitions { iter =>
+      val encoded = iter.map { v => codec.encode(v).toByteString }
+
+      new Iterator[Array[Byte]] {
+        def hasNext: Boolean = encoded.hasNext
+
+        def next(): Array[Byte] = {
+          val records = Vector.newBuilder[ByteString]
+          var size = 0
+
+          while (encoded.hasNext && size < maxBatchBytes) {
+            val record = encoded.next()
+            records += record
+            size += record.size
+          }
+
+          ProtoBatch(records.result).toByteArray
+        }
+      }
+    }.toJavaRDD
+
+  /** Decodes an RDD whose elements are [[ProtoBatch]]es produced by a
+    * batched `ProtoBufSerializer` in Python.
+    */
+  def fromPythonBatched[T: ClassTag, M <: GeneratedMessage](
+    rdd: RDD[Array[Byte]],
+    toProtoClass: Array[Byte] => M
+  )(implicit codec: ProtoBufCodec[T, M]): RDD[T] =
+    rdd.flatMap { bytes =>
+      ProtoBatch.parseFrom(bytes).records.map { record => codec.decode(toProtoClass(record.toByteArray)) }
+    }
 }
@@ -63,6 +63,6 @@ def get(uri,
     else:
         jrdd = shapefile.get(pysc._jsc.sc(), [uri], extensions, num_partitions, s3_client)
 
-    ser = ProtoBufSerializer(feature_decoder, None)
+    ser = ProtoBufSerializer(feature_decoder, None, batched=True)
 
     return create_python_rdd(jrdd, ser)
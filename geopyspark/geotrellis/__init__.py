@@ -6,6 +6,7 @@ import datetime
 import functools
 import datetime
 from shapely.geometry import box
+import numpy as np
 import pytz
 
 from geopyspark import get_spark_context
@@ -538,6 +539,124 @@ class Bounds(namedtuple("Bounds", 'minKey maxKey')):
         return {'minKey': min_key_dict, 'maxKey': max_key_dict}
 
 
+class KeyColumns(namedtuple("KeyColumns", 'cols rows instants')):
+    """The keys of a layer stored as columns of numpy arrays rather than as a list of
+    ``SpatialKey``\s or ``SpaceTimeKey``\s.
+
+    Args:
+        cols (np.ndarray): The ``col`` of each key as ``int32``\s.
+        rows (np.ndarray): The ``row`` of each key as ``int32``\s.
+        instants (np.ndarray, optional): The ``instant`` of each key as ``datetime64[ms]``\s.
+            This is ``None`` if the keys are ``SpatialKey``\s.
+
+    Attributes:
+        cols (np.ndarray): The ``col`` of each key as ``int32``\s.
+        rows (np.ndarray): The ``row`` of each key as ``int32``\s.
+        instants (np.ndarray): The ``instant`` of each key as ``datetime64[ms]``\s. This is
+            ``None`` if the keys are ``SpatialKey``\s.
+    """
+
+    __slots__ = []
+
+    def __new__(cls, cols, rows, instants=None):
+        return super(KeyColumns, cls).__new__(cls, cols, rows, instants)
+
+    @property
+    def size(self):
+        """The number of keys in the columns."""
+        return len(self.cols)
+
+    def bounds(self):
+        """Returns the ``Bounds`` of the keys, computed from the columns.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.Bounds`
+
+        Raises:
+            ValueError: If there are no keys.
+        """
+
+        if not self.size:
+            raise ValueError("Cannot compute the bounds of an empty set of keys")
+
+        if self.instants is None:
+            return Bounds(SpatialKey(int(self.cols.min()), int(self.rows.min())),
+                          SpatialKey(int(self.cols.max()), int(self.rows.max())))
+        else:
+            min_instant = self.instants.min().astype('datetime64[ms]').astype(datetime.datetime)
+            max_instant = self.instants.max().astype('datetime64[ms]').astype(datetime.datetime)
+
+            return Bounds(SpaceTimeKey(int(self.cols.min()), int(self.rows.min()), min_instant),
+                          SpaceTimeKey(int(self.cols.max()), int(self.rows.max()), max_instant))
+
+    def to_keys(self):
+        """Converts the columns to a list of keys.
+
+        Returns:
+            ``[:class:`~geopyspark.geotrellis.SpatialKey`]`` or
+            ``[:class:`~geopyspark.geotrellis.SpaceTimeKey`]``
+        """
+
+        if self.instants is None:
+            return [SpatialKey(col, row) for (col, row) in zip(self.cols.tolist(), self.rows.tolist())]
+        else:
+            instants = self.instants.astype('datetime64[ms]').astype(datetime.datetime)
+
+            return [SpaceTimeKey(col, row, instant)
+                    for (col, row, instant) in zip(self.cols.tolist(), self.rows.tolist(), instants)]
+
+
+class PointTimeSeries(namedtuple("PointTimeSeries", 'point_indices instants values')):
+    """The values sampled at points from a layer with a ``layer_type`` of ``LayerType.SPACETIME``,
+    stored as columns of numpy arrays. There is one row for each point and instant that was
+    sampled.
+
+    Args:
+        point_indices (np.ndarray): The position of the sampled point in the given points,
+            as ``int64``\s.
+        instants (np.ndarray): The instant that each value was sampled at, as ``datetime64[ms]``\s.
+        values (np.ndarray): The sampled values as ``float64``\s, with a shape of
+            ``(samples, bands)``.
+
+    Attributes:
+        point_indices (np.ndarray): The position of the sampled point in the given points,
+            as ``int64``\s.
+        instants (np.ndarray): The instant that each value was sampled at, as ``datetime64[ms]``\s.
+        values (np.ndarray): The sampled values as ``float64``\s, with a shape of
+            ``(samples, bands)``.
+    """
+
+    __slots__ = []
+
+    @property
+    def size(self):
+        """The number of samples."""
+        return len(self.point_indices)
+
+    def pivot(self, point_count=None):
+        """Pivots the samples into a dense array of points by instants by bands.
+
+        Args:
+            point_count (int, optional): The number of points that were sampled. If not set, then
+                it is one more than the largest index in ``point_indices``.
+
+        Returns:
+            (np.ndarray, np.ndarray): The sorted, unique instants as ``datetime64[ms]``\s, and an
+            array of ``float64``\s with a shape of ``(points, instants, bands)``. Entries that
+            were not sampled are ``NaN``.
+        """
+
+        if point_count is None:
+            point_count = int(self.point_indices.max()) + 1 if self.size else 0
+
+        (instants, instant_indices) = np.unique(self.instants, return_inverse=True)
+
+        result = np.full((point_count, len(instants), self.values.shape[1]), np.nan)
+        result[self.point_indices, instant_indices.reshape(-1)] = self.values
+
+        return (instants, result)
+
+
 class HashPartitionStrategy(namedtuple("HashPartitionStrategy", "num_partitions")):
     """Represents a partitioning strategy for a layer that uses Spark's ``HashPartitioner``
     with a set number of partitions.
@@ -832,9 +951,9 @@ class Metadata(object):
 
 
 __all__ = ["Tile", "Extent", "ProjectedExtent", "TemporalProjectedExtent", "SpatialKey", "SpaceTimeKey",
-           "Metadata", "TileLayout", "GlobalLayout", "LocalLayout", "LayoutDefinition", "Bounds", "RasterizerOptions",
-           "zfactor_lat_lng_calculator", "zfactor_calculator", "HashPartitionStrategy", "SpatialPartitionStrategy",
-           "SpaceTimePartitionStrategy", "Feature", "CellValue"]
+           "Metadata", "TileLayout", "GlobalLayout", "LocalLayout", "LayoutDefinition", "Bounds", "KeyColumns",
+           "PointTimeSeries", "RasterizerOptions", "zfactor_lat_lng_calculator", "zfactor_calculator",
+           "HashPartitionStrategy", "SpatialPartitionStrategy", "SpaceTimePartitionStrategy", "Feature", "CellValue"]
 
 from . import catalog
 from . import color
@@ -0,0 +1,255 @@
+"""The class which serializes/deserializes batches of a layer to/from Python using Apache Arrow."""
+import numpy as np
+
+from geopyspark.geopyspark_utils import ensure_pyspark
+ensure_pyspark()
+from geopyspark.geotrellis import Tile
+from geopyspark.geotrellis.protobufcodecs import _raw_cell_dtypes
+
+from pyspark.serializers import FramedSerializer
+
+
+_extent_fields = ['xmin', 'ymin', 'xmax', 'ymax', 'epsg', 'proj4']
+
+_key_fields = {
+    'SpatialKey': ['col', 'row'],
+    'SpaceTimeKey': ['col', 'row', 'instant'],
+    'ProjectedExtent': _extent_fields,
+    'TemporalProjectedExtent': _extent_fields + ['instant']
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow must be installed in order to use the Arrow methods")
+
+    return pyarrow
+
+
+def _new_stream_writer(pa, sink, schema):
+    # The JVM reads the stream with arrow-vector 0.8, which only understands the legacy stream
+    # format without continuation markers, and version 4 of the metadata
+    if hasattr(pa.ipc, 'IpcWriteOptions'):
+        options = pa.ipc.IpcWriteOptions(use_legacy_format=True,
+                                         metadata_version=pa.ipc.MetadataVersion.V4)
+
+        return pa.ipc.new_stream(sink, schema, options=options)
+
+    try:
+        return pa.ipc.new_stream(sink, schema, use_legacy_format=True)
+    except TypeError:
+        # Versions of pyarrow before 0.15 only write the legacy format
+        return pa.ipc.new_stream(sink, schema)
+
+
+def _decode_keys(pa, batch, key_type):
+    keys = {}
+
+    for name in _key_fields[key_type]:
+        column = batch.column(name)
+
+        if name == 'epsg':
+            keys[name] = column.fill_null(0).to_numpy()
+        elif name == 'proj4':
+            keys[name] = np.array(column.to_pylist(), dtype=object)
+        elif name == 'instant':
+            keys[name] = column.to_numpy().astype('datetime64[ms]')
+        else:
+            keys[name] = column.to_numpy()
+
+    return keys
+
+def _decode_cells(batch, dtype):
+    bands = batch.column('bands').to_numpy()
+    rows = batch.column('rows').to_numpy()
+    cols = batch.column('cols').to_numpy()
+
+    column = batch.column('cells')
+    (_, offsets_buffer, data_buffer) = column.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int32, count=len(column) + 1, offset=column.offset * 4)
+
+    if len(column) and (bands == bands[0]).all() and (rows == rows[0]).all() and (cols == cols[0]).all():
+        shape = (len(column), bands[0], rows[0], cols[0])
+        count = shape[0] * shape[1] * shape[2] * shape[3]
+
+        return np.frombuffer(data_buffer, dtype=dtype, count=count, offset=offsets[0]).reshape(shape)
+    else:
+        return [np.frombuffer(data_buffer, dtype=dtype, count=b * r * c, offset=o).reshape(b, r, c)
+                for (b, r, c, o) in zip(bands, rows, cols, offsets)]
+
+def arrow_decoder(arrow_bytes, key_type):
+    """Deserializes an Arrow IPC stream into a list of batches.
+
+    Args:
+        arrow_bytes (bytes): The bytes of the Arrow stream.
+        key_type (str): The type of the keys within the stream.
+
+    Returns:
+        [(dict, :class:`~geopyspark.geotrellis.Tile`)]
+    """
+
+    pa = _import_pyarrow()
+
+    reader = pa.ipc.open_stream(pa.py_buffer(arrow_bytes))
+    metadata = reader.schema.metadata
+
+    cell_type = metadata[b'dataType'].decode()
+
+    if b'noData' in metadata:
+        no_data_value = float(metadata[b'noData'])
+    else:
+        no_data_value = None
+
+    dtype = _raw_cell_dtypes[cell_type]
+
+    return [(_decode_keys(pa, batch, key_type), Tile(_decode_cells(batch, dtype), cell_type, no_data_value))
+            for batch in reader]
+
+def arrow_encoder(batches, key_type):
+    """Encodes a list of batches into the bytes of an Arrow IPC stream.
+
+    Args:
+        batches ([(dict, :class:`~geopyspark.geotrellis.Tile`)]): The batches to encode. Every
+            batch must have the same cell type.
+        key_type (str): The type of the keys within the batches.
+
+    Returns:
+        bytes
+    """
+
+    pa = _import_pyarrow()
+
+    cell_type = batches[0][1].cell_type
+    no_data_value = batches[0][1].no_data_value
+    dtype = _raw_cell_dtypes[cell_type]
+
+    metadata = {'dataType': cell_type}
+
+    if no_data_value is not None and no_data_value is not False:
+        metadata['noData'] = 'NaN' if np.isnan(no_data_value) else str(no_data_value)
+
+    record_batches = []
+
+    for (keys, tile) in batches:
+        columns = []
+
+        for name in _key_fields[key_type]:
+            if name == 'epsg':
+                epsg = np.asarray(keys[name])
+                columns.append(pa.array(epsg, type=pa.int32(), mask=(epsg == 0)))
+            elif name == 'proj4':
+                columns.append(pa.array(list(keys[name]), type=pa.string()))
+            elif name == 'instant':
+                instants = np.asarray(keys[name])
+
+                if np.issubdtype(instants.dtype, np.datetime64):
+                    instants = instants.astype('datetime64[ms]').astype(np.int64)
+
+                columns.append(pa.array(instants, type=pa.int64()))
+            elif name in ('col', 'row'):
+                columns.append(pa.array(np.asarray(keys[name]), type=pa.int32()))
+            else:
+                columns.append(pa.array(np.asarray(keys[name]), type=pa.float64()))
+
+        cells = [np.ascontiguousarray(x, dtype=dtype) for x in tile.cells]
+        sizes = np.array([x.nbytes for x in cells], dtype=np.int32)
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int32)
+
+        if isinstance(tile.cells, np.ndarray):
+            data = np.ascontiguousarray(tile.cells, dtype=dtype)
+        else:
+            data = np.concatenate([x.ravel() for x in cells])
+
+        columns.append(pa.array([x.shape[0] for x in cells], type=pa.int32()))
+        columns.append(pa.array([x.shape[2] for x in cells], type=pa.int32()))
+        columns.append(pa.array([x.shape[1] for x in cells], type=pa.int32()))
+        columns.append(pa.Array.from_buffers(pa.binary(), len(cells),
+                                             [None, pa.py_buffer(offsets), pa.py_buffer(data)]))
+
+        record_batches.append(pa.RecordBatch.from_arrays(
+            columns, _key_fields[key_type] + ['bands', 'cols', 'rows', 'cells']))
+
+    schema = record_batches[0].schema.with_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    writer = _new_stream_writer(pa, sink, schema)
+
+    for record_batch in record_batches:
+        writer.write_batch(record_batch)
+
+    writer.close()
+
+    return sink.getvalue().to_pybytes()
+
+
+class ArrowSerializer(FramedSerializer):
+    """The serializer used by a RDD to encode/decode Arrow record batches to/from Python.
+
+    Each element of the RDD is a batch of records represented as a tuple of a ``dict`` and a
+    :class:`~geopyspark.geotrellis.Tile`. The ``dict`` maps the name of each key field to a
+    numpy array of its values. The fields are ``col`` and ``row`` for ``SpatialKey``\s, plus
+    ``instant`` for ``SpaceTimeKey``\s. ``ProjectedExtent``\s use ``xmin``, ``ymin``, ``xmax``,
+    ``ymax``, ``epsg`` and ``proj4``, and ``TemporalProjectedExtent``\s add ``instant``. An
+    ``epsg`` of ``0`` means that ``proj4`` holds the CRS. ``instant`` is a ``datetime64[ms]``
+    array.
+
+    The ``cells`` of the ``Tile`` is a read-only array with the shape
+    ``(records, bands, rows, cols)`` that views the data sent from Scala without copying it.
+    If the records have different shapes, ``cells`` is a list of ``(bands, rows, cols)``
+    arrays instead.
+
+    Note:
+        ``pyarrow`` must be installed on the driver and the workers to use this serializer.
+
+    Args:
+        key_type (str): The type of the keys within the RDD.
+
+    Attributes:
+        key_type (str): The type of the keys within the RDD.
+    """
+
+    __slots__ = ['key_type']
+
+    def __init__(self, key_type):
+        FramedSerializer.__init__(self)
+
+        self.key_type = key_type
+
+    # FramedSerializer compares __dict__, which is empty for a class with __slots__, so the
+    # key_type has to be compared here for RDD._reserialize to tell the key layouts apart
+    def __eq__(self, other):
+        return isinstance(other, ArrowSerializer) and self.key_type == other.key_type
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((ArrowSerializer, self.key_type))
+
+    def dumps(self, obj):
+        """Serialize a batch, or a list of batches, into the bytes of an Arrow stream.
+
+        Args:
+            obj: The batch or list of batches to serialize.
+
+        Returns:
+            bytes
+        """
+
+        if isinstance(obj, list):
+            return arrow_encoder(obj, self.key_type)
+        else:
+            return arrow_encoder([obj], self.key_type)
+
+    def loads(self, obj):
+        """Deserializes the bytes of an Arrow stream into a list of batches.
+
+        Args:
+            obj: The bytes of the Arrow stream.
+
+        Returns:
+            A list of batches.
+        """
+
+        return arrow_decoder(obj, self.key_type)
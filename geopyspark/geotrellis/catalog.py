@@ -203,8 +203,31 @@ def query(uri,
                         num_partitions)
 
     layer_type = LayerType._from_key_name(srdd.keyClassName())
+    layer = TiledRasterLayer(layer_type, srdd)
 
-    return TiledRasterLayer(layer_type, srdd)
+    if not time_intervals and (query_geom is None or query_proj is None):
+        layer._statistics = lambda: _read_statistics(uri, layer_name, layer_zoom, query_geom)
+
+    return layer
+
+
+def _read_statistics(uri, layer_name, layer_zoom, query_geom):
+    """Reads the statistics stored for a layer, if the query with the WKB ``query_geom`` read
+    the whole of it. Otherwise, or if the layer has no stored statistics, returns ``None``.
+    """
+
+    attributes = AttributeStore.cached(uri).layer(layer_name, layer_zoom)
+
+    if query_geom is not None:
+        extent = attributes.layer_metadata().extent
+
+        if not shapely.wkb.loads(query_geom).contains(extent.to_polygon):
+            return None
+
+    try:
+        return attributes.read("statistics")
+    except KeyError:
+        return None
 
 
 def write(uri,
@@ -214,7 +237,9 @@ def write(uri,
           time_unit=None,
           time_resolution=None,
           store=None,
-          use_cogs=False):
+          use_cogs=False,
+          compute_statistics=False,
+          scheduler_pool=None):
     """Writes a tile layer to a specified destination.
 
     Args:
@@ -250,6 +275,25 @@ def write(uri,
                 While a GeoTrellis COG layer will be saved as a series of COGs, they still have
                 an associated file structure and metadata that must be preserved in order to
                 access a given layer.
+        compute_statistics (bool, optional): Whether the histogram, the smallest and largest
+            values, the number of data cells and the number of NoData cells of each band should
+            be computed as the layer is written, and stored as its ``statistics`` attribute. A
+            layer later read with :meth:`~geopyspark.geotrellis.catalog.query` that covers the
+            whole of the stored layer then answers
+            :meth:`~geopyspark.geotrellis.layer.TileLayer.get_histogram`,
+            :meth:`~geopyspark.geotrellis.layer.TileLayer.get_min_max`,
+            :meth:`~geopyspark.geotrellis.layer.TileLayer.get_quantile_breaks` and
+            :meth:`~geopyspark.geotrellis.layer.TileLayer.get_statistics` from them, without
+            reading its tiles. The default is ``False``.
+
+            Note:
+                The statistics are gathered in the same pass over the tiles as the write. A
+                partition that is computed more than once, such as when a task is retried, is
+                only counted once. :meth:`~geopyspark.geotrellis.catalog.update_layer` removes
+                the stored statistics of the layer it changes.
+        scheduler_pool (str, optional): The name of the Spark scheduler pool to run the jobs of
+            the write in, such as a pool of the ``FAIR`` scheduler. If ``None``, the default, then
+            the jobs run in the pool of the calling thread.
     """
 
     if tiled_raster_layer.zoom_level is None:
@@ -266,10 +310,14 @@ def write(uri,
     writer = pysc._gateway.jvm.geopyspark.geotrellis.io.LayerWriterWrapper(
         store.wrapper.attributeStore(), uri, use_cogs)
 
+    if scheduler_pool:
+        writer.setSchedulerPool(scheduler_pool)
+
     if tiled_raster_layer.layer_type == LayerType.SPATIAL:
         writer.writeSpatial(layer_name,
                             tiled_raster_layer.srdd,
-                            IndexingMethod(index_strategy).value)
+                            IndexingMethod(index_strategy).value,
+                            compute_statistics)
 
     elif tiled_raster_layer.layer_type == LayerType.SPACETIME:
         if time_resolution:
@@ -279,7 +327,8 @@ def write(uri,
                              tiled_raster_layer.srdd,
                              TimeUnit(time_unit).value,
                              time_resolution,
-                             IndexingMethod(index_strategy).value)
+                             IndexingMethod(index_strategy).value,
+                             compute_statistics)
     else:
         raise ValueError("Cannot write {} layer".format(tiled_raster_layer.layer_type))
 
@@ -4,7 +4,7 @@ PNGs, and GeoTiffs.
 import struct
 import numpy as np
 from geopyspark import get_spark_context
-from geopyspark.geotrellis.histogram import Histogram
+from geopyspark.geotrellis.histogram import Histogram, LocalHistogram
 from geopyspark.geopyspark_utils import ensure_pyspark
 ensure_pyspark()
 
@@ -98,8 +98,8 @@ class ColorMap(object):
             breaks (dict or list or ``np.ndarray`` or :class:`~geopyspark.geotrellis.Histogram`): If a
                 ``dict`` then a mapping from tile values to colors, the latter represented as integers
                 e.g., 0xff000080 is red at half opacity. If a ``list`` then tile values that
-                specify breaks in the color mapping. If a ``Histogram`` then a histogram from which
-                breaks can be derived.
+                specify breaks in the color mapping. If a ``Histogram`` or ``LocalHistogram`` then a
+                histogram from which breaks can be derived.
             colors (str or list, optional):  If a ``str`` then the name of a matplotlib color ramp.
                 If a ``list`` then either a list of colortools ``Color`` objects or a list
                 of integers containing packed RGBA values. If ``None``, then the ``ColorMap`` will
@@ -137,7 +137,7 @@ class ColorMap(object):
 
         if isinstance(breaks, list):
             return ColorMap.from_colors(breaks, color_list, no_data_color, fallback, classification_strategy)
-        elif isinstance(breaks, Histogram):
+        elif isinstance(breaks, (Histogram, LocalHistogram)):
             return ColorMap.from_histogram(breaks, color_list, no_data_color, fallback, classification_strategy)
         else:
             raise ValueError("Could not construct ColorMap from the given breaks", breaks)
@@ -221,8 +221,8 @@ class ColorMap(object):
         """Converts a wrapped GeoTrellis histogram into a ``ColorMap``.
 
         Args:
-            histogram (:class:`~geopyspark.geotrellis.Histogram`): A ``Histogram`` instance;
-                specifies breaks
+            histogram (:class:`~geopyspark.geotrellis.Histogram` or :class:`~geopyspark.geotrellis.histogram.LocalHistogram`):
+                A ``Histogram`` or ``LocalHistogram`` instance; specifies breaks
             color_list ([int]): The colors corresponding to the values in the
                 breaks list, represented as integers e.g., 0xff000080 is red
                 at half opacity.
@@ -241,6 +241,9 @@ class ColorMap(object):
 
         pysc = get_spark_context()
 
+        if isinstance(histogram, LocalHistogram):
+            histogram = histogram.to_histogram()
+
         fn = pysc._gateway.jvm.geopyspark.geotrellis.ColorMapUtils.fromHistogram
         strat = ClassificationStrategy(classification_strategy).value
         return cls(fn(histogram.scala_histogram, color_list, no_data_color, fallback, strat))
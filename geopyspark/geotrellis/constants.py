@@ -6,7 +6,8 @@ __all__ = ['NO_DATA_INT', 'LayerType', 'IndexingMethod', 'ResampleMethod', 'Time
            'Operation', 'Neighborhood', 'ClassificationStrategy', 'CellType', 'ColorRamp',
            'DEFAULT_MAX_TILE_SIZE', 'DEFAULT_PARTITION_BYTES', 'DEFAULT_CHUNK_SIZE',
            'DEFAULT_GEOTIFF_TIME_TAG', 'DEFAULT_GEOTIFF_TIME_FORMAT', 'DEFAULT_S3_CLIENT',
-           'StorageMethod', 'ColorSpace', 'Compression', 'Unit', 'ReadMethod']
+           'StorageMethod', 'ColorSpace', 'Compression', 'Unit', 'ReadMethod',
+           'TILE_COMPRESSION_CONF_KEY', 'TileCompression']
 
 
 """The NoData value for ints in GeoTrellis."""
@@ -37,6 +38,11 @@ DEFAULT_GEOTIFF_TIME_FORMAT = "yyyy:MM:dd HH:mm:ss"
 DEFAULT_S3_CLIENT = "default"
 
 
+"""The Spark configuration key that sets the default ``TileCompression`` used when moving tiles
+between Python and Scala."""
+TILE_COMPRESSION_CONF_KEY = "spark.geopyspark.tile.compression"
+
+
 class LayerType(Enum):
     """The type of the key within the tuple of the wrapped RDD."""
 
@@ -286,6 +292,17 @@ class Compression(Enum):
     DEFLATE_COMPRESSION = "DeflateCompression"
 
 
+class TileCompression(Enum):
+    """Compression methods for the cells of tiles sent between Python and Scala.
+
+    ``LZ4`` requires the ``lz4`` package and ``ZSTD`` requires the ``zstandard`` package.
+    """
+
+    NONE = "none"
+    LZ4 = "lz4"
+    ZSTD = "zstd"
+
+
 class Unit(Enum):
     """Represents the units of elevation."""
 
@@ -3,9 +3,10 @@ class.
 """
 
 import json
+import numpy as np
 from geopyspark import get_spark_context
 
-__all__ = ['Histogram']
+__all__ = ['Histogram', 'LocalHistogram', 'QuantileSketch']
 
 
 class Histogram(object):
@@ -185,6 +186,23 @@ class Histogram(object):
 
         return Histogram(self.scala_histogram.merge(other_histogram.scala_histogram))
 
+    def to_local(self):
+        """Copies the buckets of the histogram into a
+        :class:`~geopyspark.geotrellis.histogram.LocalHistogram`, which answers the same queries
+        in Python without calling into the JVM.
+
+        All of the buckets are sent across as one packed buffer, so this is much cheaper than
+        calling the methods of this class many times.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.LocalHistogram`
+        """
+
+        pysc = get_spark_context()
+        packed = pysc._gateway.jvm.geopyspark.geotrellis.PackedHistogram.encode(self.scala_histogram)
+
+        return _unpack_local_histogram(packed)
+
     def to_dict(self):
         """Encodes histogram as a dictionary
 
@@ -195,3 +213,799 @@ class Histogram(object):
         pysc = get_spark_context()
         histogram_json = pysc._gateway.jvm.geopyspark.geotrellis.Json.writeHistogram(self.scala_histogram)
         return json.loads(histogram_json)
+
+
+def _unpack_local_histogram(packed, offset=0):
+    """Reads a histogram packed by ``PackedHistogram.encode`` in the JVM, starting at ``offset``."""
+
+    (is_int, max_bucket_count) = (int(value) for value in
+                                  np.frombuffer(packed, dtype=np.int32, count=2, offset=offset))
+    bucket_count = int(np.frombuffer(packed, dtype=np.int64, count=1, offset=offset + 8)[0])
+    (min_value, max_value) = np.frombuffer(packed, dtype=np.float64, count=2, offset=offset + 16)
+    labels = np.frombuffer(packed, dtype=np.float64, count=bucket_count, offset=offset + 32)
+    counts = np.frombuffer(packed, dtype=np.int64, count=bucket_count, offset=offset + 32 + bucket_count * 8)
+
+    return LocalHistogram(labels.astype(np.int64) if is_int else labels.copy(),
+                          counts.copy(),
+                          max_bucket_count,
+                          None if np.isnan(min_value) else min_value,
+                          None if np.isnan(max_value) else max_value)
+
+
+def _unpack_local_histograms(packed):
+    """Reads the histograms packed by ``PackedHistogram.encodeAll`` in the JVM. Histograms that
+    were ``null`` are ``None``.
+    """
+
+    histograms = []
+    offset = 0
+
+    while offset < len(packed):
+        length = int(np.frombuffer(packed, dtype=np.int64, count=1, offset=offset)[0])
+        histograms.append(_unpack_local_histogram(packed, offset + 8) if length else None)
+        offset += 8 + length
+
+    return histograms
+
+
+class LocalHistogram(object):
+    """A histogram whose buckets are held in numpy arrays on the driver.
+
+    A ``LocalHistogram`` has the same methods as
+    :class:`~geopyspark.geotrellis.histogram.Histogram`, but none of them call into the JVM. It
+    is usually made with :meth:`~geopyspark.geotrellis.histogram.Histogram.to_local`, and can be
+    stored and rebuilt with :meth:`~geopyspark.geotrellis.histogram.LocalHistogram.to_dict` and
+    :meth:`~geopyspark.geotrellis.histogram.LocalHistogram.from_dict`, which use the same format
+    as ``Histogram``.
+
+    The histogram is either of ints, where each bucket is a distinct value, or of floats, where
+    each bucket is the mean of the values that it holds, as in the GeoTrellis
+    ``StreamingHistogram``.
+
+    Args:
+        labels (np.ndarray): The label of each bucket in ascending order, as ``int64``\s for a
+            histogram of ints or ``float64``\s for a histogram of floats.
+        counts (np.ndarray): The number of values in each bucket, as ``int64``\s.
+        max_bucket_count (int): The most buckets that the histogram may have. Merging
+            histograms of floats combines their closest buckets until there are no more than this.
+        min_value (int or float, optional): The smallest value of the histogram. If not given,
+            then the label of the first bucket is used.
+        max_value (int or float, optional): The largest value of the histogram. If not given,
+            then the label of the last bucket is used.
+
+    Attributes:
+        labels (np.ndarray): The label of each bucket in ascending order.
+        counts (np.ndarray): The number of values in each bucket.
+        max_bucket_count (int): The most buckets that the histogram may have.
+    """
+
+    def __init__(self, labels, counts, max_bucket_count, min_value=None, max_value=None):
+        self.labels = np.asarray(labels)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.max_bucket_count = max_bucket_count
+
+        if len(self.labels):
+            self._min = self.labels[0] if min_value is None else min_value
+            self._max = self.labels[-1] if max_value is None else max_value
+        else:
+            self._min = None
+            self._max = None
+
+    @property
+    def is_int(self):
+        """Whether the values of the histogram are ints."""
+
+        return self.labels.dtype.kind in 'iu'
+
+    def _item(self, value):
+        if value is None:
+            return None
+
+        return int(value) if self.is_int else float(value)
+
+    @classmethod
+    def from_dict(cls, value):
+        """Rebuilds a ``LocalHistogram`` from the ``dict`` made by its
+        :meth:`~geopyspark.geotrellis.histogram.LocalHistogram.to_dict` method, or by that of
+        :class:`~geopyspark.geotrellis.histogram.Histogram`.
+
+        Args:
+            value (dict or list): The encoded histogram.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.LocalHistogram`
+        """
+
+        if isinstance(value, dict):
+            buckets = sorted(value['buckets'])
+            labels = np.array([label for (label, _) in buckets], dtype=np.float64)
+            max_bucket_count = value['maxBucketCount']
+        else:
+            buckets = sorted(value)
+            labels = np.array([label for (label, _) in buckets], dtype=np.int64)
+            max_bucket_count = max(len(buckets), 1)
+
+        counts = np.array([count for (_, count) in buckets], dtype=np.int64)
+
+        return cls(labels, counts, max_bucket_count)
+
+    def to_dict(self):
+        """Encodes the histogram as the same ``dict`` as
+        :meth:`~geopyspark.geotrellis.histogram.Histogram.to_dict`.
+
+        Returns:
+            ``dict`` for a histogram of floats, or ``list`` for a histogram of ints.
+        """
+
+        buckets = [[label, count] for (label, count) in zip(self.labels.tolist(), self.counts.tolist())]
+
+        if self.is_int:
+            return buckets
+
+        return {'maxBucketCount': self.max_bucket_count, 'buckets': buckets}
+
+    def to_histogram(self):
+        """Copies the histogram into the JVM as a
+        :class:`~geopyspark.geotrellis.histogram.Histogram`.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.Histogram`
+        """
+
+        return Histogram.from_dict(self.to_dict())
+
+    def total_count(self):
+        """The number of values in the histogram.
+
+        Returns:
+            int
+        """
+
+        return int(self.counts.sum())
+
+    def min(self):
+        """The smallest value of the histogram, or ``None`` if it is empty.
+
+        Returns:
+            int or float
+        """
+
+        return self._item(self._min)
+
+    def max(self):
+        """The largest value of the histogram, or ``None`` if it is empty.
+
+        Returns:
+            int or float
+        """
+
+        return self._item(self._max)
+
+    def min_max(self):
+        """The smallest and largest values of the histogram.
+
+        Returns:
+            (int, int) or (float, float)
+        """
+
+        return (self.min(), self.max())
+
+    def mean(self):
+        """Determines the mean of the histogram, or ``None`` if it is empty.
+
+        Returns:
+            float
+        """
+
+        if not self.total_count():
+            return None
+
+        return float(np.dot(self.labels.astype(np.float64), self.counts) / self.total_count())
+
+    def mode(self):
+        """Determines the label of the bucket with the most values, or ``None`` if the
+        histogram is empty.
+
+        Returns:
+            int or float
+        """
+
+        if not len(self.counts):
+            return None
+
+        return self._item(self.labels[np.argmax(self.counts)])
+
+    def median(self):
+        """Determines the median of the histogram.
+
+        Returns:
+            float
+        """
+
+        return self.quantile(0.5)
+
+    def values(self):
+        """Lists the label of each bucket within the histogram.
+
+        Returns:
+            [int] or [float]
+        """
+
+        return self.labels.tolist()
+
+    def item_count(self, item):
+        """Returns the number of values in the bucket of the given label.
+
+        For a histogram of floats, the count of a value that falls between two buckets is
+        interpolated from their counts, as in the GeoTrellis ``StreamingHistogram``.
+
+        Args:
+            item (int or float): The value whose occurences should be counted.
+
+        Returns:
+            int
+        """
+
+        index = np.searchsorted(self.labels, item)
+
+        if index < len(self.labels) and self.labels[index] == item:
+            return int(self.counts[index])
+
+        if self.is_int or index == 0 or index == len(self.labels):
+            return 0
+
+        return int(round(np.interp(item, self.labels[index - 1:index + 1], self.counts[index - 1:index + 1])))
+
+    def _cumulative_fractions(self):
+        return np.cumsum(self.counts) / float(max(self.total_count(), 1))
+
+    def cdf(self, values=None):
+        """Returns the cdf of the distribution of the histogram.
+
+        Args:
+            values (float or np.ndarray, optional): The values to evaluate the cdf at. If not
+                given, then the cdf is given at the label of each bucket.
+
+        Returns:
+            If ``values`` is not given, a ``[(float, float)]`` of the label of each bucket and the
+            fraction of values that are less than or equal to it. Otherwise, the fraction of
+            values that are less than or equal to each of ``values``, interpolated between the
+            labels of the buckets, with the same shape as ``values``.
+        """
+
+        fractions = self._cumulative_fractions()
+
+        if values is None:
+            return list(zip(self.labels.astype(np.float64).tolist(), fractions.tolist()))
+
+        return np.interp(values, self.labels.astype(np.float64), fractions, left=0.0, right=1.0)
+
+    def quantile(self, q):
+        """Returns the values at the given quantiles, interpolated between the labels of the
+        buckets.
+
+        Args:
+            q (float or np.ndarray): The quantiles, between 0 and 1.
+
+        Returns:
+            float or np.ndarray: The values at ``q``, with the same shape as ``q``. These are
+            ``NaN`` if the histogram is empty.
+        """
+
+        if not len(self.labels):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        result = np.interp(q, self._cumulative_fractions(), self.labels.astype(np.float64))
+
+        return result if np.ndim(q) else float(result)
+
+    def bucket_count(self):
+        """Returns the number of buckets within the histogram.
+
+        Returns:
+            int
+        """
+
+        return len(self.labels)
+
+    def bin_counts(self):
+        """Returns a list of tuples where the key is the bin label value and the
+        value is the label's respective count.
+
+        Returns:
+            [(int, int)] or [(float, int)]
+        """
+
+        return list(zip(self.labels.tolist(), self.counts.tolist()))
+
+    def quantile_breaks(self, num_breaks):
+        """Returns quantile breaks for this histogram.
+
+        The breaks are the values at the quantiles ``1 / num_breaks``, ``2 / num_breaks``, up
+        to ``1``. For a histogram of ints, these are rounded to the nearest int.
+
+        Args:
+            num_breaks (int): The number of breaks to return.
+
+        Returns:
+            [int] or [float]: The breaks, which are empty if the histogram is empty.
+        """
+
+        if not len(self.labels):
+            return []
+
+        breaks = self.quantile(np.arange(1, num_breaks + 1) / float(num_breaks))
+
+        if self.is_int:
+            return np.rint(breaks).astype(np.int64).tolist()
+
+        return breaks.tolist()
+
+    def merge(self, other_histogram):
+        """Merges this histogram with another without calling into the JVM.
+
+        For histograms of ints, the counts of each value are added. For histograms of floats,
+        the buckets of both are combined, and then the two closest buckets are repeatedly
+        replaced by their weighted mean until there are no more than ``max_bucket_count``, as in
+        the GeoTrellis ``StreamingHistogram``.
+
+        Args:
+            other_histogram (:class:`~geopyspark.geotrellis.histogram.LocalHistogram`): The
+                histogram that should be merged with this instance.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.LocalHistogram`
+        """
+
+        labels = np.concatenate([self.labels, other_histogram.labels])
+        counts = np.concatenate([self.counts, other_histogram.counts])
+
+        (labels, inverse) = np.unique(labels, return_inverse=True)
+        counts = np.bincount(inverse.reshape(-1), weights=counts, minlength=len(labels)).astype(np.int64)
+        max_bucket_count = max(self.max_bucket_count, other_histogram.max_bucket_count)
+
+        if not (self.is_int and other_histogram.is_int):
+            labels = labels.astype(np.float64)
+
+            while len(labels) > max_bucket_count:
+                i = int(np.argmin(np.diff(labels)))
+                total = counts[i] + counts[i + 1]
+
+                labels[i] = (labels[i] * counts[i] + labels[i + 1] * counts[i + 1]) / total
+                counts[i] = total
+                labels = np.delete(labels, i + 1)
+                counts = np.delete(counts, i + 1)
+
+        extremes = [value for value in (self._min, self._max, other_histogram._min, other_histogram._max)
+                    if value is not None]
+
+        return LocalHistogram(labels, counts, max_bucket_count,
+                              min(extremes) if extremes else None,
+                              max(extremes) if extremes else None)
+
+
+class QuantileSketch(object):
+    """A mergeable sketch of the distribution of the values of a layer, from which approximate
+    quantiles can be found without scanning every cell.
+
+    The sketch is made in the JVM with the KLL algorithm, and is then held on the driver as a set
+    of weighted values, so none of its methods call into the JVM. It is usually made with
+    :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.get_quantile_sketch`, possibly from a
+    sample of the tiles of the layer. It can be stored in an
+    :class:`~geopyspark.geotrellis.catalog.AttributeStore` for reuse::
+
+        store.layer("dem", zoom=12).write("quantile_sketch", sketch.to_dict())
+        sketch = gps.QuantileSketch.from_dict(store.layer("dem", zoom=12).read("quantile_sketch"))
+
+    Args:
+        values (np.ndarray): The values held by the sketch, as ``float64``\s.
+        weights (np.ndarray): The number of values that each of ``values`` stands for, as
+            ``int64``\s.
+        k (int): The accuracy parameter of the sketch. See
+            :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.rank_error`.
+        min_value (float, optional): The smallest value that was sketched.
+        max_value (float, optional): The largest value that was sketched.
+        total_tiles (int, optional): The number of tiles of the layer. If not given, then every
+            tile is taken to have been sampled.
+        sampled_tiles (int, optional): The number of tiles whose values were sketched.
+        compacted_weight (int, optional): The sum of the weights of the levels that were
+            compacted by :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.merge`.
+        compacted_variance (int, optional): The sum of the squares of those weights.
+
+    Attributes:
+        values (np.ndarray): The values held by the sketch, in ascending order.
+        weights (np.ndarray): The number of values that each of ``values`` stands for.
+        k (int): The accuracy parameter of the sketch.
+        total_tiles (int): The number of tiles of the layer.
+        sampled_tiles (int): The number of tiles whose values were sketched.
+        compacted_weight (int): The sum of the weights of the levels that were compacted when
+            sketches were merged on the driver.
+        compacted_variance (int): The sum of the squares of those weights.
+    """
+
+    def __init__(self, values, weights, k, min_value=None, max_value=None, total_tiles=None,
+                 sampled_tiles=None, compacted_weight=0, compacted_variance=0):
+        order = np.argsort(values, kind='mergesort')
+
+        self.values = np.asarray(values, dtype=np.float64)[order]
+        self.weights = np.asarray(weights, dtype=np.int64)[order]
+        self.k = k
+        self.sampled_tiles = sampled_tiles
+        self.total_tiles = sampled_tiles if total_tiles is None else total_tiles
+        self.compacted_weight = compacted_weight
+        self.compacted_variance = compacted_variance
+
+        if len(self.values):
+            self._min = float(self.values[0] if min_value is None else min_value)
+            self._max = float(self.values[-1] if max_value is None else max_value)
+        else:
+            self._min = None
+            self._max = None
+
+    def count(self):
+        """The number of values that were sketched.
+
+        Returns:
+            int
+        """
+
+        return int(self.weights.sum())
+
+    def min(self):
+        """The smallest value that was sketched, or ``None`` if the sketch is empty. If only a
+        sample of the tiles was sketched, then this may be larger than the smallest value of the
+        layer.
+
+        Returns:
+            float
+        """
+
+        return self._min
+
+    def max(self):
+        """The largest value that was sketched, or ``None`` if the sketch is empty. If only a
+        sample of the tiles was sketched, then this may be smaller than the largest value of the
+        layer.
+
+        Returns:
+            float
+        """
+
+        return self._max
+
+    def min_max(self):
+        """The smallest and largest values that were sketched.
+
+        Returns:
+            (float, float)
+        """
+
+        return (self._min, self._max)
+
+    def rank_error(self):
+        """The approximate normalized rank error of the sketch itself, with 99% confidence.
+
+        That is, the fraction of the sketched values that are less than the value returned by
+        :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.quantile` for ``q`` is within this
+        much of ``q``. It is the error of the sketch made in the JVM, which only depends on ``k``
+        and is about 1.3% when ``k`` is 200, plus the
+        :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.merge_error`.
+
+        Returns:
+            float
+        """
+
+        if (self.weights <= 1).all():
+            return 0.0
+
+        return 2.296 / self.k ** 0.9723 + self.merge_error()
+
+    def merge_error(self):
+        """The normalized rank error, with 99% confidence, added by the compactions done when
+        sketches were merged with :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.merge`.
+
+        Compacting a level of weight ``w`` moves the rank of any value by at most ``w``, up or
+        down at random. The error is the smaller of the sum of these weights and the Hoeffding
+        bound on their sum, divided by the number of sketched values.
+
+        Returns:
+            float
+        """
+
+        if not self.compacted_weight:
+            return 0.0
+
+        hoeffding = np.sqrt(2 * np.log(2 / 0.01) * self.compacted_variance)
+
+        return float(min(self.compacted_weight, hoeffding) / self.count())
+
+    def sampling_error(self):
+        """The approximate normalized rank error that comes from only sketching a sample of the
+        tiles, with 99% confidence.
+
+        This is the Dvoretzky-Kiefer-Wolfowitz bound for the number of sampled tiles. It treats
+        each tile as one sample, so it is conservative when the values within a tile vary
+        as much as the values of the layer. It is 0 when every tile was sketched.
+
+        Returns:
+            float
+        """
+
+        if not self.sampled_tiles or self.sampled_tiles >= self.total_tiles:
+            return 0.0
+
+        return float(np.sqrt(np.log(2 / 0.01) / (2 * self.sampled_tiles)))
+
+    def error_bounds(self):
+        """Reports how accurate the quantiles of the sketch are.
+
+        Returns:
+            ``dict``: The ``'rank_error'`` and ``'sampling_error'``, their sum as
+            ``'total_rank_error'``, the part of the ``'rank_error'`` that comes from merging
+            sketches as ``'merge_error'``, and the ``'sampled_tiles'`` and ``'total_tiles'``.
+        """
+
+        return {
+            'rank_error': self.rank_error(),
+            'merge_error': self.merge_error(),
+            'sampling_error': self.sampling_error(),
+            'total_rank_error': self.rank_error() + self.sampling_error(),
+            'sampled_tiles': self.sampled_tiles,
+            'total_tiles': self.total_tiles
+        }
+
+    def cdf(self, values):
+        """Returns the approximate fraction of values that are less than or equal to each of
+        the given values.
+
+        Args:
+            values (float or np.ndarray): The values to evaluate the cdf at.
+
+        Returns:
+            float or np.ndarray: The fractions, with the same shape as ``values``.
+        """
+
+        if not len(self.values):
+            return np.full(np.shape(values), np.nan) if np.ndim(values) else np.nan
+
+        cumulative = np.cumsum(self.weights) / float(self.count())
+        result = cumulative[np.searchsorted(self.values, values, side='right') - 1]
+        result = np.where(np.asarray(values) < self.values[0], 0.0, result)
+
+        return result if np.ndim(values) else float(result)
+
+    def quantile(self, q):
+        """Returns the approximate values at the given quantiles.
+
+        Args:
+            q (float or np.ndarray): The quantiles, between 0 and 1.
+
+        Returns:
+            float or np.ndarray: The values at ``q``, with the same shape as ``q``. These are
+            ``NaN`` if the sketch is empty.
+        """
+
+        if not len(self.values):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        cumulative = np.cumsum(self.weights)
+        ranks = np.asarray(q, dtype=np.float64) * cumulative[-1]
+        indices = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(self.values) - 1)
+        result = self.values[indices]
+
+        return result if np.ndim(q) else float(result)
+
+    def median(self):
+        """Returns the approximate median of the sketched values.
+
+        Returns:
+            float
+        """
+
+        return self.quantile(0.5)
+
+    def quantile_breaks(self, num_breaks):
+        """Returns approximate quantile breaks, which are the values at the quantiles
+        ``1 / num_breaks``, ``2 / num_breaks``, up to ``1``.
+
+        Args:
+            num_breaks (int): The number of breaks to return.
+
+        Returns:
+            [float]: The breaks, which are empty if the sketch is empty.
+        """
+
+        if not len(self.values):
+            return []
+
+        return self.quantile(np.arange(1, num_breaks + 1) / float(num_breaks)).tolist()
+
+    def to_histogram(self, max_bucket_count=80):
+        """Approximates the distribution of the sketch with a histogram of floats.
+
+        Args:
+            max_bucket_count (int, optional): The most buckets that the histogram may have.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.LocalHistogram`
+        """
+
+        histogram = LocalHistogram(self.values, self.weights, max_bucket_count, self._min, self._max)
+
+        return histogram.merge(LocalHistogram(np.empty(0), np.empty(0, dtype=np.int64), max_bucket_count))
+
+    def merge(self, other_sketch, seed=None):
+        """Merges this sketch with another, as if both sets of values had been sketched together.
+
+        The values of both sketches are combined level by level, and are then compacted back to
+        the capacity of the smaller ``k`` in the same way as the sketches of the JVM are, so a
+        sketch that is merged many times does not grow. The error that these compactions add is
+        reported by :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.merge_error`.
+
+        Args:
+            other_sketch (:class:`~geopyspark.geotrellis.histogram.QuantileSketch`): The sketch
+                that should be merged with this instance.
+            seed (int, optional): The seed of the random choices of the compactions.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.QuantileSketch`
+
+        Raises:
+            ValueError: If a weight of either sketch is not a power of 2.
+        """
+
+        extremes = [value for value in (self._min, self._max, other_sketch._min, other_sketch._max)
+                    if value is not None]
+
+        def add(a, b):
+            return None if a is None or b is None else a + b
+
+        k = min(self.k, other_sketch.k)
+        (values, weights, compacted_weight, compacted_variance) = \
+            _compact_sketch(np.concatenate([self.values, other_sketch.values]),
+                            np.concatenate([self.weights, other_sketch.weights]),
+                            k,
+                            np.random.RandomState(seed))
+
+        return QuantileSketch(values,
+                              weights,
+                              k,
+                              min(extremes) if extremes else None,
+                              max(extremes) if extremes else None,
+                              add(self.total_tiles, other_sketch.total_tiles),
+                              add(self.sampled_tiles, other_sketch.sampled_tiles),
+                              self.compacted_weight + other_sketch.compacted_weight + compacted_weight,
+                              self.compacted_variance + other_sketch.compacted_variance + compacted_variance)
+
+    def to_dict(self):
+        """Encodes the sketch as a ``dict`` that can be stored as JSON.
+
+        Returns:
+            ``dict``
+        """
+
+        return {
+            'k': self.k,
+            'min': self._min,
+            'max': self._max,
+            'values': self.values.tolist(),
+            'weights': self.weights.tolist(),
+            'totalTiles': self.total_tiles,
+            'sampledTiles': self.sampled_tiles,
+            'compactedWeight': self.compacted_weight,
+            'compactedVariance': self.compacted_variance
+        }
+
+    @classmethod
+    def from_dict(cls, value):
+        """Rebuilds a ``QuantileSketch`` from the ``dict`` made by its
+        :meth:`~geopyspark.geotrellis.histogram.QuantileSketch.to_dict` method.
+
+        Args:
+            value (dict): The encoded sketch.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.QuantileSketch`
+        """
+
+        return cls(np.array(value['values'], dtype=np.float64),
+                   np.array(value['weights'], dtype=np.int64),
+                   value['k'],
+                   value.get('min'),
+                   value.get('max'),
+                   value.get('totalTiles'),
+                   value.get('sampledTiles'),
+                   value.get('compactedWeight', 0),
+                   value.get('compactedVariance', 0))
+
+
+def _unpack_layer_sketch(packed):
+    """Unpacks the buffer made by ``LayerSketch`` in the JVM into a
+    :class:`~geopyspark.geotrellis.histogram.QuantileSketch` for each band.
+    """
+
+    band_count = int(np.frombuffer(packed, dtype=np.int32, count=1)[0])
+    (total_tiles, sampled_tiles) = (int(value) for value in np.frombuffer(packed, dtype=np.int64, count=2, offset=8))
+
+    sketches = []
+    offset = 24
+
+    for _ in range(band_count):
+        length = int(np.frombuffer(packed, dtype=np.int64, count=1, offset=offset)[0])
+        offset += 8
+
+        (k, size) = (int(value) for value in np.frombuffer(packed, dtype=np.int32, count=2, offset=offset))
+        (min_value, max_value) = np.frombuffer(packed, dtype=np.float64, count=2, offset=offset + 16)
+        values = np.frombuffer(packed, dtype=np.float64, count=size, offset=offset + 32)
+        weights = np.frombuffer(packed, dtype=np.int64, count=size, offset=offset + 32 + size * 8)
+
+        sketches.append(QuantileSketch(values, weights, k,
+                                       None if np.isnan(min_value) else min_value,
+                                       None if np.isnan(max_value) else max_value,
+                                       total_tiles,
+                                       sampled_tiles))
+        offset += length
+
+    return sketches
+
+
+def _compact_sketch(values, weights, k, random):
+    """Compacts the weighted values of a KLL sketch until they fit in the capacity for ``k``,
+    as ``QuantileSketch.compress`` does in the JVM. Each value of weight ``2 ** level`` is held
+    by the compactor of that level.
+
+    Returns:
+        (np.ndarray, np.ndarray, int, int): The values and weights that are left, and the sum
+        and the sum of the squares of the weights of the levels that were compacted.
+    """
+
+    levels = np.log2(np.maximum(weights, 1)).astype(np.int64) if len(weights) else weights
+
+    if len(weights) and ((weights < 1).any() or (np.int64(1) << levels != weights).any()):
+        raise ValueError("The weights of a sketch must be powers of 2")
+
+    top_level = int(levels.max()) if len(levels) else 0
+    compactors = [np.sort(values[levels == level]) for level in range(top_level + 1)]
+
+    def capacity(level):
+        depth = len(compactors) - level - 1
+        return int(np.ceil((2.0 / 3.0) ** depth * k)) + 1
+
+    def max_size():
+        return sum(capacity(level) for level in range(len(compactors)))
+
+    size = len(values)
+    compacted_weight = 0
+    compacted_variance = 0
+
+    while size >= max_size():
+        level = 0
+        done = False
+
+        while not done and level < len(compactors):
+            if len(compactors[level]) >= capacity(level):
+                if level + 1 >= len(compactors):
+                    compactors.append(np.empty(0))
+
+                # Every other value, starting at random, moves up a level. If there is an odd
+                # number of values, the smallest one stays
+                items = np.sort(compactors[level])
+                start = len(items) % 2
+                offset = random.randint(2)
+
+                compactors[level + 1] = np.concatenate([compactors[level + 1], items[start + offset::2]])
+                compactors[level] = items[:start]
+
+                compacted_weight += 1 << level
+                compacted_variance += 1 << (2 * level)
+
+                size = sum(len(compactor) for compactor in compactors)
+                done = size < max_size()
+
+            level += 1
+
+    return (np.concatenate(compactors),
+            np.concatenate([np.full(len(compactor), 1 << level, dtype=np.int64)
+                            for (level, compactor) in enumerate(compactors)]),
+            compacted_weight,
+            compacted_variance)
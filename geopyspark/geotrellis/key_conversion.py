@@ -4,6 +4,8 @@ A module to provide facilites for converting between layout keys and spatial obj
 
 from math import ceil
 
+import numpy as np
+
 import geopyspark as gps
 from . import Extent
 
@@ -125,6 +127,32 @@ class KeyTransform(object):
         ex = self.__layout.mapTransform().apply(skey)
         return gps.Extent(ex.xmin(), ex.ymin(), ex.xmax(), ex.ymax())
 
+    def key_columns_to_extents(self, key_columns):
+        """Returns the Extent of every key in a set of key columns, computed with numpy.
+
+        Args:
+            key_columns (:class:`~geopyspark.geotrellis.KeyColumns`): The keys to find the
+                extents for, such as those returned by
+                :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.collect_key_columns`.
+
+        Returns:
+            ``np.ndarray``. A ``(N, 4)`` array whose rows are the ``xmin``, ``ymin``, ``xmax``,
+            and ``ymax`` of each key's extent.
+        """
+        extent = self.layout.extent
+        tile_layout = self.layout.tileLayout
+
+        tile_width = (extent.xmax - extent.xmin) / tile_layout.layoutCols
+        tile_height = (extent.ymax - extent.ymin) / tile_layout.layoutRows
+
+        cols = np.asarray(key_columns.cols, dtype=np.float64)
+        rows = np.asarray(key_columns.rows, dtype=np.float64)
+
+        xmins = extent.xmin + cols * tile_width
+        ymaxs = extent.ymax - rows * tile_height
+
+        return np.column_stack([xmins, ymaxs - tile_height, xmins + tile_width, ymaxs])
+
     def extent_to_keys(self, extent):
         """Returns the keys in the layout intersecting/covered by a given extent.
 
@@ -3,9 +3,12 @@ This module contains the ``RasterLayer`` and the ``TiledRasterLayer`` classes. B
 classes are wrappers of their Scala counterparts. These will be used in leau of actual PySpark RDDs
 when performing operations.
 '''
+import ast
 import json
+import time
 import datetime
-from dateutil import parser
+import concurrent.futures
+import numpy as np
 import pytz
 from  shapely import wkb
 from shapely.geometry import Polygon, MultiPolygon, Point
@@ -14,13 +17,19 @@ from geopyspark.geotrellis.protobufcodecs import (multibandtile_decoder,
                                                   projected_extent_decoder,
                                                   temporal_projected_extent_decoder,
                                                   spatial_key_decoder,
-                                                  space_time_key_decoder)
+                                                  space_time_key_decoder,
+                                                  spatial_key_encoder,
+                                                  space_time_key_encoder,
+                                                  tuple_decoder,
+                                                  _raw_cell_dtypes)
 from geopyspark.geotrellis.protobufserializer import ProtoBufSerializer
+from geopyspark.geotrellis.arrowserializer import ArrowSerializer
 from geopyspark.geopyspark_utils import ensure_pyspark
 ensure_pyspark()
 
 from pyspark.storagelevel import StorageLevel
 from pyspark.rdd import RDD
+from pyspark.serializers import AutoBatchedSerializer, NoOpSerializer
 from geopyspark import get_spark_context, create_python_rdd
 from geopyspark.geotrellis import (Metadata,
                                    Tile,
@@ -28,14 +37,17 @@ from geopyspark.geotrellis import (Metadata,
                                    LocalLayout,
                                    GlobalLayout,
                                    LayoutDefinition,
+                                   KeyColumns,
+                                   PointTimeSeries,
                                    crs_to_proj4,
                                    _convert_to_unix_time,
                                    HashPartitionStrategy,
                                    SpatialPartitionStrategy,
                                    SpaceTimePartitionStrategy,
                                    RasterizerOptions,
-                                   check_partition_strategy)
-from geopyspark.geotrellis.histogram import Histogram
+                                   check_partition_strategy,
+                                   Log)
+from geopyspark.geotrellis.histogram import Histogram, _unpack_layer_sketch, _unpack_local_histograms
 from geopyspark.geotrellis.constants import (IndexingMethod,
                                              Operation,
                                              Neighborhood as nb,
@@ -46,6 +58,8 @@ from geopyspark.geotrellis.constants import (IndexingMethod,
                                              StorageMethod,
                                              ColorSpace,
                                              Compression,
+                                             TileCompression,
+                                             TILE_COMPRESSION_CONF_KEY,
                                              TimeUnit,
                                              NO_DATA_INT,
                                              ReadMethod)
@@ -55,6 +69,13 @@ from geopyspark.geotrellis.neighborhood import Neighborhood
 __all__ = ["RasterLayer", "TiledRasterLayer", "Pyramid"]
 
 
+def _get_tile_compression(compression):
+    if compression is None:
+        compression = get_spark_context().getConf().get(TILE_COMPRESSION_CONF_KEY, TileCompression.NONE.value)
+
+    return TileCompression(compression.lower() if isinstance(compression, str) else compression).value
+
+
 def _reclassify(srdd,
                 value_map,
                 data_type,
@@ -182,6 +203,361 @@ def _to_spatial_layer(layer, target_time):
         return layer.srdd.toSpatialLayer()
 
 
+def _map_tile_batch(func, batch):
+    keys = [key for (key, _) in batch]
+    first = batch[0][1]
+
+    tile = Tile(np.stack([tile.cells for (_, tile) in batch]), first.cell_type, first.no_data_value)
+    result = func(keys, tile)
+
+    if not isinstance(result, Tile):
+        result = Tile(result, tile.cell_type, tile.no_data_value)
+
+    if len(result.cells) != len(keys):
+        raise ValueError("The function returned %s tiles for a batch of %s" % (len(result.cells), len(keys)))
+
+    return [(key, Tile(cells, result.cell_type, result.no_data_value))
+            for (key, cells) in zip(keys, result.cells)]
+
+def _same_no_data(a, b):
+    # NaN is the default NoData of float tiles, and never equals itself
+    return a == b or (a != a and b != b)
+
+def _tile_batch_mapper(func, batch_size):
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1, was given", batch_size)
+
+    def map_partition(iterator):
+        batch = []
+
+        for (key, tile) in iterator:
+            if batch:
+                first = batch[0][1]
+
+                # Only tiles of the same shape and cell type can be stacked together
+                if len(batch) == batch_size or \
+                   tile.cells.shape != first.cells.shape or \
+                   tile.cell_type != first.cell_type or \
+                   not _same_no_data(tile.no_data_value, first.no_data_value):
+                    for record in _map_tile_batch(func, batch):
+                        yield record
+
+                    batch = []
+
+            batch.append((key, tile))
+
+        if batch:
+            for record in _map_tile_batch(func, batch):
+                yield record
+
+    return map_partition
+
+def _tile_mapper(func):
+    def map_partition(iterator):
+        for (key, tile) in iterator:
+            yield (key, func(tile))
+
+    return map_partition
+
+def _normalize_tile(tile):
+    # Gives the tile the form it would have after a round trip through the JVM
+    cells = np.asarray(tile.cells, dtype=_raw_cell_dtypes.get(tile.cell_type, np.float64))
+
+    if cells.ndim == 2:
+        cells = np.expand_dims(cells, 0)
+
+    return Tile(cells, tile.cell_type, tile.no_data_value)
+
+
+class _PythonStage(object):
+    """A Python function that has yet to be applied to the tiles of a layer.
+
+    The function is only run once the data of the layer is needed. As the tiles of the source
+    layer are read through its ``to_numpy_rdd``, a chain of pending stages is pipelined by
+    PySpark into a single pass over the tiles, so that they make one round trip from and to
+    the JVM for the whole chain.
+
+    Args:
+        source (:class:`~geopyspark.geotrellis.layer.RasterLayer` or :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`):
+            The layer whose tiles the function is applied to.
+        func (iterator => iterator): A function that maps an iterator of ``(key, tile)``
+            tuples to another.
+
+    Attributes:
+        source (:class:`~geopyspark.geotrellis.layer.RasterLayer` or :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`):
+            The layer whose tiles the function is applied to.
+        func (iterator => iterator): A function that maps an iterator of ``(key, tile)``
+            tuples to another.
+    """
+
+    __slots__ = ['source', 'func']
+
+    def __init__(self, source, func):
+        self.source = source
+        self.func = func
+
+    def to_numpy_rdd(self, compression=None):
+        numpy_rdd = self.source.to_numpy_rdd(compression)
+
+        return numpy_rdd.mapPartitions(self.func, preservesPartitioning=True)
+
+
+class _LocalExpression(object):
+    """A local map algebra operation on ``TiledRasterLayer``\s and constants that has yet to be
+    evaluated.
+
+    The operators of ``TiledRasterLayer`` build a tree of these rather than running each
+    operation in the JVM as it is made. When the data of the resulting layer is needed, the whole
+    tree is sent to the JVM and evaluated cell by cell in a single pass over the layers it reads.
+
+    Args:
+        operation (str): The name of the operation. One of ``"add"``, ``"subtract"``,
+            ``"multiply"``, ``"divide"``, ``"pow"``, ``"max"`` or ``"abs"``.
+        args (list): The arguments of the operation. Each is either a ``_LocalExpression``, a
+            ``TiledRasterLayer``, an ``int`` or a ``float``.
+
+    Attributes:
+        operation (str): The name of the operation.
+        args (list): The arguments of the operation.
+    """
+
+    __slots__ = ['operation', 'args']
+
+    def __init__(self, operation, args):
+        self.operation = operation
+        self.args = args
+
+    def to_dict(self, layers):
+        """Encodes the expression as a ``dict`` that can be sent to the JVM as JSON.
+
+        Args:
+            layers (list): The ``TiledRasterLayer``\s that have been found in the expression so
+                far. Layers not already in the list are appended to it, and are referred to by
+                their index.
+
+        Returns:
+            dict
+        """
+
+        return {'op': self.operation, 'args': [_expression_arg_to_dict(arg, layers) for arg in self.args]}
+
+
+def _expression_arg_to_dict(arg, layers):
+    if isinstance(arg, _LocalExpression):
+        return arg.to_dict(layers)
+    elif isinstance(arg, int):
+        return {'int': arg}
+    elif isinstance(arg, float):
+        if np.isnan(arg):
+            # NaN and the infinities are not valid JSON numbers, so they are sent in the form
+            # that the JVM parses
+            return {'double': 'NaN'}
+        elif np.isinf(arg):
+            return {'double': 'Infinity' if arg > 0 else '-Infinity'}
+
+        return {'double': arg}
+
+    for (index, layer) in enumerate(layers):
+        if layer is arg:
+            return {'layer': index}
+
+    layers.append(arg)
+
+    return {'layer': len(layers) - 1}
+
+
+# Marks the attributes of a TiledRasterLayer that have yet to be retrieved from the JVM
+_NOT_RETRIEVED = object()
+
+
+_BAND_MATH_OPERATIONS = {
+    ast.Add: 'add',
+    ast.Sub: 'subtract',
+    ast.Mult: 'multiply',
+    ast.Div: 'divide',
+    ast.Pow: 'pow'
+}
+
+
+def _band_expression_to_dict(node, expression):
+    """Encodes a band math expression that has been parsed by ``ast`` as the ``dict`` form of a
+    ``_LocalExpression``, in which ``{'layer': i}`` refers to the ``i``-th band of a tile.
+    """
+
+    if isinstance(node, ast.Expression):
+        return _band_expression_to_dict(node.body, expression)
+
+    elif isinstance(node, ast.BinOp) and type(node.op) in _BAND_MATH_OPERATIONS:
+        return {'op': _BAND_MATH_OPERATIONS[type(node.op)],
+                'args': [_band_expression_to_dict(node.left, expression),
+                         _band_expression_to_dict(node.right, expression)]}
+
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return _band_expression_to_dict(node.operand, expression)
+
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return {'op': 'multiply', 'args': [{'int': -1}, _band_expression_to_dict(node.operand, expression)]}
+
+    elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        args = [_band_expression_to_dict(arg, expression) for arg in node.args]
+
+        if node.func.id == 'abs' and len(args) == 1:
+            return {'op': 'abs', 'args': args}
+        elif node.func.id == 'max' and len(args) > 1:
+            result = args[0]
+
+            for arg in args[1:]:
+                result = {'op': 'max', 'args': [result, arg]}
+
+            return result
+
+    elif isinstance(node, ast.Name) and node.id.startswith('b') and node.id[1:].isdigit():
+        return {'layer': int(node.id[1:])}
+
+    # Numbers are parsed as ast.Num before Python 3.8, and as ast.Constant since
+    elif type(node).__name__ in ('Num', 'Constant'):
+        value = node.value if isinstance(node, getattr(ast, 'Constant', ())) else node.n
+
+        if isinstance(value, int) and not isinstance(value, bool):
+            return {'int': value}
+        elif isinstance(value, float):
+            return _expression_arg_to_dict(value, [])
+
+    raise ValueError("Invalid band math expression", expression)
+
+
+_POINT_RECORD = np.dtype([('index', np.int64), ('x', np.float64), ('y', np.float64)])
+
+
+def _pack_points(indexed_points):
+    """Packs ``(point, index)`` pairs into the records read by ``PointSampling`` in the JVM."""
+
+    records = [(index, point.x, point.y) if isinstance(point, Point) else (index, point[0], point[1])
+               for (point, index) in indexed_points]
+
+    yield np.array(records, dtype=_POINT_RECORD).tobytes()
+
+
+def _unpack_point_samples(chunk, temporal=False):
+    """Unpacks a chunk of samples made by ``PointSampling`` in the JVM into the index of each
+    sampled point, the instant of each sample as ``datetime64[ms]``\s if ``temporal`` is set
+    or ``None`` otherwise, and an array of the sampled values with one column per band.
+    """
+
+    (count, band_count) = (int(value) for value in np.frombuffer(chunk, dtype=np.int32, count=2))
+
+    indices = np.frombuffer(chunk, dtype=np.int64, count=count, offset=8)
+    offset = 8 + count * 8
+
+    if temporal:
+        instants = np.frombuffer(chunk, dtype=np.int64, count=count, offset=offset).view('datetime64[ms]')
+        offset += count * 8
+    else:
+        instants = None
+
+    values = np.frombuffer(chunk, dtype=np.float64, count=count * band_count, offset=offset)
+
+    return (indices, instants, values.reshape(count, band_count))
+
+
+def _check_point_resample_method(resample_method):
+    if resample_method:
+        resample_method = ResampleMethod(resample_method)
+
+        point_resampling_methods = [
+            ResampleMethod.NEAREST_NEIGHBOR,
+            ResampleMethod.BILINEAR,
+            ResampleMethod.CUBIC_CONVOLUTION,
+            ResampleMethod.CUBIC_SPLINE
+        ]
+
+        if resample_method not in point_resampling_methods:
+            raise ValueError(resample_method, "Cannot be used to resample point values")
+
+    return resample_method
+
+
+_ZONAL_STATISTICS = ('count', 'sum', 'min', 'max', 'mean', 'std', 'histogram')
+
+
+def _check_zonal_statistics(stats):
+    stats = [stats] if isinstance(stats, str) else list(stats)
+
+    for stat in stats:
+        if stat not in _ZONAL_STATISTICS:
+            raise ValueError(stat, "is not a zonal statistic. Must be one of", _ZONAL_STATISTICS)
+
+    return stats
+
+
+def _split_packed_sections(packed, section_count):
+    """Splits a buffer made by ``KeyedZonalAccumulator.encodeAll`` in the JVM into its sections,
+    each of which is preceded by its length as a ``Long``.
+    """
+
+    packed = memoryview(packed)
+    sections = []
+    offset = 0
+
+    for _ in range(section_count):
+        length = int(np.frombuffer(packed, dtype=np.int64, count=1, offset=offset)[0])
+        sections.append(packed[offset + 8:offset + 8 + length])
+        offset += 8 + length
+
+    return sections
+
+
+def _unpack_zonal_statistics(packed, packed_histograms, stats, layer=None):
+    """Unpacks the statistics packed by ``ZonalAccumulator.encode`` in the JVM into a ``dict``
+    that maps each of ``stats`` to an array with a row for each zone and a column for each band.
+    The histograms are read from ``packed_histograms``, which is made by
+    ``ZonalAccumulator.encodeHistograms``, if ``'histogram'`` is one of ``stats``.
+
+    The accumulator only knows the number of bands once it has seen a cell, so if it has not, the
+    number of bands is read from ``layer``.
+    """
+
+    (zone_count, band_count) = (int(value) for value in np.frombuffer(packed, dtype=np.int32, count=2))
+    size = zone_count * band_count
+
+    counts = np.frombuffer(packed, dtype=np.int64, count=size, offset=8).reshape(zone_count, band_count)
+    (sums, means, squared_differences, mins, maxs) = \
+        np.frombuffer(packed, dtype=np.float64, count=size * 5, offset=8 + size * 8).reshape(
+            5, zone_count, band_count)
+
+    if not band_count and zone_count and layer is not None:
+        band_count = layer._band_count()
+
+        counts = np.zeros((zone_count, band_count), dtype=np.int64)
+        (sums, means, squared_differences, mins, maxs) = np.zeros((5, zone_count, band_count))
+
+    empty = counts == 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        computed = {
+            'count': counts,
+            'sum': sums,
+            'min': np.where(empty, np.nan, mins),
+            'max': np.where(empty, np.nan, maxs),
+            'mean': np.where(empty, np.nan, means),
+            'std': np.where(empty, np.nan, np.sqrt(squared_differences / counts))
+        }
+
+    result = {stat: computed[stat] for stat in stats if stat != 'histogram'}
+
+    if 'histogram' in stats:
+        # All of the histograms are sent in one buffer rather than with a call for each
+        histograms = _unpack_local_histograms(packed_histograms)
+
+        if not histograms:
+            histograms = [None] * (zone_count * band_count)
+
+        result['histogram'] = [histograms[zone * band_count:(zone + 1) * band_count]
+                               for zone in range(zone_count)]
+
+    return result
+
+
 class TileLayer(object):
     """
     Wrapper for Scala RDD instance of GeoTrellis multiband tiles through a py4j reference.
@@ -213,7 +589,13 @@ class TileLayer(object):
             :class:`~geopyspark.geotrellis.histogram.Histogram` or
             [:class:`~geopyspark.geotrellis.histogram.Histogram`]
         """
-        histogram = [Histogram(h) for h in self.srdd.getDoubleHistograms()]
+        statistics = self._stored_statistics()
+
+        if statistics:
+            histogram = [Histogram.from_dict(band['histogram']) for band in statistics['bands']]
+        else:
+            histogram = [Histogram(h) for h in self.srdd.getDoubleHistograms()]
+
         if len(histogram) == 1:
             return histogram[0]
         else:
@@ -226,6 +608,17 @@ class TileLayer(object):
             (float, float)
         """
 
+        statistics = self._stored_statistics()
+
+        if statistics:
+            mins = [band['min'] for band in statistics['bands'] if band['min'] is not None]
+            maxs = [band['max'] for band in statistics['bands'] if band['max'] is not None]
+
+            if mins:
+                return (min(mins), max(maxs))
+            else:
+                return (float('nan'), float('nan'))
+
         min_max = self.srdd.getMinMax()
         return (min_max._1(), min_max._2())
 
@@ -238,8 +631,50 @@ class TileLayer(object):
         Returns:
             ``[float]``
         """
+
+        statistics = self._stored_statistics()
+
+        if statistics:
+            histogram = Histogram.from_dict(statistics['bands'][0]['histogram'])
+            return histogram.quantile_breaks(num_breaks)
+
         return list(self.srdd.quantileBreaks(num_breaks))
 
+    def get_statistics(self):
+        """Returns the histogram, the smallest and largest values, the number of data cells and
+        the number of NoData cells of each band of the layer, along with its number of tiles.
+
+        These are the statistics that :meth:`~geopyspark.geotrellis.catalog.write` stores for a
+        layer when it is given ``compute_statistics=True``. For a layer read with
+        :meth:`~geopyspark.geotrellis.catalog.query` that covers the whole of a stored layer, they
+        are read from the catalog rather than computed.
+
+        Returns:
+            ``dict``: With the keys ``tile_count``, and ``histogram``, ``min``, ``max``, ``count``
+            and ``no_data_count``, each of which has a value for each band. The ``min`` and
+            ``max`` of a band without data are ``None``.
+        """
+
+        statistics = self._stored_statistics()
+
+        if not statistics:
+            statistics = json.loads(self.srdd.getStatistics())
+
+        bands = statistics['bands']
+
+        return {
+            'tile_count': statistics['tileCount'],
+            'histogram': [Histogram.from_dict(band['histogram']) for band in bands],
+            'min': [band['min'] for band in bands],
+            'max': [band['max'] for band in bands],
+            'count': [band['count'] for band in bands],
+            'no_data_count': [band['noDataCount'] for band in bands]
+        }
+
+    def _stored_statistics(self):
+        # The statistics stored in a catalog for the layer, if they are known to describe it
+        return None
+
     def get_quantile_breaks_exact_int(self, num_breaks):
         """Returns quantile breaks for this Layer.
         This version uses the ``FastMapHistogram``, which counts exact integer values.
@@ -253,6 +688,92 @@ class TileLayer(object):
         """
         return list(self.srdd.quantileBreaksExactInt(num_breaks))
 
+    def get_quantile_sketch(self, sample_fraction=1.0, max_tiles=None, k=200, seed=None):
+        """Creates a :class:`~geopyspark.geotrellis.histogram.QuantileSketch` for each band in
+        the layer. If only single band is present the sketch is returned directly.
+
+        Unlike :meth:`~geopyspark.geotrellis.layer.TileLayer.get_histogram`, the values of only a
+        sample of the tiles can be sketched, which is much faster for large layers. The sketches
+        report bounds on the error of their quantiles, can be merged, and can be stored in an
+        :class:`~geopyspark.geotrellis.catalog.AttributeStore`.
+
+        Args:
+            sample_fraction (float, optional): The probability with which each tile is sketched.
+                If not specified, then every tile is sketched.
+            max_tiles (int, optional): The most tiles that are sketched in each partition. These
+                are chosen at random from the tiles kept by ``sample_fraction``. If not
+                specified, then there is no limit.
+            k (int, optional): The accuracy parameter of the sketches. Larger values give
+                smaller errors and larger sketches. The default of 200 gives a rank error of
+                about 1.3%.
+            seed (int, optional): The seed used to sample tiles and to build the sketches. If not
+                specified, then a random seed is used.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.histogram.QuantileSketch` or
+            [:class:`~geopyspark.geotrellis.histogram.QuantileSketch`]
+
+        Raises:
+            ValueError: If ``sample_fraction`` is not greater than 0 and at most 1.
+        """
+
+        if not 0 < sample_fraction <= 1:
+            raise ValueError("sample_fraction must be greater than 0 and at most 1.")
+
+        if seed is None:
+            seed = int(np.random.randint(0, 2 ** 31 - 1))
+
+        packed = self.srdd.getQuantileSketch(float(sample_fraction), max_tiles or 0, k, seed)
+        sketches = _unpack_layer_sketch(packed)
+
+        if len(sketches) == 1:
+            return sketches[0]
+        else:
+            return sketches
+
+    def get_approximate_min_max(self, sample_fraction=1.0, max_tiles=None):
+        """Returns the approximate maximum and minimum values of all of the rasters in the layer.
+
+        These are exact if every tile is sketched. Otherwise they are the extremes of the sampled
+        tiles. See :meth:`~geopyspark.geotrellis.layer.TileLayer.get_quantile_sketch`.
+
+        Args:
+            sample_fraction (float, optional): The probability with which each tile is sampled.
+            max_tiles (int, optional): The most tiles that are sampled in each partition.
+
+        Returns:
+            (float, float)
+        """
+
+        sketch = self.get_quantile_sketch(sample_fraction, max_tiles)
+        sketches = [sketch for sketch in (sketch if isinstance(sketch, list) else [sketch]) if sketch.count()]
+
+        if not sketches:
+            return (np.nan, np.nan)
+
+        return (min(sketch.min() for sketch in sketches), max(sketch.max() for sketch in sketches))
+
+    def get_approximate_quantile_breaks(self, num_breaks, sample_fraction=1.0, max_tiles=None, k=200):
+        """Returns approximate quantile breaks of the first band of the layer.
+
+        See :meth:`~geopyspark.geotrellis.layer.TileLayer.get_quantile_sketch` for the
+        parameters. Use that method directly to find out the error bounds of the breaks.
+
+        Args:
+            num_breaks (int): The number of breaks to return.
+            sample_fraction (float, optional): The probability with which each tile is sampled.
+            max_tiles (int, optional): The most tiles that are sampled in each partition.
+            k (int, optional): The accuracy parameter of the sketch.
+
+        Returns:
+            ``[float]``
+        """
+
+        sketch = self.get_quantile_sketch(sample_fraction, max_tiles, k)
+        sketch = sketch[0] if isinstance(sketch, list) else sketch
+
+        return sketch.quantile_breaks(num_breaks)
+
 
 class CachableLayer(object):
     """
@@ -390,13 +911,36 @@ class RasterLayer(CachableLayer, TileLayer):
             ``RasterLayer`` to access the various Scala methods.
     """
 
-    __slots__ = ['pysc', 'layer_type', 'srdd']
+    __slots__ = ['pysc', 'layer_type', '_srdd', '_python_stage']
 
     def __init__(self, layer_type, srdd):
         CachableLayer.__init__(self)
         self.pysc = get_spark_context()
         self.layer_type = LayerType(layer_type)
-        self.srdd = srdd
+        self._srdd = srdd
+        self._python_stage = None
+
+    @property
+    def srdd(self):
+        if self._python_stage:
+            # Run the pending Python mappings, and send the result back to the JVM
+            numpy_rdd = self._python_stage.to_numpy_rdd()
+            self._srdd = RasterLayer.from_numpy_rdd(self.layer_type, numpy_rdd).srdd
+            self._python_stage = None
+
+        return self._srdd
+
+    def _map_python(self, func):
+        layer = RasterLayer.__new__(RasterLayer)
+        CachableLayer.__init__(layer)
+
+        layer.pysc = self.pysc
+        layer.layer_type = self.layer_type
+        layer._srdd = None
+
+        layer._python_stage = _PythonStage(self, func)
+
+        return layer
 
     @classmethod
     def read(cls,
@@ -466,7 +1010,7 @@ class RasterLayer(CachableLayer, TileLayer):
         return cls(layer_type, srdd)
 
     @classmethod
-    def from_numpy_rdd(cls, layer_type, numpy_rdd):
+    def from_numpy_rdd(cls, layer_type, numpy_rdd, compression=None):
         """Create a ``RasterLayer`` from a numpy RDD.
 
         Args:
@@ -477,6 +1021,10 @@ class RasterLayer(CachableLayer, TileLayer):
                 :class:`~geopyspark.geotrellis.ProjectedExtent`\s or
                 :class:`~geopyspark.geotrellis.TemporalProjectedExtent`\s and rasters that
                 are represented by a numpy array.
+            compression (str or :class:`~geopyspark.geotrellis.constants.TileCompression`, optional):
+                How the cells of the tiles should be compressed while they are sent to Scala. If
+                ``None``, then the value of the ``spark.geopyspark.tile.compression`` Spark
+                configuration is used, and if that is not set the cells are not compressed.
 
         Returns:
             :class:`~geopyspark.geotrellis.layer.RasterLayer`
@@ -484,8 +1032,10 @@ class RasterLayer(CachableLayer, TileLayer):
 
         pysc = get_spark_context()
         key = LayerType(layer_type)._key_name(False)
-        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key)
-        reserialized_rdd = numpy_rdd._reserialize(ser)
+        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key,
+                                                         batched=True,
+                                                         compression=_get_tile_compression(compression))
+        reserialized_rdd = numpy_rdd._reserialize(AutoBatchedSerializer(ser))
 
         if layer_type == LayerType.SPATIAL:
             srdd = \
@@ -498,23 +1048,87 @@ class RasterLayer(CachableLayer, TileLayer):
 
         return cls(layer_type, srdd)
 
-    def to_numpy_rdd(self):
+    @classmethod
+    def from_arrow_rdd(cls, layer_type, arrow_rdd):
+        """Create a ``RasterLayer`` from an Arrow RDD.
+
+        Note:
+            ``pyarrow`` must be installed in order to use this method.
+
+        Args:
+            layer_type (str or :class:`~geopyspark.geotrellis.constants.LayerType`): What the layer type
+                of the geotiffs are. This is represented by either constants within ``LayerType`` or by
+                a string.
+            arrow_rdd (pyspark.RDD): A PySpark RDD whose elements are batches of the form
+                described in :class:`~geopyspark.geotrellis.arrowserializer.ArrowSerializer`, with
+                either ``ProjectedExtent`` or ``TemporalProjectedExtent`` key fields.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.layer.RasterLayer`
+        """
+
+        pysc = get_spark_context()
+        key = LayerType(layer_type)._key_name(False)
+        reserialized_rdd = arrow_rdd._reserialize(ArrowSerializer(key))
+
+        if layer_type == LayerType.SPATIAL:
+            srdd = \
+                    pysc._gateway.jvm.geopyspark.geotrellis.ProjectedRasterLayer.fromArrowEncodedRDD(
+                        reserialized_rdd._jrdd)
+        else:
+            srdd = \
+                    pysc._gateway.jvm.geopyspark.geotrellis.TemporalRasterLayer.fromArrowEncodedRDD(
+                        reserialized_rdd._jrdd)
+
+        return cls(layer_type, srdd)
+
+    def to_numpy_rdd(self, compression=None):
         """Converts a ``RasterLayer`` to a numpy RDD.
 
         Note:
             Depending on the size of the data stored within the RDD, this can be an exspensive
             operation and should be used with caution.
 
+        Args:
+            compression (str or :class:`~geopyspark.geotrellis.constants.TileCompression`, optional):
+                How the cells of the tiles should be compressed while they are sent to Python. If
+                ``None``, then the value of the ``spark.geopyspark.tile.compression`` Spark
+                configuration is used, and if that is not set the cells are not compressed.
+
         Returns:
             RDD
         """
 
-        result = self.srdd.toProtoRDD()
+        if self._python_stage:
+            # The pending Python mappings can be run without sending their result to the JVM
+            return self._python_stage.to_numpy_rdd(compression).mapValues(_normalize_tile)
+
+        result = self.srdd.toProtoRDD(_get_tile_compression(compression))
         key = LayerType(self.layer_type)._key_name(False)
-        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key)
+        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key, batched=True)
 
         return create_python_rdd(result, ser)
 
+    def to_arrow_rdd(self):
+        """Converts a ``RasterLayer`` to an Arrow RDD.
+
+        Each element of the returned RDD is a batch of many records whose keys are columns of
+        numpy arrays and whose cells are a single numpy array that views the data sent from the
+        JVM without being copied. See :class:`~geopyspark.geotrellis.arrowserializer.ArrowSerializer`
+        for the layout of the batches.
+
+        Note:
+            ``pyarrow`` must be installed in order to use this method.
+
+        Returns:
+            RDD
+        """
+
+        result = self.srdd.toArrowRDD()
+        key = LayerType(self.layer_type)._key_name(False)
+
+        return create_python_rdd(result, ArrowSerializer(key))
+
     def to_png_rdd(self, color_map):
         """Converts the rasters within this layer to PNGs which are then converted to bytes.
         This is returned as a RDD[(K, bytes)].
@@ -695,9 +1309,11 @@ class RasterLayer(CachableLayer, TileLayer):
         """Maps over each ``Tile`` within the layer with a given function.
 
         Note:
-            This operation first needs to deserialize the wrapped ``RDD`` into Python and then
-            serialize the ``RDD`` back into a ``RasterRDD`` once the mapping is done. Thus,
-            it is advised to chain together operations to reduce performance cost.
+            The mapping is lazy. Consecutive calls to ``map_tiles``, ``map_cells`` and
+            ``map_partitions_tiles`` are gathered into a single Python stage that is only run
+            once the data of the layer is needed. The tiles then make one round trip from the JVM
+            to Python and back for the whole chain, or none at all if the result is only
+            brought into Python with ``to_numpy_rdd``.
 
         Args:
             func (:class:`~geopyspark.geotrellis.Tile` => :class:`~geopyspark.geotrellis.Tile`): A
@@ -707,18 +1323,17 @@ class RasterLayer(CachableLayer, TileLayer):
             :class:`~geopyspark.geotrellis.layer.RasterLayer`
         """
 
-        python_rdd = self.to_numpy_rdd()
-
-        return RasterLayer.from_numpy_rdd(self.layer_type,
-                                          python_rdd.mapValues(lambda tile: func(tile.cells)))
+        return self._map_python(_tile_mapper(lambda tile: func(tile.cells)))
 
     def map_cells(self, func):
         """Maps over the cells of each ``Tile`` within the layer with a given function.
 
         Note:
-            This operation first needs to deserialize the wrapped ``RDD`` into Python and then
-            serialize the ``RDD`` back into a ``TiledRasterRDD`` once the mapping is done. Thus,
-            it is advised to chain together operations to reduce performance cost.
+            The mapping is lazy. Consecutive calls to ``map_tiles``, ``map_cells`` and
+            ``map_partitions_tiles`` are gathered into a single Python stage that is only run
+            once the data of the layer is needed. The tiles then make one round trip from the JVM
+            to Python and back for the whole chain, or none at all if the result is only
+            brought into Python with ``to_numpy_rdd``.
 
         Args:
             func (cells, nd => cells): A function that takes two arguements: ``cells`` and
@@ -730,13 +1345,44 @@ class RasterLayer(CachableLayer, TileLayer):
             :class:`~geopyspark.geotrellis.layer.RasterLayer`
         """
 
-        python_rdd = self.to_numpy_rdd()
-
         def tile_func(cells, cell_type, no_data_value):
             return Tile(func(cells, no_data_value), cell_type, no_data_value)
 
-        return RasterLayer.from_numpy_rdd(self.layer_type,
-                                          python_rdd.mapValues(lambda tile: tile_func(*tile)))
+        return self._map_python(_tile_mapper(lambda tile: tile_func(*tile)))
+
+    def map_partitions_tiles(self, func, batch_size=32):
+        """Maps over batches of the ``Tile``\s within each partition of the layer with a given
+        function.
+
+        Unlike :meth:`~geopyspark.geotrellis.layer.RasterLayer.map_tiles`, which calls ``func``
+        once per ``Tile``, the ``Tile``\s of each partition are stacked into batches so that
+        ``func`` can work on many of them at once with vectorized numpy operations.
+
+        Note:
+            A batch only holds ``Tile``\s of the same shape, cell type and ``no_data_value``,
+            so a batch may be smaller than ``batch_size`` if these vary within a partition.
+            Like ``map_tiles``, the mapping is lazy and is run together with the other
+            Python mappings chained with it.
+
+        Args:
+            func (list, :class:`~geopyspark.geotrellis.Tile` => :class:`~geopyspark.geotrellis.Tile`):
+                A function that takes a list of ``N`` keys and a ``Tile`` whose ``cells`` have
+                the shape ``(N, bands, rows, cols)``, where the tile at index ``i`` belongs to the
+                key at index ``i``. It returns a ``Tile`` whose ``cells`` hold ``N`` tiles in the same
+                order. A numpy array may be returned instead, in which case the cell type and
+                ``no_data_value`` of the given ``Tile`` are kept.
+            batch_size (int, optional): The most ``Tile``\s that will be in a batch. This bounds
+                the memory used by each batch. Defaults to ``32``.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.layer.RasterLayer`
+
+        Raises:
+            ValueError: If ``batch_size`` is less than 1, or if ``func`` does not return one
+                tile for each key.
+        """
+
+        return self._map_python(_tile_batch_mapper(func, batch_size))
 
     def convert_data_type(self, new_type, no_data_value=None):
         """Converts the underlying, raster values to a new ``CellType``.
@@ -1061,19 +1707,142 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         layer_metadata (:class:`~geopyspark.geotrellis.Metadata`): The layer metadata associated
             with this layer.
         zoom_level (int): The zoom level of the layer. Can be ``None``.
+
+    Note:
+        ``is_floating_point_layer``, ``layer_metadata`` and ``zoom_level`` are retrieved from the
+        JVM the first time they are used, or are taken from the source layer for operations that
+        do not change them.
     """
 
-    __slots__ = ['pysc', 'layer_type', 'srdd']
+    __slots__ = ['pysc', 'layer_type', '_srdd', '_python_stage', '_expression',
+                 '_is_floating_point_layer', '_layer_metadata', '_zoom_level', '_layout_layer',
+                 '_statistics']
 
     def __init__(self, layer_type, srdd):
         CachableLayer.__init__(self)
         self.pysc = get_spark_context()
         self.layer_type = LayerType(layer_type)
-        self.srdd = srdd
+        self._srdd = srdd
+        self._python_stage = None
+        self._expression = None
+
+        # Each of these takes a call to the JVM, so they are only retrieved when needed
+        self._is_floating_point_layer = _NOT_RETRIEVED
+        self._layer_metadata = _NOT_RETRIEVED
+        self._zoom_level = _NOT_RETRIEVED
+        self._layout_layer = None
+
+        # Set by catalog.query to a function that reads the statistics stored for the layer
+        self._statistics = None
+
+    def _stored_statistics(self):
+        if callable(self._statistics):
+            self._statistics = self._statistics()
+
+        return self._statistics
+
+    def _with_same_metadata(self, srdd):
+        # For operations that cannot change the metadata of the layer
+        layer = TiledRasterLayer(self.layer_type, srdd)
+
+        layer._is_floating_point_layer = self._is_floating_point_layer
+        layer._layer_metadata = self._layer_metadata
+        layer._zoom_level = self._zoom_level
+
+        return layer
+
+    @property
+    def is_floating_point_layer(self):
+        if self._is_floating_point_layer is _NOT_RETRIEVED:
+            self._is_floating_point_layer = self.srdd.isFloatingPointLayer()
+
+        return self._is_floating_point_layer
 
-        self.is_floating_point_layer = self.srdd.isFloatingPointLayer()
-        self.layer_metadata = Metadata.from_dict(json.loads(self.srdd.layerMetadata()))
-        self.zoom_level = self.srdd.getZoom()
+    @property
+    def layer_metadata(self):
+        if self._layer_metadata is _NOT_RETRIEVED:
+            self._layer_metadata = Metadata.from_dict(json.loads(self.srdd.layerMetadata()))
+
+        return self._layer_metadata
+
+    @property
+    def zoom_level(self):
+        if self._zoom_level is _NOT_RETRIEVED:
+            self._zoom_level = self.srdd.getZoom()
+
+        return self._zoom_level
+
+    def _is_pending_expression(self):
+        return self._srdd is None and self._expression is not None
+
+    def _known_cell_type(self):
+        # The cell type of map algebra on layers of different cell types is only known once the
+        # expression has been sent to the JVM
+        if self._layer_metadata is _NOT_RETRIEVED and self._is_pending_expression():
+            return None
+
+        return self.layer_metadata.cell_type
+
+    def _tile_layout(self):
+        if self._layer_metadata is _NOT_RETRIEVED and self._is_pending_expression():
+            return self._layout_layer._tile_layout()
+
+        return self.layer_metadata.tile_layout
+
+    def _band_count(self):
+        # The number of bands is not part of the metadata, so it is read from a tile of the layer
+        return self.srdd.bandCount()
+
+    @property
+    def srdd(self):
+        if self._python_stage:
+            # Run the pending Python mappings, and send the result back to the JVM
+            source = self._python_stage.source
+            numpy_rdd = self._python_stage.to_numpy_rdd()
+            self._srdd = TiledRasterLayer.from_numpy_rdd(self.layer_type,
+                                                         numpy_rdd,
+                                                         source.layer_metadata,
+                                                         source.zoom_level).srdd
+            self._python_stage = None
+        elif self._expression:
+            # Evaluate the pending map algebra in the JVM in one pass
+            layers = []
+            expression = json.dumps(self._expression.to_dict(layers))
+
+            self._srdd = layers[0].srdd.localExpression(expression, [layer.srdd for layer in layers[1:]])
+            self._expression = None
+
+        return self._srdd
+
+    def _pending_layer(self):
+        layer = TiledRasterLayer.__new__(TiledRasterLayer)
+        CachableLayer.__init__(layer)
+
+        layer.pysc = self.pysc
+        layer.layer_type = self.layer_type
+        layer._srdd = None
+        layer._python_stage = None
+        layer._expression = None
+        layer._statistics = None
+
+        # Neither Python mappings nor map algebra change the layout of the layer
+        layer._zoom_level = self.zoom_level
+        layer._layout_layer = self
+
+        if self._known_cell_type() is None:
+            layer._is_floating_point_layer = _NOT_RETRIEVED
+            layer._layer_metadata = _NOT_RETRIEVED
+        else:
+            layer._is_floating_point_layer = self.is_floating_point_layer
+            layer._layer_metadata = self.layer_metadata
+
+        return layer
+
+    def _map_python(self, func):
+        layer = self._pending_layer()
+        layer._python_stage = _PythonStage(self, func)
+
+        return layer
 
     @classmethod
     def read(cls,
@@ -1147,7 +1916,7 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         return cls(layer_type, srdd)
 
     @classmethod
-    def from_numpy_rdd(cls, layer_type, numpy_rdd, metadata, zoom_level=None):
+    def from_numpy_rdd(cls, layer_type, numpy_rdd, metadata, zoom_level=None, compression=None):
         """Creates a ``TiledRasterLayer`` from a numpy RDD.
 
         Args:
@@ -1162,6 +1931,10 @@ class TiledRasterLayer(CachableLayer, TileLayer):
                 the ``TiledRasterLayer`` instance.
             zoom_level(int, optional): The ``zoom_level`` the resulting `TiledRasterLayer` should
                 have. If ``None``, then the returned layer's ``zoom_level`` will be ``None``.
+            compression (str or :class:`~geopyspark.geotrellis.constants.TileCompression`, optional):
+                How the cells of the tiles should be compressed while they are sent to Scala. If
+                ``None``, then the value of the ``spark.geopyspark.tile.compression`` Spark
+                configuration is used, and if that is not set the cells are not compressed.
 
         Returns:
             :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
@@ -1169,8 +1942,10 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         pysc = get_spark_context()
         key = LayerType(layer_type)._key_name(True)
-        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key)
-        reserialized_rdd = numpy_rdd._reserialize(ser)
+        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key,
+                                                         batched=True,
+                                                         compression=_get_tile_compression(compression))
+        reserialized_rdd = numpy_rdd._reserialize(AutoBatchedSerializer(ser))
 
         if isinstance(metadata, Metadata):
             metadata = metadata.to_dict()
@@ -1197,6 +1972,51 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return cls(layer_type, srdd)
 
+    @classmethod
+    def from_arrow_rdd(cls, layer_type, arrow_rdd, metadata, zoom_level=None):
+        """Creates a ``TiledRasterLayer`` from an Arrow RDD.
+
+        Note:
+            ``pyarrow`` must be installed in order to use this method.
+
+        Args:
+            layer_type (str or :class:`~geopyspark.geotrellis.constants.LayerType`): What the layer type
+                of the geotiffs are. This is represented by either constants within ``LayerType`` or by
+                a string.
+            arrow_rdd (pyspark.RDD): A PySpark RDD whose elements are batches of the form
+                described in :class:`~geopyspark.geotrellis.arrowserializer.ArrowSerializer`, with
+                either ``SpatialKey`` or ``SpaceTimeKey`` key fields.
+            metadata (:class:`~geopyspark.geotrellis.Metadata`): The ``Metadata`` of
+                the ``TiledRasterLayer`` instance.
+            zoom_level(int, optional): The ``zoom_level`` the resulting `TiledRasterLayer` should
+                have. If ``None``, then the returned layer's ``zoom_level`` will be ``None``.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
+        """
+
+        pysc = get_spark_context()
+        key = LayerType(layer_type)._key_name(True)
+        reserialized_rdd = arrow_rdd._reserialize(ArrowSerializer(key))
+
+        if isinstance(metadata, Metadata):
+            metadata = metadata.to_dict()
+
+        if layer_type == LayerType.SPATIAL:
+            tiled_raster_layer = pysc._gateway.jvm.geopyspark.geotrellis.SpatialTiledRasterLayer
+        else:
+            tiled_raster_layer = pysc._gateway.jvm.geopyspark.geotrellis.TemporalTiledRasterLayer
+
+        if zoom_level:
+            srdd = tiled_raster_layer.fromArrowEncodedRDD(reserialized_rdd._jrdd,
+                                                          zoom_level,
+                                                          json.dumps(metadata))
+        else:
+            srdd = tiled_raster_layer.fromArrowEncodedRDD(reserialized_rdd._jrdd,
+                                                          json.dumps(metadata))
+
+        return cls(layer_type, srdd)
+
     @classmethod
     def from_rasterframe(cls, rasterframe, zoom_level=None):
         """Creates a ``TiledRasterLayer from a ``pyrasterframes.RasterFrame``.
@@ -1259,23 +2079,53 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         else:
             raise AttributeError("RasterFrames has not been enabled in the active SparkSession")
 
-    def to_numpy_rdd(self):
+    def to_numpy_rdd(self, compression=None):
         """Converts a ``TiledRasterLayer`` to a numpy RDD.
 
         Note:
             Depending on the size of the data stored within the RDD, this can be an exspensive
             operation and should be used with caution.
 
+        Args:
+            compression (str or :class:`~geopyspark.geotrellis.constants.TileCompression`, optional):
+                How the cells of the tiles should be compressed while they are sent to Python. If
+                ``None``, then the value of the ``spark.geopyspark.tile.compression`` Spark
+                configuration is used, and if that is not set the cells are not compressed.
+
         Returns:
             RDD
         """
 
-        result = self.srdd.toProtoRDD()
+        if self._python_stage:
+            # The pending Python mappings can be run without sending their result to the JVM
+            return self._python_stage.to_numpy_rdd(compression).mapValues(_normalize_tile)
+
+        result = self.srdd.toProtoRDD(_get_tile_compression(compression))
         key = LayerType(self.layer_type)._key_name(True)
-        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key)
+        ser = ProtoBufSerializer.create_tuple_serializer(key_type=key, batched=True)
 
         return create_python_rdd(result, ser)
 
+    def to_arrow_rdd(self):
+        """Converts a ``TiledRasterLayer`` to an Arrow RDD.
+
+        Each element of the returned RDD is a batch of many records whose keys are columns of
+        numpy arrays and whose cells are a single numpy array that views the data sent from the
+        JVM without being copied. See :class:`~geopyspark.geotrellis.arrowserializer.ArrowSerializer`
+        for the layout of the batches.
+
+        Note:
+            ``pyarrow`` must be installed in order to use this method.
+
+        Returns:
+            RDD
+        """
+
+        result = self.srdd.toArrowRDD()
+        key = LayerType(self.layer_type)._key_name(True)
+
+        return create_python_rdd(result, ArrowSerializer(key))
+
     def to_png_rdd(self, color_map):
         """Converts the rasters within this layer to PNGs which are then converted to bytes.
         This is returned as a RDD[(K, bytes)].
@@ -1317,7 +2167,9 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         Note:
             This method should only be called on layers with a smaller number of keys, as a large
-            number could cause memory issues.
+            number could cause memory issues. Use
+            :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.collect_key_columns` for layers
+            with many keys.
 
         Returns:
             ``[:class:`~geopyspark.geotrellis.ProjectedExtent`]`` or
@@ -1329,6 +2181,32 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         else:
             return [space_time_key_decoder(key) for key in self.srdd.collectKeys()]
 
+    def collect_key_columns(self):
+        """Returns all of the keys in the layer as columns of numpy arrays.
+
+        The keys are sent from the JVM as a single packed buffer, which makes this method much
+        faster and lighter on the driver than :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.collect_keys`
+        for layers with many keys.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.KeyColumns`
+        """
+
+        key_bytes = self.srdd.collectKeyColumns()
+
+        if self.layer_type == LayerType.SPATIAL:
+            count = len(key_bytes) // 8
+            instants = None
+        else:
+            count = len(key_bytes) // 16
+            instants = np.frombuffer(key_bytes, dtype=np.int64, count=count, offset=count * 8)
+            instants = instants.view('datetime64[ms]')
+
+        cols = np.frombuffer(key_bytes, dtype=np.int32, count=count)
+        rows = np.frombuffer(key_bytes, dtype=np.int32, count=count, offset=count * 4)
+
+        return KeyColumns(cols, rows, instants)
+
     def merge(self, partition_strategy=None):
         """Merges the ``Tile`` of each ``K`` together to produce a single ``Tile``.
 
@@ -1367,7 +2245,7 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         check_partition_strategy(partition_strategy, self.layer_type)
         result = self.srdd.merge(partition_strategy)
 
-        return TiledRasterLayer(self.layer_type, result)
+        return self._with_same_metadata(result)
 
     def bands(self, band):
         """Select a subsection of bands from the ``Tile``\s within the layer.
@@ -1397,15 +2275,17 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         else:
             raise TypeError("band must be an int, tuple, or list. Recieved", type(band), "instead.")
 
-        return TiledRasterLayer(self.layer_type, result)
+        return self._with_same_metadata(result)
 
     def map_tiles(self, func):
         """Maps over each ``Tile`` within the layer with a given function.
 
         Note:
-            This operation first needs to deserialize the wrapped ``RDD`` into Python and then
-            serialize the ``RDD`` back into a ``TiledRasterRDD`` once the mapping is done. Thus,
-            it is advised to chain together operations to reduce performance cost.
+            The mapping is lazy. Consecutive calls to ``map_tiles``, ``map_cells`` and
+            ``map_partitions_tiles`` are gathered into a single Python stage that is only run
+            once the data of the layer is needed. The tiles then make one round trip from the JVM
+            to Python and back for the whole chain, or none at all if the result is only
+            brought into Python with ``to_numpy_rdd``.
 
         Args:
             func (:class:`~geopyspark.geotrellis.Tile` => :class:`~geopyspark.geotrellis.Tile`): A
@@ -1415,20 +2295,17 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
         """
 
-        python_rdd = self.to_numpy_rdd()
-
-        return TiledRasterLayer.from_numpy_rdd(self.layer_type,
-                                               python_rdd.mapValues(lambda tile: func(tile)),
-                                               self.layer_metadata,
-                                               self.zoom_level)
+        return self._map_python(_tile_mapper(func))
 
     def map_cells(self, func):
         """Maps over the cells of each ``Tile`` within the layer with a given function.
 
         Note:
-            This operation first needs to deserialize the wrapped ``RDD`` into Python and then
-            serialize the ``RDD`` back into a ``TiledRasterRDD`` once the mapping is done. Thus,
-            it is advised to chain together operations to reduce performance cost.
+            The mapping is lazy. Consecutive calls to ``map_tiles``, ``map_cells`` and
+            ``map_partitions_tiles`` are gathered into a single Python stage that is only run
+            once the data of the layer is needed. The tiles then make one round trip from the JVM
+            to Python and back for the whole chain, or none at all if the result is only
+            brought into Python with ``to_numpy_rdd``.
 
         Args:
             func (cells, nd => cells): A function that takes two arguements: ``cells`` and
@@ -1440,15 +2317,44 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
         """
 
-        python_rdd = self.to_numpy_rdd()
-
         def tile_func(cells, cell_type, no_data_value):
             return Tile(func(cells, no_data_value), cell_type, no_data_value)
 
-        return TiledRasterLayer.from_numpy_rdd(self.layer_type,
-                                               python_rdd.mapValues(lambda tile: tile_func(*tile)),
-                                               self.layer_metadata,
-                                               self.zoom_level)
+        return self._map_python(_tile_mapper(lambda tile: tile_func(*tile)))
+
+    def map_partitions_tiles(self, func, batch_size=32):
+        """Maps over batches of the ``Tile``\s within each partition of the layer with a given
+        function.
+
+        Unlike :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.map_tiles`, which calls
+        ``func`` once per ``Tile``, the ``Tile``\s of each partition are stacked into batches so
+        that ``func`` can work on many of them at once with vectorized numpy operations.
+
+        Note:
+            The layer's metadata is kept as is, so ``func`` should not change the shape of the
+            tiles.
+            Like ``map_tiles``, the mapping is lazy and is run together with the other
+            Python mappings chained with it.
+
+        Args:
+            func (list, :class:`~geopyspark.geotrellis.Tile` => :class:`~geopyspark.geotrellis.Tile`):
+                A function that takes a list of ``N`` keys and a ``Tile`` whose ``cells`` have
+                the shape ``(N, bands, rows, cols)``, where the tile at index ``i`` belongs to the
+                key at index ``i``. It returns a ``Tile`` whose ``cells`` hold ``N`` tiles in the same
+                order. A numpy array may be returned instead, in which case the cell type and
+                ``no_data_value`` of the given ``Tile`` are kept.
+            batch_size (int, optional): The most ``Tile``\s that will be in a batch. This bounds
+                the memory used by each batch. Defaults to ``32``.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
+
+        Raises:
+            ValueError: If ``batch_size`` is less than 1, or if ``func`` does not return one
+                tile for each key.
+        """
+
+        return self._map_python(_tile_batch_mapper(func, batch_size))
 
     def aggregate_by_cell(self, operation):
         """Computes an aggregate summary for each cell of all of the values for each key.
@@ -1618,6 +2524,60 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return TiledRasterLayer(self.layer_type, self.srdd.withNoData(float(no_data_value)))
 
+    def band_math(self, expressions, cell_type=None):
+        """Computes new bands from the bands of each ``Tile`` in the layer.
+
+        Each expression is written with Python syntax, where ``b0`` refers to the first band of a
+        ``Tile``, ``b1`` to the second, and so on. The operators ``+``, ``-``, ``*``, ``/`` and
+        ``**`` may be used, along with the functions ``abs`` and ``max``, and ``int`` and ``float``
+        constants. For example, the NDVI of a layer whose red band is its third band and whose
+        near infrared band is its fourth band is ``"(b3 - b2) / (b3 + b2)"``.
+
+        The expressions are parsed once, and then evaluated in the JVM cell by cell in a single
+        pass over the layer. The ``Tile``\s of the resulting layer have one band per expression.
+
+        Note:
+            The operations follow the local operations of the layer. ``NoData`` in any of the bands
+            an expression reads gives ``NoData``, and an operation on two bands whose cells are
+            integers gives integers. Set ``cell_type`` to a floating point type to evaluate the
+            expressions with floating point cells instead.
+
+            The layer is not read to check that the bands an expression refers to exist. An
+            expression that reads a band a ``Tile`` does not have fails with an error naming the
+            band once the resulting layer is evaluated.
+
+        Args:
+            expressions (str or [str]): The expression, or list of expressions, that will each
+                produce one band of the result.
+            cell_type (str or :class:`~geopyspark.geotrellis.constants.CellType`, optional): The
+                ``CellType`` that the bands of each ``Tile`` will be converted to before the
+                expressions are evaluated. If not set, then the ``CellType`` of the layer is used.
+
+        Returns:
+            :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
+
+        Raises:
+            ValueError: If an expression is not a valid band math expression.
+        """
+
+        if isinstance(expressions, str):
+            expressions = [expressions]
+
+        encoded = []
+
+        for expression in expressions:
+            try:
+                tree = ast.parse(expression, mode='eval')
+            except SyntaxError:
+                raise ValueError("Invalid band math expression", expression)
+
+            encoded.append(json.dumps(_band_expression_to_dict(tree, expression)))
+
+        if cell_type is not None:
+            cell_type = CellType(cell_type).value
+
+        return TiledRasterLayer(self.layer_type, self.srdd.bandMath(encoded, cell_type))
+
     def reproject(self, target_crs, resample_method=ResampleMethod.NEAREST_NEIGHBOR):
         """Reproject rasters to ``target_crs``.
         The reproject does not sample past tile boundary.
@@ -1654,7 +2614,7 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         """
 
         if num_partitions:
-            return TiledRasterLayer(self.layer_type, self.srdd.repartition(num_partitions))
+            return self._with_same_metadata(self.srdd.repartition(num_partitions))
         else:
             return self
 
@@ -1681,7 +2641,7 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         if partition_strategy:
             check_partition_strategy(partition_strategy, self.layer_type)
-            return TiledRasterLayer(self.layer_type, self.srdd.partitionBy(partition_strategy))
+            return self._with_same_metadata(self.srdd.partitionBy(partition_strategy))
         else:
             return self
 
@@ -1718,6 +2678,50 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return [multibandtile_decoder(tile) for tile in array_of_tiles]
 
+    def lookup_many(self, keys):
+        """Returns the ``Tile``\s of many keys at once.
+
+        Unlike :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.lookup`, which runs a Spark
+        job for every key, all of the keys are looked up in a single job. If the layer has a
+        ``Partitioner``, then only the partitions that the keys belong to are read.
+
+        Note:
+            Each key should have only one ``Tile`` in the layer. If a key has more than one,
+            then only one of them is returned. Use
+            :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.merge` beforehand if this is a
+            concern.
+
+        Args:
+            keys ([:class:`~geopyspark.geotrellis.SpatialKey`] or [:class:`~geopyspark.geotrellis.SpaceTimeKey`]):
+                The keys to look up. They must be of the same type as the keys of the layer.
+
+        Returns:
+            dict: A ``dict`` that maps each of the given keys that is in the layer to its
+            :class:`~geopyspark.geotrellis.Tile`. Keys that are not in the layer are left out.
+        """
+
+        if self.layer_type == LayerType.SPATIAL:
+            key_encoder = spatial_key_encoder
+            key_type = "SpatialKey"
+        else:
+            key_encoder = space_time_key_encoder
+            key_type = "SpaceTimeKey"
+
+        # Keys are matched by their encoded form so that results are returned under the given keys,
+        # even if those have instants in a different time zone than the decoded ones
+        requested = {key_encoder(key): key for key in keys}
+
+        if not requested:
+            return {}
+
+        result = {}
+
+        for tuple_bytes in self.srdd.lookupMany(list(requested.keys())):
+            (key, tile) = tuple_decoder(tuple_bytes, key_type)
+            result[requested[key_encoder(key)]] = tile
+
+        return result
+
     def tile_to_layout(self,
                        layout,
                        target_crs=None,
@@ -1782,7 +2786,8 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return TiledRasterLayer(self.layer_type, srdd)
 
-    def pyramid(self, resample_method=ResampleMethod.NEAREST_NEIGHBOR, partition_strategy=None):
+    def pyramid(self, resample_method=ResampleMethod.NEAREST_NEIGHBOR, partition_strategy=None,
+                levels_per_pass=1):
         """Creates a layer ``Pyramid`` where the resolution is halved per level.
 
         Args:
@@ -1802,17 +2807,36 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
                 If ``partition_strategy`` is set and has a ``num_partitions``, then the resulting layer
                 will have the ``Partioner`` and number of partitions specified in the strategy.
+            levels_per_pass (int, optional): How many levels are built with each shuffle. The
+                default, 1, builds each level from the one below it. With more, the tiles are
+                grouped by the tile of the coarsest level of the pass that they lie under, and are
+                resampled straight into each level of the pass, so that a pyramid of ``n`` levels
+                takes ``n / levels_per_pass`` shuffles.
+
+                Note:
+                    Each group holds about ``4 ** (levels_per_pass - 1) * 4 / 3`` tiles while it
+                    is built, so values above 4 or 5 can use much more memory per task.
+
+                    The groups of a pass are not cached. Each level of the pass reads the output
+                    of the shuffle again and rebuilds the groups from it, so evaluating every level
+                    resamples the tiles of the pass ``levels_per_pass`` times, although the source
+                    layer is only read and shuffled once.
 
         Returns:
             :class:`~geopyspark.geotrellis.layer.Pyramid`.
 
         Raises:
-            ValueError: If this layer layout is not of ``GlobalLayout`` type.
+            ValueError: If this layer layout is not of ``GlobalLayout`` type, or if
+                ``levels_per_pass`` is less than 1.
         """
 
         check_partition_strategy(partition_strategy, self.layer_type)
         resample_method = ResampleMethod(resample_method)
-        result = self.srdd.pyramid(resample_method, partition_strategy)
+
+        if levels_per_pass < 1:
+            raise ValueError("levels_per_pass must be at least 1, got {}".format(levels_per_pass))
+
+        result = self.srdd.pyramid(resample_method, partition_strategy, levels_per_pass)
 
         return Pyramid([TiledRasterLayer(self.layer_type, srdd) for srdd in result])
 
@@ -1994,6 +3018,93 @@ class TiledRasterLayer(CachableLayer, TileLayer):
         fn = self.srdd.sumSeries
         return self.star_series(geometries, fn)
 
+    def zonal_series(self, geometries, stats=('count', 'sum', 'min', 'max', 'mean', 'std')):
+        """Computes statistics of the values of each band within each of the given geometries at
+        each instant of the layer.
+
+        Unlike the ``*_series`` methods, which combine all of the given geometries into one, each
+        geometry is summarized separately, and all of them are computed in a single pass over the
+        layer. The geometries are indexed by the ``SpatialKey``\s they intersect, so each ``Tile``
+        is only compared against the geometries that overlap it. The statistics of each geometry
+        and instant are reduced by key, and are brought back to the driver a partition at a time.
+
+        Args:
+            geometries ([shapely.geometry.base.BaseGeometry] or [bytes]): The geometries, or
+                their WKB representations, whose statistics should be computed. These geometries
+                must be in the same projection as the tiles within the layer.
+            stats (str or [str], optional): The statistics to compute. The same statistics as in
+                :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.zonal_statistics` can be
+                used.
+
+        Returns:
+            A ``dict`` of columns with a row for each geometry and instant that contains cells,
+            sorted by geometry and then by instant. The ``'geometry_id'`` entry is the position of
+            the geometry in ``geometries`` as ``int64``\s, and the ``'instant'`` entry is a
+            ``np.ndarray`` of ``datetime64[ms]``\s. The statistics are the same as those of
+            :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.zonal_statistics`.
+
+        Raises:
+            ValueError: If the layer is not a ``SPACETIME`` layer, or if one of ``stats`` is not a
+                supported statistic.
+        """
+
+        if self.layer_type != LayerType.SPACETIME:
+            raise ValueError("Only Spatio-Temporal layers can use this function.")
+
+        stats = _check_zonal_statistics(stats)
+        wkbs = [wkb.dumps(geometry) if isinstance(geometry, BaseGeometry) else geometry
+                for geometry in geometries]
+
+        with_histograms = 'histogram' in stats
+        chunks = RDD(self.srdd.zonalSeries(wkbs, with_histograms), self.pysc, NoOpSerializer())
+
+        geometry_ids = [np.empty(0, dtype=np.int64)]
+        instants = [np.empty(0, dtype=np.int64)]
+        unpacked = []
+
+        # Each partition of the result is packed on its own, so they are read one at a time
+        for chunk in chunks.toLocalIterator():
+            (zones, packed, packed_histograms) = _split_packed_sections(chunk, 3)
+            zone_count = len(zones) // 12
+
+            if not zone_count:
+                continue
+
+            chunk_stats = _unpack_zonal_statistics(packed,
+                                                   packed_histograms if with_histograms else None,
+                                                   stats + ['count'])
+
+            # A geometry can intersect a Tile without containing any of its cells
+            rows = chunk_stats['count'].any(axis=1)
+
+            geometry_ids.append(np.frombuffer(zones, dtype=np.int32, count=zone_count)[rows].astype(np.int64))
+            instants.append(np.frombuffer(zones, dtype=np.int64, count=zone_count, offset=zone_count * 4)[rows])
+            unpacked.append({stat: (values[rows] if stat != 'histogram' else
+                                    [histograms for (histograms, row) in zip(values, rows) if row])
+                             for (stat, values) in chunk_stats.items()})
+
+        geometry_ids = np.concatenate(geometry_ids)
+        instants = np.concatenate(instants)
+        order = np.lexsort((instants, geometry_ids))
+
+        band_count = None if unpacked else self._band_count()
+        result = {}
+
+        for stat in stats:
+            if stat == 'histogram':
+                histograms = [histogram for chunk_stats in unpacked for histogram in chunk_stats[stat]]
+                result[stat] = [histograms[i] for i in order]
+            elif unpacked:
+                result[stat] = np.concatenate([chunk_stats[stat] for chunk_stats in unpacked])[order]
+            else:
+                result[stat] = np.empty((0, band_count),
+                                        dtype=np.int64 if stat == 'count' else np.float64)
+
+        result['geometry_id'] = geometry_ids[order]
+        result['instant'] = instants[order].view('datetime64[ms]')
+
+        return result
+
     def mask(self,
              geometries,
              partition_strategy=None,
@@ -2165,6 +3276,129 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return TiledRasterLayer(self.layer_type, result)
 
+    def sample_points(self, points, resample_method=None):
+        """Returns the values of the layer at a large number of points.
+
+        Unlike :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.get_point_values`, the points
+        are not held in memory on the driver or sent to every task. Instead, they are keyed by the
+        ``SpatialKey`` of the ``Tile`` they fall in, and joined with the layer. For ``SPATIAL``
+        layers, the join uses the ``Partitioner`` of the layer, so its ``Tile``\s are not
+        shuffled. For ``SPACETIME`` layers, the ``Tile``\s are shuffled by their ``SpatialKey``,
+        and the points are read only once.
+
+        The samples are sent back to Python as packed columns rather than as individual values.
+
+        Note:
+            Only points that are contained within a layer will be sampled.
+            This means that if a point lies on the southern or eastern boundary
+            of a cell, it will not be sampled.
+
+        Args:
+            points (``np.ndarray`` or ``pyspark.RDD``): The points to sample. Either an array with
+                a shape of ``(n, 2)`` whose rows are the x and y coordinates of each point, or an
+                RDD of ``shapely.geometry.Point``\s or of ``(x, y)`` tuples. These points must be in
+                the same projection as the tiles within the layer.
+            resample_method(str or :class:`~gepyspark.ResampleMethod`, optional): The resampling method
+                to use before obtaining the point values. If not specified, then ``None`` is used.
+                The same methods as in
+                :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.get_point_values` can be used.
+
+        Returns:
+            The return type will vary depending on the type of ``points`` and the ``layer_type`` of
+            the sampled layer.
+
+            If ``points`` is a ``np.ndarray`` and the ``layer_type`` is ``SPATIAL``:
+                A ``np.ndarray`` of ``float64`` with a shape of ``(n, bands)``. Its rows are in the
+                same order as ``points``, and the rows of points that were not sampled are ``NaN``.
+
+            If ``points`` is a ``np.ndarray`` and the ``layer_type`` is ``SPACETIME``:
+                A :class:`~geopyspark.geotrellis.PointTimeSeries` with a row for each point and
+                instant that was sampled. Use its
+                :meth:`~geopyspark.geotrellis.PointTimeSeries.pivot` method to get a dense array
+                of points by instants by bands.
+
+            If ``points`` is a ``pyspark.RDD`` and the ``layer_type`` is ``SPATIAL``:
+                A ``pyspark.RDD`` of ``(index, values)``, where ``index`` is the position of the
+                point in ``points`` and ``values`` is a ``np.ndarray`` of its sampled values, one for
+                each band. Points that were not sampled are left out.
+
+            If ``points`` is a ``pyspark.RDD`` and the ``layer_type`` is ``SPACETIME``:
+                A ``pyspark.RDD`` of ``(index, instant, values)``, where ``instant`` is a
+                ``np.datetime64``.
+
+        Raises:
+            TypeError: If ``points`` is neither a ``np.ndarray`` nor a ``pyspark.RDD``.
+        """
+
+        resample_method = _check_point_resample_method(resample_method)
+        temporal = self.layer_type == LayerType.SPACETIME
+
+        if isinstance(points, np.ndarray):
+            coordinates = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+            records = np.empty(len(coordinates), dtype=_POINT_RECORD)
+            records['index'] = np.arange(len(coordinates))
+            records['x'] = coordinates[:, 0]
+            records['y'] = coordinates[:, 1]
+
+            num_slices = max(min(self.pysc.defaultParallelism, len(records)), 1)
+            chunks = [chunk.tobytes() for chunk in np.array_split(records, num_slices)]
+            packed_points = self.pysc.parallelize(chunks, num_slices)
+
+        elif isinstance(points, RDD):
+            packed_points = points.zipWithIndex().mapPartitions(_pack_points)
+
+        else:
+            raise TypeError("Expected a numpy array or an RDD. Instead got", type(points))
+
+        jrdd = self.srdd.samplePoints(packed_points._reserialize(NoOpSerializer())._jrdd, resample_method)
+        samples = RDD(jrdd, self.pysc, NoOpSerializer())
+
+        if isinstance(points, RDD):
+            if temporal:
+                return samples.flatMap(lambda chunk: zip(*_unpack_point_samples(chunk, True)))
+            else:
+                return samples.flatMap(lambda chunk: zip(*_unpack_point_samples(chunk)[::2]))
+
+        unpacked = [_unpack_point_samples(chunk, temporal) for chunk in samples.collect()]
+        band_count = max([values.shape[1] for (_, _, values) in unpacked] + [0])
+
+        if not band_count:
+            # None of the points fell on a tile, so the samples do not say how many bands there are
+            band_count = self._band_count()
+
+        if temporal:
+            return PointTimeSeries(
+                np.concatenate([indices for (indices, _, _) in unpacked] + [np.empty(0, np.int64)]),
+                np.concatenate([instants for (_, instants, _) in unpacked] + [np.empty(0, 'datetime64[ms]')]),
+                np.concatenate([values for (_, _, values) in unpacked if len(values)] +
+                               [np.empty((0, band_count))]))
+
+        result = np.full((len(coordinates), band_count), np.nan)
+
+        for (indices, _, values) in unpacked:
+            if len(indices):
+                result[indices] = values
+
+        return result
+
+    def _point_time_series_values(self, points, resample_method):
+        # Samples the points of a SPACETIME layer through the columnar path of sample_points, and
+        # groups the samples into the [(datetime, [float])] of each point that get_point_values gives
+        coordinates = np.array([[point.x, point.y] for point in points], dtype=np.float64)
+        series = self.sample_points(coordinates, resample_method)
+
+        order = np.lexsort((series.instants, series.point_indices))
+        instants = series.instants[order].astype(datetime.datetime)
+        grouped = [[] for _ in points]
+
+        for (index, instant, values) in zip(series.point_indices[order].tolist(),
+                                            instants,
+                                            series.values[order].tolist()):
+            grouped[index].append((instant.replace(tzinfo=pytz.utc), values))
+
+        return [values if values else [(None, None)] for values in grouped]
+
     def get_point_values(self, points, resample_method=None):
         """Returns the values of the layer at given points.
 
@@ -2187,6 +3421,11 @@ class TiledRasterLayer(CachableLayer, TileLayer):
                     ``ResampleMethod.CUBIC_CONVOLUTION``, and ``ResampleMethod.CUBIC_SPLINE``
                     are the only ones that can be used.
 
+        Note:
+            For a large number of points, or for ``SPACETIME`` layers with many instants,
+            :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.sample_points` is much faster,
+            as it returns its samples as columns of numpy arrays.
+
         Returns:
             The return type will vary depending on the type of ``points`` and the ``layer_type`` of
             the sampled layer.
@@ -2217,18 +3456,7 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             keys in the returned ``dict``.
         """
 
-        if resample_method:
-            resample_method = ResampleMethod(resample_method)
-
-            point_resampling_methods = [
-                ResampleMethod.NEAREST_NEIGHBOR,
-                ResampleMethod.BILINEAR,
-                ResampleMethod.CUBIC_CONVOLUTION,
-                ResampleMethod.CUBIC_SPLINE
-            ]
-
-            if resample_method not in point_resampling_methods:
-                raise ValueError(resample_method, "Cannot be used to resample point values")
+        resample_method = _check_point_resample_method(resample_method)
 
         ided_points = {}
         ided_bytes = {}
@@ -2241,6 +3469,9 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             if Point not in types or len(set(types)) > 1:
                 raise TypeError(set(types), "found, but only shapely Points can sample values")
 
+            if self.layer_type == LayerType.SPACETIME:
+                return list(zip(points, self._point_time_series_values(points, resample_method)))
+
             for point in points:
                 point_id = id(point)
 
@@ -2249,18 +3480,8 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
             scala_result = self.srdd.getPointValues(ided_bytes, resample_method)
 
-            if self.layer_type == LayerType.SPATIAL:
-                for key, value in scala_result.items():
-                    list_result.append((ided_points[key], list(value) if value else None))
-            else:
-                for key, value_map in scala_result.items():
-                    converted_values = [(parser.parse(k), list(v)) for k, v in value_map.items()]
-                    list_result.append((ided_points[key], converted_values))
-
-                # Due to how the values sent over for temporal layers, non-intersecting keys
-                # need to be added in Python.
-                for remaining_id in set(ided_points.keys()).difference(set(scala_result.keys())):
-                    list_result.append((ided_points[remaining_id], [(None, None)]))
+            for key, value in scala_result.items():
+                list_result.append((ided_points[key], list(value) if value else None))
 
             return list_result
 
@@ -2273,6 +3494,13 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             if Point not in types or len(set(types)) > 1:
                 raise TypeError(set(types), "found, but only shapely Points can sample values")
 
+            if self.layer_type == LayerType.SPACETIME:
+                labels = list(points.keys())
+                labeled_points = [points[label] for label in labels]
+                series = self._point_time_series_values(labeled_points, resample_method)
+
+                return {label: (point, values) for (label, point, values) in zip(labels, labeled_points, series)}
+
             for key, value in points.items():
                 point_id = id(value)
 
@@ -2282,16 +3510,8 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
             scala_result = self.srdd.getPointValues(ided_bytes, resample_method)
 
-            if self.layer_type == LayerType.SPATIAL:
-                for key, value in scala_result.items():
-                    dict_result[ided_labels[key]] = (ided_points[key], list(value) if value else None)
-            else:
-                for key, value_map in scala_result.items():
-                    converted_values = [(parser.parse(k), list(v)) for k, v in value_map.items()]
-                    dict_result[ided_labels[key]] = (ided_points[key], converted_values)
-
-                for remaining_id in set(ided_points.keys()).difference(set(scala_result.keys())):
-                    dict_result[ided_labels[remaining_id]] = (ided_points[remaining_id], [(None, None)])
+            for key, value in scala_result.items():
+                dict_result[ided_labels[key]] = (ided_points[key], list(value) if value else None)
 
             return dict_result
         else:
@@ -2428,6 +3648,103 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return self._process_polygonal_summary(geometry, self.srdd.polygonalMean)
 
+    def zonal_statistics(self, geometries, stats=('count', 'sum', 'min', 'max', 'mean', 'std')):
+        """Computes statistics of the values of each band within each of the given geometries.
+
+        Unlike the ``polygonal_*`` methods, which launch a job for each geometry and statistic,
+        all of the statistics of all of the geometries are computed in a single job. The
+        geometries are keyed by the ``SpatialKey``\s they intersect, and each partition of the
+        layer only visits the geometries of its own ``Tile``\s. The results of the partitions are
+        then merged with a tree aggregate. For ``SPACETIME`` layers, the cells of every instant are
+        included.
+
+        Args:
+            geometries ([shapely.geometry.base.BaseGeometry] or [bytes]): The geometries, or
+                their WKB representations, whose statistics should be computed. These geometries
+                must be in the same projection as the tiles within the layer.
+            stats (str or [str], optional): The statistics to compute. Any of ``'count'``,
+                ``'sum'``, ``'min'``, ``'max'``, ``'mean'``, ``'std'`` and ``'histogram'``. If
+                not specified, then every statistic other than ``'histogram'`` is computed.
+
+        Returns:
+            A ``dict`` that maps each of ``stats`` to the values of that statistic. Other than for
+            ``'histogram'``, the values are a ``np.ndarray`` with a row for each geometry, in the
+            same order as ``geometries``, and a column for each band. ``'count'`` is the number of
+            cells that are not NoData, and ``'std'`` is the population standard deviation. The
+            ``'min'``, ``'max'``, ``'mean'`` and ``'std'`` of geometries that contain no cells are
+            ``NaN``.
+
+            The values of ``'histogram'`` are a list with a list for each geometry of the
+            :class:`~geopyspark.geotrellis.histogram.LocalHistogram` of each band, or ``None`` if
+            the geometry contains no cells. All of the histograms are sent from the JVM at once.
+
+        Raises:
+            ValueError: If one of ``stats`` is not a supported statistic.
+        """
+
+        stats = _check_zonal_statistics(stats)
+        wkbs = [wkb.dumps(geometry) if isinstance(geometry, BaseGeometry) else geometry
+                for geometry in geometries]
+
+        accumulator = self.srdd.zonalStatistics(wkbs, 'histogram' in stats)
+        packed_histograms = accumulator.encodeHistograms() if 'histogram' in stats else None
+
+        return _unpack_zonal_statistics(accumulator.encode(), packed_histograms, stats, self)
+
+    def zonal_stats_by(self, zone_layer, stats=('count', 'sum', 'min', 'max', 'mean', 'std')):
+        """Computes statistics of the values of each band within each zone of another layer.
+
+        The zones are the values of the first band of ``zone_layer``, which must have the same
+        layout and ``layer_type`` as this layer, and an integer cell type. The two layers are grouped together by key, so
+        their ``Tile``\s are not shuffled if both already have the same ``Partitioner``. Each
+        partition accumulates the statistics of the zones it sees, and the results of the
+        partitions are then merged with a tree aggregate.
+
+        Args:
+            zone_layer (:class:`~geopyspark.geotrellis.layer.TiledRasterLayer`): The layer whose
+                cells give the zone of each cell of this layer. Cells whose zone is NoData are not
+                included in any zone.
+            stats (str or [str], optional): The statistics to compute. The same statistics as in
+                :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.zonal_statistics` can be
+                used.
+
+        Returns:
+            A ``dict`` with the same statistics as
+            :meth:`~geopyspark.geotrellis.layer.TiledRasterLayer.zonal_statistics`, which has a row
+            for each zone rather than for each geometry. The ``'zone'`` entry is a ``np.ndarray``
+            of the value of each zone, in ascending order.
+
+        Raises:
+            ValueError: If one of ``stats`` is not a supported statistic, or if ``zone_layer``
+                has a different layout than this layer.
+            TypeError: If ``zone_layer`` has a different ``layer_type`` than this layer, or if
+                its cells are floating point.
+        """
+
+        if zone_layer.layer_type != self.layer_type:
+            raise TypeError("The zone layer must have the same layer_type as the value layer.")
+
+        if self._tile_layout() != zone_layer._tile_layout():
+            raise ValueError("The zone layer must have the same layout as the value layer.")
+
+        # The zones are read as ints, which would silently truncate floating point zones
+        if zone_layer.is_floating_point_layer:
+            raise TypeError("The zone layer must have an integer cell type.")
+
+        stats = _check_zonal_statistics(stats)
+        accumulator = self.srdd.zonalStatisticsBy(zone_layer.srdd, 'histogram' in stats)
+
+        zones = np.frombuffer(accumulator.encodeZones(), dtype=np.int32)
+        order = np.argsort(zones, kind='mergesort')
+        packed_histograms = accumulator.encodeHistograms() if 'histogram' in stats else None
+        unpacked = _unpack_zonal_statistics(accumulator.encode(), packed_histograms, stats, self)
+
+        result = {stat: (values[order] if stat != 'histogram' else [values[i] for i in order])
+                  for (stat, values) in unpacked.items()}
+        result['zone'] = zones[order]
+
+        return result
+
     def tobler(self):
         """Generates a Tobler walking speed layer from an elevation layer.
 
@@ -2445,23 +3762,48 @@ class TiledRasterLayer(CachableLayer, TileLayer):
 
         return TiledRasterLayer(self.layer_type, result)
 
-    def _process_operation(self, value, operation):
+    def _expression_operand(self):
+        if self._is_pending_expression():
+            # Pending expressions are inlined so that the whole tree is evaluated at once
+            return self._expression
+        else:
+            return self
+
+    def _process_operation(self, value, operation, reverse=False):
         if isinstance(value, int) or isinstance(value, float):
-            srdd = operation(value)
+            operand = value
         elif isinstance(value, TiledRasterLayer):
             if self.layer_type != value.layer_type:
                 raise ValueError("Both TiledRasterLayers need to have the same layer_type")
 
-            if self.layer_metadata.tile_layout != value.layer_metadata.tile_layout:
+            if self._tile_layout() != value._tile_layout():
                 raise ValueError("Both TiledRasterLayers need to have the same layout")
 
-            srdd = operation(value.srdd)
+            operand = value._expression_operand()
         elif isinstance(value, list):
-            srdd = operation(list(map(lambda x: x.srdd, value)))
+            result = self
+
+            for layer in value:
+                result = result._process_operation(layer, operation)
+
+            return result
         else:
             raise TypeError("Local operation cannot be performed with", value)
 
-        return TiledRasterLayer(self.layer_type, srdd)
+        if reverse:
+            args = [operand, self._expression_operand()]
+        else:
+            args = [self._expression_operand(), operand]
+
+        layer = self._pending_layer()
+        layer._expression = _LocalExpression(operation, args)
+
+        if isinstance(value, TiledRasterLayer) and value._known_cell_type() != self._known_cell_type():
+            # The cell type of the result is decided in the JVM
+            layer._is_floating_point_layer = _NOT_RETRIEVED
+            layer._layer_metadata = _NOT_RETRIEVED
+
+        return layer
 
     def local_max(self, value):
         """Determines the maximum value for each cell of each ``Tile`` in the layer.
@@ -2474,6 +3816,11 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             ``NoData`` values are handled such that taking the max between
             a normal value and ``NoData`` value will always result in ``NoData``.
 
+        Note:
+            Like the arithmetic operators, this is lazy. Chained local operations are gathered
+            into one expression that is evaluated in the JVM cell by cell, in a single pass
+            over the layers it uses, once the data of the resulting layer is needed.
+
         Args:
             value (int or float or :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`): The
                 constant value that will be compared to each cell. If this is a ``TiledRasterLayer``,
@@ -2483,42 +3830,43 @@ class TiledRasterLayer(CachableLayer, TileLayer):
             :class:`~geopyspark.geotrellis.layer.TiledRasterLayer`
         """
 
-        return self._process_operation(value, self.srdd.localMax)
+        return self._process_operation(value, 'max')
 
     def __add__(self, value):
-        return self._process_operation(value, self.srdd.localAdd)
+        return self._process_operation(value, 'add')
 
     def __radd__(self, value):
-        return self._process_operation(value, self.srdd.localAdd)
+        return self._process_operation(value, 'add', reverse=True)
 
     def __sub__(self, value):
-        return self._process_operation(value, self.srdd.localSubtract)
+        return self._process_operation(value, 'subtract')
 
     def __rsub__(self, value):
-        return self._process_operation(value, self.srdd.reverseLocalSubtract)
+        return self._process_operation(value, 'subtract', reverse=True)
 
     def __mul__(self, value):
-        return self._process_operation(value, self.srdd.localMultiply)
+        return self._process_operation(value, 'multiply')
 
     def __rmul__(self, value):
-        return self._process_operation(value, self.srdd.localMultiply)
+        return self._process_operation(value, 'multiply', reverse=True)
 
     def __truediv__(self, value):
-        return self._process_operation(value, self.srdd.localDivide)
+        return self._process_operation(value, 'divide')
 
     def __rtruediv__(self, value):
-        return self._process_operation(value, self.srdd.reverseLocalDivide)
+        return self._process_operation(value, 'divide', reverse=True)
 
     def __abs__(self):
-        srdd = self.srdd.localAbs()
+        layer = self._pending_layer()
+        layer._expression = _LocalExpression('abs', [self._expression_operand()])
 
-        return TiledRasterLayer(self.layer_type, srdd)
+        return layer
 
     def __pow__(self, value):
-        return self._process_operation(value, self.srdd.localPow)
+        return self._process_operation(value, 'pow')
 
     def __rpow__(self, value):
-        return self._process_operation(value, self.srdd.reverseLocalPow)
+        return self._process_operation(value, 'pow', reverse=True)
 
     def __str__(self):
         return "TiledRasterLayer(layer_type={}, zoom_level={}, is_floating_point_layer={})".format(
@@ -2605,9 +3953,15 @@ class Pyramid(CachableLayer):
     # Keep it in non rendered form so we can do map algebra operations to it
 
     def write(self, uri, layer_name, index_strategy=IndexingMethod.ZORDER, time_unit=None, time_resolution=None,
-              store=None):
+              store=None, compute_statistics=False, max_workers=1, scheduler_pool=None):
         """Writes each tiled layer of the pyramid to a specified destination.
 
+        With ``max_workers`` above 1, the levels are written by parallel Spark jobs, which keeps
+        the cluster busy while the small, low zoom levels are written. The levels are submitted
+        from the highest zoom down, so that the largest write starts first. Every level is
+        attempted even if others fail, the progress of the levels is logged as each one
+        finishes, and the failures are reported together once all of them have finished.
+
         Args:
             uri (str): The Uniform Resource Identifier used to point towards the desired location for
                 the tile layer to written to. The shape of this string varies depending on backend.
@@ -2632,16 +3986,75 @@ class Pyramid(CachableLayer):
                 This value can either be an ``int`` or a string representation of an ``int``.
             store (str or :class:`~geopyspark.geotrellis.catalog.AttributeStore`, optional):
                 ``AttributeStore`` instance or URI for layer metadata lookup.
+            compute_statistics (bool, optional): Whether the statistics of each level should be
+                computed while it is written, and stored as its ``statistics`` attribute. See
+                :meth:`~geopyspark.geotrellis.catalog.write`. The default is ``False``.
+            max_workers (int, optional): How many levels are written at once, each from a thread
+                of its own on the driver. The default, 1, writes the levels one after the other.
+            scheduler_pool (str, optional): The name of the Spark scheduler pool to run the
+                writes in. Setting ``spark.scheduler.mode`` to ``FAIR`` lets the jobs of the
+                levels share the cluster, rather than run in the order they were submitted. If
+                ``None``, the default, then the default pool is used.
+
+        Raises:
+            RuntimeError: If ``max_workers`` is above 1 and any level could not be written. The
+                message lists each level that failed along with its error.
         """
         from geopyspark import write
-        for layer in self.levels.values():
+        from geopyspark.geotrellis.catalog import AttributeStore
+
+        if max_workers <= 1:
+            for layer in self.levels.values():
+                write(uri=uri,
+                      layer_name=layer_name,
+                      tiled_raster_layer=layer,
+                      index_strategy=index_strategy,
+                      time_unit=time_unit,
+                      time_resolution=time_resolution,
+                      store=store,
+                      compute_statistics=compute_statistics,
+                      scheduler_pool=scheduler_pool)
+            return
+
+        # The store is resolved once, so that every level writes through the same instance
+        # rather than each thread building its own
+        store = AttributeStore.build(store) if store else AttributeStore.cached(uri)
+
+        def write_level(layer):
+            start = time.time()
             write(uri=uri,
                   layer_name=layer_name,
                   tiled_raster_layer=layer,
                   index_strategy=index_strategy,
                   time_unit=time_unit,
                   time_resolution=time_resolution,
-                  store=store)
+                  store=store,
+                  compute_statistics=compute_statistics,
+                  scheduler_pool=scheduler_pool)
+            return time.time() - start
+
+        zooms = sorted(self.levels.keys(), reverse=True)
+        errors = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(write_level, self.levels[zoom]): zoom for zoom in zooms}
+
+            for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                zoom = futures[future]
+
+                try:
+                    seconds = future.result()
+                    Log.info(self.pysc, "Wrote zoom {} of {} ({} of {} levels) in {:.1f}s".format(
+                        zoom, layer_name, done, len(zooms), seconds))
+                except Exception as e:
+                    errors[zoom] = e
+                    Log.error(self.pysc, "Could not write zoom {} of {} ({} of {} levels): {}".format(
+                        zoom, layer_name, done, len(zooms), e))
+
+        if errors:
+            report = "; ".join("zoom {}: {}".format(zoom, errors[zoom]) for zoom in sorted(errors))
+            raise RuntimeError("Could not write {} of the {} levels of {}: {}".format(
+                len(errors), len(zooms), layer_name, report)) from errors[max(errors)]
 
     def __add__(self, value):
         if isinstance(value, Pyramid):
@@ -0,0 +1,69 @@
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: batchMessages.proto
+
+import sys
+_b=sys.version_info[0]<3 and (lambda x:x) or (lambda x:x.encode('latin1'))
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf import descriptor_pb2
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor.FileDescriptor(
+  name='batchMessages.proto',
+  package='protos',
+  syntax='proto3',
+  serialized_pb=_b('\n\x13\x62\x61tchMessages.proto\x12\x06protos\"\x1d\n\nProtoBatch\x12\x0f\n\x07records\x18\x01 \x03(\x0c\x62\x06proto3')
+)
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
+
+
+
+
+_PROTOBATCH = _descriptor.Descriptor(
+  name='ProtoBatch',
+  full_name='protos.ProtoBatch',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='records', full_name='protos.ProtoBatch.records', index=0,
+      number=1, type=12, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=31,
+  serialized_end=60,
+)
+
+DESCRIPTOR.message_types_by_name['ProtoBatch'] = _PROTOBATCH
+
+ProtoBatch = _reflection.GeneratedProtocolMessageType('ProtoBatch', (_message.Message,), dict(
+  DESCRIPTOR = _PROTOBATCH,
+  __module__ = 'batchMessages_pb2'
+  # @@protoc_insertion_point(class_scope:protos.ProtoBatch)
+  ))
+_sym_db.RegisterMessage(ProtoBatch)
+
+
+# @@protoc_insertion_point(module_scope)
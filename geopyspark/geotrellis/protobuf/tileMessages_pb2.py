@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   name='tileMessages.proto',
   package='protos',
   syntax='proto3',
-  serialized_pb=_b('\n\x12tileMessages.proto\x12\x06protos\"\xc1\x01\n\rProtoCellType\x12\x30\n\x08\x64\x61taType\x18\x01 \x01(\x0e\x32\x1e.protos.ProtoCellType.DataType\x12\n\n\x02nd\x18\x02 \x01(\x01\x12\x11\n\thasNoData\x18\x03 \x01(\x08\"_\n\x08\x44\x61taType\x12\x07\n\x03\x42IT\x10\x00\x12\x08\n\x04\x42YTE\x10\x01\x12\t\n\x05UBYTE\x10\x02\x12\t\n\x05SHORT\x10\x03\x12\n\n\x06USHORT\x10\x04\x12\x07\n\x03INT\x10\x05\x12\t\n\x05\x46LOAT\x10\x06\x12\n\n\x06\x44OUBLE\x10\x07\"\xb3\x01\n\tProtoTile\x12\x0c\n\x04\x63ols\x18\x01 \x01(\x05\x12\x0c\n\x04rows\x18\x02 \x01(\x05\x12\'\n\x08\x63\x65llType\x18\x03 \x01(\x0b\x32\x15.protos.ProtoCellType\x12\x17\n\x0bsint32Cells\x18\x04 \x03(\x11\x42\x02\x10\x01\x12\x17\n\x0buint32Cells\x18\x05 \x03(\rB\x02\x10\x01\x12\x16\n\nfloatCells\x18\x06 \x03(\x02\x42\x02\x10\x01\x12\x17\n\x0b\x64oubleCells\x18\x07 \x03(\x01\x42\x02\x10\x01\"6\n\x12ProtoMultibandTile\x12 \n\x05tiles\x18\x01 \x03(\x0b\x32\x11.protos.ProtoTileb\x06proto3')
+  serialized_pb=_b('\n\x12tileMessages.proto\x12\x06protos\"\xc1\x01\n\rProtoCellType\x12\x30\n\x08\x64\x61taType\x18\x01 \x01(\x0e\x32\x1e.protos.ProtoCellType.DataType\x12\n\n\x02nd\x18\x02 \x01(\x01\x12\x11\n\thasNoData\x18\x03 \x01(\x08\"_\n\x08\x44\x61taType\x12\x07\n\x03\x42IT\x10\x00\x12\x08\n\x04\x42YTE\x10\x01\x12\t\n\x05UBYTE\x10\x02\x12\t\n\x05SHORT\x10\x03\x12\n\n\x06USHORT\x10\x04\x12\x07\n\x03INT\x10\x05\x12\t\n\x05\x46LOAT\x10\x06\x12\n\n\x06\x44OUBLE\x10\x07\"\xdf\x02\n\tProtoTile\x12\x0c\n\x04\x63ols\x18\x01 \x01(\x05\x12\x0c\n\x04rows\x18\x02 \x01(\x05\x12\'\n\x08\x63\x65llType\x18\x03 \x01(\x0b\x32\x15.protos.ProtoCellType\x12\x17\n\x0bsint32Cells\x18\x04 \x03(\x11\x42\x02\x10\x01\x12\x17\n\x0buint32Cells\x18\x05 \x03(\rB\x02\x10\x01\x12\x16\n\nfloatCells\x18\x06 \x03(\x02\x42\x02\x10\x01\x12\x17\n\x0b\x64oubleCells\x18\x07 \x03(\x01\x42\x02\x10\x01\x12\x10\n\x08rawCells\x18\x08 \x01(\x0c\x12\x32\n\x0b\x63ompression\x18\t \x01(\x0e\x32\x1d.protos.ProtoTile.Compression\x12\x0f\n\x07rawSize\x18\n \x01(\x05\x12\x10\n\x08\x63onstant\x18\x0b \x01(\x08\x12\x15\n\rconstantValue\x18\x0c \x01(\x01\"*\n\x0b\x43ompression\x12\x08\n\x04NONE\x10\x00\x12\x07\n\x03LZ4\x10\x01\x12\x08\n\x04ZSTD\x10\x02\"6\n\x12ProtoMultibandTile\x12 \n\x05tiles\x18\x01 \x03(\x0b\x32\x11.protos.ProtoTileb\x06proto3')
 )
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -71,6 +71,32 @@ _PROTOCELLTYPE_DATATYPE = _descriptor.EnumDescriptor(
 )
 _sym_db.RegisterEnumDescriptor(_PROTOCELLTYPE_DATATYPE)
 
+_PROTOTILE_COMPRESSION = _descriptor.EnumDescriptor(
+  name='Compression',
+  full_name='protos.ProtoTile.Compression',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='NONE', index=0, number=0,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='LZ4', index=1, number=1,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='ZSTD', index=2, number=2,
+      options=None,
+      type=None),
+  ],
+  containing_type=None,
+  options=None,
+  serialized_start=536,
+  serialized_end=578,
+)
+_sym_db.RegisterEnumDescriptor(_PROTOTILE_COMPRESSION)
+
 
 _PROTOCELLTYPE = _descriptor.Descriptor(
   name='ProtoCellType',
@@ -174,11 +200,47 @@ _PROTOTILE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), _b('\020\001'))),
+    _descriptor.FieldDescriptor(
+      name='rawCells', full_name='protos.ProtoTile.rawCells', index=7,
+      number=8, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='compression', full_name='protos.ProtoTile.compression', index=8,
+      number=9, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='rawSize', full_name='protos.ProtoTile.rawSize', index=9,
+      number=10, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='constant', full_name='protos.ProtoTile.constant', index=10,
+      number=11, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='constantValue', full_name='protos.ProtoTile.constantValue', index=11,
+      number=12, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
+    _PROTOTILE_COMPRESSION,
   ],
   options=None,
   is_extendable=False,
@@ -187,7 +249,7 @@ _PROTOTILE = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=227,
-  serialized_end=406,
+  serialized_end=578,
 )
 
 
@@ -217,13 +279,15 @@ _PROTOMULTIBANDTILE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=408,
-  serialized_end=462,
+  serialized_start=580,
+  serialized_end=634,
 )
 
 _PROTOCELLTYPE.fields_by_name['dataType'].enum_type = _PROTOCELLTYPE_DATATYPE
 _PROTOCELLTYPE_DATATYPE.containing_type = _PROTOCELLTYPE
 _PROTOTILE.fields_by_name['cellType'].message_type = _PROTOCELLTYPE
+_PROTOTILE.fields_by_name['compression'].enum_type = _PROTOTILE_COMPRESSION
+_PROTOTILE_COMPRESSION.containing_type = _PROTOTILE
 _PROTOMULTIBANDTILE.fields_by_name['tiles'].message_type = _PROTOTILE
 DESCRIPTOR.message_types_by_name['ProtoCellType'] = _PROTOCELLTYPE
 DESCRIPTOR.message_types_by_name['ProtoTile'] = _PROTOTILE
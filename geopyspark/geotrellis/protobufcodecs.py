@@ -28,6 +28,97 @@ _mapped_data_types = {
     7: 'DOUBLE'
 }
 
+# The native-endian numpy types used for the raw cell buffer of each cell type.
+# BIT cells are packed eight to a byte within a ProtoTile, and are one byte per cell elsewhere.
+_raw_cell_dtypes = {
+    'BIT': np.int8,
+    'BYTE': np.int8,
+    'UBYTE': np.uint8,
+    'SHORT': np.int16,
+    'USHORT': np.uint16,
+    'INT': np.int32,
+    'FLOAT': np.float32,
+    'DOUBLE': np.float64
+}
+
+# The zstd level used when compressing cells. Low levels keep compression cheaper than the
+# socket transfer it saves.
+_ZSTD_LEVEL = 1
+
+
+def _compress_cells(raw_cells, compression):
+    if compression == 'lz4':
+        try:
+            import lz4.block
+        except ImportError:
+            raise ImportError("lz4 must be installed in order to use LZ4 tile compression")
+
+        return (ProtoTile.LZ4, lz4.block.compress(raw_cells, store_size=False))
+    elif compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard must be installed in order to use ZSTD tile compression")
+
+        return (ProtoTile.ZSTD, zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw_cells))
+    else:
+        return (ProtoTile.NONE, raw_cells)
+
+def _pack_bits(cells):
+    """Packs BIT cells eight to a byte, least significant bit first, as a ``BitArrayTile`` does."""
+
+    bits = np.asarray(cells).ravel() != 0
+    padded = np.zeros(-(-bits.size // 8) * 8, dtype=bool)
+    padded[:bits.size] = bits
+
+    return np.packbits(padded.reshape(-1, 8)[:, ::-1]).tobytes()
+
+def _unpack_bits(packed_cells, count):
+    bits = np.unpackbits(np.frombuffer(packed_cells, dtype=np.uint8)).reshape(-1, 8)[:, ::-1]
+
+    return bits.ravel()[:count].view(np.int8)
+
+def _constant_value(cells):
+    """Returns the value of every cell if they are all the same, or ``None`` otherwise."""
+
+    if not cells.size:
+        return None
+
+    first = cells.flat[0]
+
+    if first != first:
+        constant = np.isnan(cells).all()
+    else:
+        constant = (cells == first).all()
+
+    return float(first) if constant else None
+
+def _constant_cells(tile, data_type):
+    dtype = _raw_cell_dtypes[data_type]
+
+    if np.issubdtype(dtype, np.integer):
+        return np.array(int(tile.constantValue)).astype(dtype)
+    else:
+        return np.array(tile.constantValue, dtype=dtype)
+
+def _decompress_cells(tile):
+    if tile.compression == ProtoTile.LZ4:
+        try:
+            import lz4.block
+        except ImportError:
+            raise ImportError("lz4 must be installed in order to read LZ4 compressed tiles")
+
+        return lz4.block.decompress(tile.rawCells, uncompressed_size=tile.rawSize)
+    elif tile.compression == ProtoTile.ZSTD:
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard must be installed in order to read ZSTD compressed tiles")
+
+        return zstandard.ZstdDecompressor().decompress(tile.rawCells, max_output_size=tile.rawSize)
+    else:
+        return tile.rawCells
+
 
 # DECODERS
 
@@ -35,6 +126,11 @@ _mapped_data_types = {
 def from_pb_tile(tile, no_data_value=None, data_type=None):
     """Creates a ``Tile`` from ``ProtoTile``.
 
+    Tiles whose cells were sent as a raw buffer are read directly from that buffer with
+    ``np.frombuffer``, after the buffer has been decompressed if it was sent compressed. The
+    cells of ``BIT`` tiles are packed eight to a byte and are unpacked with ``np.unpackbits``.
+    Tiles encoded with the older repeated cell fields are still supported.
+
     Args:
         tile (ProtoTile): The ``ProtoTile`` instance to be converted.
 
@@ -45,7 +141,14 @@ def from_pb_tile(tile, no_data_value=None, data_type=None):
     if not data_type:
         data_type = _mapped_data_types[tile.cellType.dataType]
 
-    if data_type == 'BIT':
+    if tile.constant:
+        value = _constant_cells(tile, data_type)
+        return np.full((tile.rows, tile.cols), value, dtype=value.dtype)
+    elif tile.rawCells and data_type == 'BIT':
+        cells = _unpack_bits(_decompress_cells(tile), tile.rows * tile.cols)
+    elif tile.rawCells:
+        cells = np.frombuffer(_decompress_cells(tile), dtype=_raw_cell_dtypes[data_type])
+    elif data_type == 'BIT':
         cells = np.int8(tile.uint32Cells[:])
     elif data_type == 'BYTE':
         cells = np.int8(tile.sint32Cells[:])
@@ -97,11 +200,89 @@ def from_pb_multibandtile(multibandtile):
 
     if multibandtile.tiles[0].cellType.hasNoData:
         nd = multibandtile.tiles[0].cellType.nd
-        bands = np.array([from_pb_tile(tile, nd) for tile in multibandtile.tiles])
-        return Tile(bands, cell_type, nd)
     else:
-        bands = np.array([from_pb_tile(tile) for tile in multibandtile.tiles])
-        return Tile(bands, cell_type, None)
+        nd = None
+
+    if all(tile.constant for tile in multibandtile.tiles):
+        # Every band is constant, so the bands are filled in place rather than stacked. The
+        # cells are writable, as functions given to map_cells may change them in place
+        first = multibandtile.tiles[0]
+        values = np.array([_constant_cells(tile, cell_type) for tile in multibandtile.tiles])
+        bands = np.empty((len(values), first.rows, first.cols), dtype=values.dtype)
+        bands[:] = values.reshape(-1, 1, 1)
+    else:
+        bands = np.array([from_pb_tile(tile, nd, cell_type) for tile in multibandtile.tiles])
+
+    return Tile(bands, cell_type, nd)
+
+class LazyTile(Tile):
+    """A ``Tile`` whose ``cells`` are only decoded from a ``ProtoMultibandTile`` when they are
+    first accessed.
+
+    The ``cell_type`` and ``no_data_value`` are read when the ``LazyTile`` is created, so
+    operations that only look at the keys of a layer, or at those two fields, never build the
+    numpy arrays. Until its cells have been decoded, a ``LazyTile`` is pickled as the encoded
+    ``ProtoMultibandTile`` and is re-encoded without being decoded.
+
+    Args:
+        multibandtile (ProtoMultibandTile): The message that holds the cells.
+    """
+
+    def __new__(cls, multibandtile):
+        cell_type = multibandtile.tiles[0].cellType
+
+        if cell_type.hasNoData:
+            no_data_value = cell_type.nd
+        else:
+            no_data_value = None
+
+        self = super(LazyTile, cls).__new__(cls, None, _mapped_data_types[cell_type.dataType], no_data_value)
+        self._multibandtile = multibandtile
+        self._cells = None
+
+        return self
+
+    @property
+    def cells(self):
+        if self._multibandtile is not None:
+            self._cells = from_pb_multibandtile(self._multibandtile).cells
+            self._multibandtile = None
+
+        return self._cells
+
+    def __iter__(self):
+        return iter((self.cells, self.cell_type, self.no_data_value))
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(Tile(*self))
+
+    def __reduce__(self):
+        if self._multibandtile is not None:
+            return (_lazy_tile_from_bytes, (self._multibandtile.SerializeToString(),))
+        else:
+            return (Tile, tuple(self))
+
+    @classmethod
+    def _make(cls, iterable):
+        return Tile._make(iterable)
+
+    def _replace(self, **kwargs):
+        return Tile(*self)._replace(**kwargs)
+
+def _lazy_tile_from_bytes(proto_bytes):
+    return LazyTile(ProtoMultibandTile.FromString(proto_bytes))
 
 def multibandtile_decoder(proto_bytes):
     """Deserializes ``ProtoMultibandTile`` bytes into Python.
@@ -261,7 +442,9 @@ def tuple_decoder(proto_bytes, key_decoder):
 
     Note:
         The value of the tuple is always assumed to be a :class:`~geopyspark.geotrellis.Tile`
-        thus, only the decoding method of the key is required.
+        thus, only the decoding method of the key is required. The key is decoded right away,
+        while the value is returned as a :class:`~geopyspark.geotrellis.protobufcodecs.LazyTile`
+        whose cells are decoded when they are first accessed.
 
     Args:
         proto_bytes (bytes): The ProtoBuf encoded bytes of the ProtoBuf class.
@@ -272,7 +455,7 @@ def tuple_decoder(proto_bytes, key_decoder):
     """
 
     tup = tupleMessages_pb2.ProtoTuple.FromString(proto_bytes)
-    multiband = from_pb_multibandtile(tup.tiles)
+    multiband = LazyTile(tup.tiles)
 
     if key_decoder == "ProjectedExtent":
         return (from_pb_projected_extent(tup.projectedExtent), multiband)
@@ -384,11 +567,14 @@ def _get_decoder(name):
 
 # ENCODERS
 
-def to_pb_tile(obj):
+def to_pb_tile(obj, compression=None):
     """Converts an instance of ``Tile`` to ``ProtoTile``.
 
     Args:
         obj (:class:`~geopyspark.geotrellis.Tile`): An instance of ``Tile``.
+        compression (str, optional): How the cells should be compressed. Either ``"lz4"``,
+            ``"zstd"``, or ``"none"``. The cells are sent uncompressed if compressing them does
+            not make them smaller. Defaults to ``None``, which does not compress the cells.
 
     Returns:
         ProtoTile
@@ -416,29 +602,42 @@ def to_pb_tile(obj):
 
     if data_type == "BIT":
         cell_type.dataType = ProtoCellType.BIT
-        tile.uint32Cells.extend(cells.flatten().tolist())
     elif data_type == "BYTE":
         cell_type.dataType = ProtoCellType.BYTE
-        tile.sint32Cells.extend(cells.flatten().tolist())
     elif data_type == "UBYTE":
         cell_type.dataType = ProtoCellType.UBYTE
-        tile.uint32Cells.extend(cells.flatten().tolist())
     elif data_type == "SHORT":
         cell_type.dataType = ProtoCellType.SHORT
-        tile.sint32Cells.extend(cells.flatten().tolist())
     elif data_type == "USHORT":
         cell_type.dataType = ProtoCellType.USHORT
-        tile.uint32Cells.extend(cells.flatten().tolist())
     elif data_type == "INT":
         cell_type.dataType = ProtoCellType.INT
-        tile.sint32Cells.extend(cells.flatten().tolist())
     elif data_type == "FLOAT":
-        ctype = tile.cellType
-        ctype.dataType = ProtoCellType.FLOAT
-        tile.floatCells.extend(cells.flatten().tolist())
+        cell_type.dataType = ProtoCellType.FLOAT
     else:
         cell_type.dataType = ProtoCellType.DOUBLE
-        tile.doubleCells.extend(cells.flatten().tolist())
+
+    cells = np.asarray(cells, dtype=_raw_cell_dtypes.get(data_type, np.float64))
+    constant_value = _constant_value(cells)
+
+    if constant_value is not None:
+        tile.constant = True
+        tile.constantValue = constant_value
+
+        return tile
+
+    if data_type == "BIT":
+        raw_cells = _pack_bits(cells)
+    else:
+        raw_cells = cells.tobytes()
+    (codec, compressed_cells) = _compress_cells(raw_cells, compression)
+
+    if len(compressed_cells) < len(raw_cells):
+        tile.compression = codec
+        tile.rawSize = len(raw_cells)
+        tile.rawCells = compressed_cells
+    else:
+        tile.rawCells = raw_cells
 
     return tile
 
@@ -456,16 +655,22 @@ def tile_encoder(obj):
     return to_pb_tile(obj).SerializeToString()
 
 
-def to_pb_multibandtile(obj):
+def to_pb_multibandtile(obj, compression=None):
     """Converts an instance of ``Tile`` to ``ProtoMultibandTile``.
 
     Args:
         obj (:class:`~geopyspark.geotrellis.Tile`): An instance of ``Tile``.
+        compression (str, optional): How the cells of each band should be compressed. See
+            :meth:`~geopyspark.geotrellis.protobufcodecs.to_pb_tile`.
 
     Returns:
         ProtoMultibandTile
     """
 
+    if isinstance(obj, LazyTile) and obj._multibandtile is not None and compression in (None, 'none'):
+        # The cells were never decoded, so they can be sent on as they were received
+        return obj._multibandtile
+
     cells = obj.cells
     if cells.ndim == 2:
         cells = np.expand_dims(cells, 0)
@@ -476,7 +681,7 @@ def to_pb_multibandtile(obj):
         return Tile(cells[index, :, :], obj.cell_type, obj.no_data_value)
 
     multibandtile = ProtoMultibandTile()
-    multibandtile.tiles.extend([to_pb_tile(create_tile(x)) for x in range(band_count)])
+    multibandtile.tiles.extend([to_pb_tile(create_tile(x), compression) for x in range(band_count)])
 
     return multibandtile
 
@@ -661,7 +866,7 @@ def space_time_key_encoder(obj):
 
     return to_pb_space_time_key(obj).SerializeToString()
 
-def tuple_encoder(obj, key_encoder):
+def tuple_encoder(obj, key_encoder, compression=None):
     """Encodes a tuple into ``ProtoTuple`` bytes.
 
     Note:
@@ -671,13 +876,15 @@ def tuple_encoder(obj, key_encoder):
     Args:
         obj (tuple): The tuple to encode.
         key_encoder (str): The name of the key type of the tuple.
+        compression (str, optional): How the cells of the tile should be compressed. See
+            :meth:`~geopyspark.geotrellis.protobufcodecs.to_pb_tile`.
 
     Returns:
        bytes
     """
 
     tup = tupleMessages_pb2.ProtoTuple()
-    tup.tiles.CopyFrom(to_pb_multibandtile(obj[1]))
+    tup.tiles.CopyFrom(to_pb_multibandtile(obj[1], compression))
 
     if key_encoder == "ProjectedExtent":
         tup.projectedExtent.CopyFrom(to_pb_projected_extent(obj[0]))
@@ -733,18 +940,20 @@ def feature_cellvalue_encoder(feature):
 
     return to_pb_feature_cellvalue(feature).SerializeToString()
 
-def create_partial_tuple_encoder(key_type):
+def create_partial_tuple_encoder(key_type, compression=None):
     """Creates a partial, tuple encoder function.
 
     Args:
         key_type (str): The type of the key in the tuple.
+        compression (str, optional): How the cells of the tile should be compressed. See
+            :meth:`~geopyspark.geotrellis.protobufcodecs.to_pb_tile`.
 
     Returns:
         A partial :meth:`~geopyspark.protobufregistry.tuple_encoder` function that requires an
         obj to execute.
     """
 
-    return partial(tuple_encoder, key_encoder=key_type)
+    return partial(tuple_encoder, key_encoder=key_type, compression=compression)
 
 def _get_encoder(name):
     if name == "Tile":
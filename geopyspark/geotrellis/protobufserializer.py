@@ -1,4 +1,6 @@
 """The class which serializes/deserializes values in a RDD to/from Python."""
+from functools import partial
+
 from geopyspark.geopyspark_utils import ensure_pyspark
 ensure_pyspark()
 from geopyspark.geotrellis.protobufcodecs import (create_partial_tuple_decoder,
@@ -6,44 +8,76 @@ from geopyspark.geotrellis.protobufcodecs import (create_partial_tuple_decoder,
                                                   create_partial_image_rdd_decoder,
                                                   _get_encoder,
                                                   _get_decoder)
+from geopyspark.geotrellis.protobuf.batchMessages_pb2 import ProtoBatch
 
 from pyspark.serializers import FramedSerializer
 from pyspark.serializers import AutoBatchedSerializer
 
 
+def _method_key(method):
+    # The codecs are built with functools.partial, which only compares by identity
+    if isinstance(method, partial):
+        return (method.func, method.args, tuple(sorted((method.keywords or {}).items())))
+
+    return method
+
+
 class ProtoBufSerializer(FramedSerializer):
     """The serializer used by a RDD to encode/decode values to/from Python.
 
+    When ``batched`` is ``True``, each frame holds a ``ProtoBatch`` of many encoded records
+    rather than a single record. This is the framing used by ``PythonTranslator.toPythonBatched``
+    and ``PythonTranslator.fromPythonBatched`` on the Scala side, and it should be wrapped in an
+    ``AutoBatchedSerializer`` when sending values to Scala.
+
     Args:
         decoding_method (func): The decocding function for the values within the RDD.
         encoding_method (func): The encocding function for the values within the RDD.
+        batched (bool, optional): Whether each frame holds a batch of records. Defaults to
+            ``False``.
 
     Attributes:
         decoding_method (func): The decocding function for the values within the RDD.
         encoding_method (func): The encocding function for the values within the RDD.
+        batched (bool): Whether each frame holds a batch of records.
     """
 
-    __slots__ = ['decoding_method', 'encoding_method']
+    __slots__ = ['decoding_method', 'encoding_method', 'batched']
 
-    def __init__(self, decoding_method, encoding_method):
+    def __init__(self, decoding_method, encoding_method, batched=False):
         FramedSerializer.__init__(self)
 
         self.decoding_method = decoding_method
         self.encoding_method = encoding_method
+        self.batched = batched
+
+    def _key(self):
+        return (_method_key(self.decoding_method), _method_key(self.encoding_method), self.batched)
+
+    # FramedSerializer compares __dict__, which is empty for a class with __slots__, so the
+    # slot fields have to be compared here for RDD._reserialize to tell the framings apart
+    def __eq__(self, other):
+        return isinstance(other, ProtoBufSerializer) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((ProtoBufSerializer,) + self._key())
 
     @classmethod
-    def create_tuple_serializer(cls, key_type):
+    def create_tuple_serializer(cls, key_type, batched=False, compression=None):
         decoder = create_partial_tuple_decoder(key_type=key_type)
-        encoder = create_partial_tuple_encoder(key_type=key_type)
+        encoder = create_partial_tuple_encoder(key_type=key_type, compression=compression)
 
-        return cls(decoder, encoder)
+        return cls(decoder, encoder, batched)
 
     @classmethod
-    def create_value_serializer(cls, value_type):
+    def create_value_serializer(cls, value_type, batched=False):
         decoder = _get_decoder(value_type)
         encoder = _get_encoder(value_type)
 
-        return cls(decoder, encoder)
+        return cls(decoder, encoder, batched)
 
     @classmethod
     def create_image_rdd_serializer(cls, key_type):
@@ -59,18 +93,26 @@ class ProtoBufSerializer(FramedSerializer):
         """Serialize an object into a byte array.
 
         Note:
-            When batching is used, this will be called with a list of objects.
+            When batching is used, this will be called with a list of objects. All of them
+            are packed into a single ``ProtoBatch`` if ``batched`` is ``True``.
 
         Args:
             obj: The object to serialized into a byte array.
 
         Returns:
             The byte array representation of the ``obj``.
+
+        Raises:
+            ValueError: If a list of objects is given and ``batched`` is ``False``.
         """
 
-        if isinstance(obj, list):
-            for x in obj:
-                return self._dumps(x)
+        if self.batched:
+            if not isinstance(obj, list):
+                obj = [obj]
+
+            return ProtoBatch(records=[self._dumps(x) for x in obj]).SerializeToString()
+        elif isinstance(obj, list):
+            raise ValueError("A list of objects can only be serialized when batched is True")
         else:
             return self._dumps(obj)
 
@@ -83,4 +125,8 @@ class ProtoBufSerializer(FramedSerializer):
         Returns:
             A list of deserialized objects.
         """
-        return [self.decoding_method(obj)]
+
+        if self.batched:
+            return [self.decoding_method(record) for record in ProtoBatch.FromString(obj).records]
+        else:
+            return [self.decoding_method(obj)]
@@ -1,4 +1,5 @@
 from shapely.wkb import dumps
+from pyspark.serializers import AutoBatchedSerializer
 from geopyspark import get_spark_context
 from geopyspark.geotrellis.constants import LayerType, CellType
 from geopyspark.geotrellis.layer import TiledRasterLayer
@@ -130,8 +131,8 @@ def rasterize_features(features,
     pysc = get_spark_context()
     rasterizer = pysc._gateway.jvm.geopyspark.geotrellis.SpatialTiledRasterLayer.rasterizeFeaturesWithZIndex
 
-    ser = ProtoBufSerializer(feature_cellvalue_decoder, feature_cellvalue_encoder)
-    reserialized_rdd = features._reserialize(ser)
+    ser = ProtoBufSerializer(feature_cellvalue_decoder, feature_cellvalue_encoder, batched=True)
+    reserialized_rdd = features._reserialize(AutoBatchedSerializer(ser))
 
     srdd = rasterizer(reserialized_rdd._jrdd.rdd(),
                       crs,
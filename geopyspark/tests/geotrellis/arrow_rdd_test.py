@@ -0,0 +1,115 @@
+import unittest
+import pytest
+import numpy as np
+
+from geopyspark.tests.base_test_class import BaseTestClass
+from geopyspark.geotrellis import ProjectedExtent, Extent, Tile
+from geopyspark.geotrellis.layer import RasterLayer, TiledRasterLayer
+from geopyspark.geotrellis.constants import LayerType
+
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+class ArrowRDDTest(BaseTestClass):
+    epsg_code = 3857
+    extent = Extent(0.0, 0.0, 10.0, 10.0)
+    projected_extent = ProjectedExtent(extent, epsg_code)
+
+    arr = np.arange(2 * 16 * 16, dtype='float32').reshape(2, 16, 16)
+    tile = Tile(arr, 'FLOAT', -500.0)
+
+    rdd = BaseTestClass.pysc.parallelize([(projected_extent, tile)])
+
+    layer = RasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd)
+    tiled_layer = layer.tile_to_layout()
+
+    @pytest.fixture(autouse=True)
+    def tearDown(self):
+        yield
+        BaseTestClass.pysc._gateway.close()
+
+    def test_raster_layer_to_arrow(self):
+        (keys, tile) = self.layer.to_arrow_rdd().first()
+
+        self.assertEqual(list(keys['epsg']), [self.epsg_code])
+        self.assertEqual(list(keys['xmax']), [10.0])
+        self.assertEqual(tile.cells.shape, (1, 2, 16, 16))
+        self.assertEqual(tile.no_data_value, -500.0)
+        self.assertTrue((tile.cells[0] == self.arr).all())
+
+    def test_raster_layer_round_trip(self):
+        arrow_rdd = self.layer.to_arrow_rdd()
+        result = RasterLayer.from_arrow_rdd(LayerType.SPATIAL, arrow_rdd)
+
+        (key, tile) = result.to_numpy_rdd().first()
+
+        self.assertEqual(key, self.projected_extent)
+        self.assertTrue((tile.cells == self.arr).all())
+
+    def test_constant_band_round_trip(self):
+        arr = np.array([np.full((16, 16), 3.5), np.arange(16 * 16).reshape(16, 16)], dtype='float32')
+        rdd = BaseTestClass.pysc.parallelize([(self.projected_extent, Tile(arr, 'FLOAT', -500.0))])
+        layer = RasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd)
+
+        arrow_rdd = layer.to_arrow_rdd()
+        (_, tile) = arrow_rdd.first()
+
+        self.assertTrue((tile.cells[0] == arr).all())
+
+        result = RasterLayer.from_arrow_rdd(LayerType.SPATIAL, arrow_rdd)
+        (_, tile) = result.to_numpy_rdd().first()
+
+        self.assertTrue((tile.cells == arr).all())
+
+    def test_tiled_raster_layer_to_arrow(self):
+        (keys, tile) = self.tiled_layer.to_arrow_rdd().first()
+        expected = sorted(key for (key, _) in self.tiled_layer.to_numpy_rdd().collect())
+
+        self.assertEqual(set(keys.keys()), {'col', 'row'})
+        self.assertEqual(sorted(zip(keys['col'], keys['row'])), [(k.col, k.row) for k in expected])
+        self.assertEqual(tile.cells.shape[1], 2)
+
+    def test_raster_layer_round_trip_through_python(self):
+        # Mapping the batches in Python makes them be encoded again by pyarrow before the JVM
+        # reads them
+        arrow_rdd = self.layer.to_arrow_rdd().map(lambda batch: batch)
+        result = RasterLayer.from_arrow_rdd(LayerType.SPATIAL, arrow_rdd)
+
+        (key, tile) = result.to_numpy_rdd().first()
+
+        self.assertEqual(key, self.projected_extent)
+        self.assertTrue((tile.cells == self.arr).all())
+
+    def test_tiled_raster_layer_round_trip_through_python(self):
+        arrow_rdd = self.tiled_layer.to_arrow_rdd().map(lambda batch: batch)
+        result = TiledRasterLayer.from_arrow_rdd(LayerType.SPATIAL,
+                                                 arrow_rdd,
+                                                 self.tiled_layer.layer_metadata)
+
+        self.assertEqual(sorted(result.collect_keys()), sorted(self.tiled_layer.collect_keys()))
+
+    def test_serializer_equality(self):
+        from geopyspark.geotrellis.arrowserializer import ArrowSerializer
+
+        self.assertEqual(ArrowSerializer('SpatialKey'), ArrowSerializer('SpatialKey'))
+        self.assertNotEqual(ArrowSerializer('SpatialKey'), ArrowSerializer('ProjectedExtent'))
+
+    def test_tiled_raster_layer_round_trip(self):
+        arrow_rdd = self.tiled_layer.to_arrow_rdd()
+        result = TiledRasterLayer.from_arrow_rdd(LayerType.SPATIAL,
+                                                 arrow_rdd,
+                                                 self.tiled_layer.layer_metadata)
+
+        expected = self.tiled_layer.to_numpy_rdd().collect()
+        actual = result.to_numpy_rdd().collect()
+
+        self.assertEqual(len(expected), len(actual))
+
+        for ((expected_key, expected_tile), (actual_key, actual_tile)) in zip(sorted(expected), sorted(actual)):
+            self.assertEqual(expected_key, actual_key)
+            self.assertTrue((expected_tile.cells == actual_tile.cells).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import os
 import unittest
 import numpy as np
+from py4j.protocol import Py4JJavaError
 
 import pytest
 
@@ -191,5 +192,126 @@ class BandSelectionTest(BaseTestClass):
         self.assertTrue((self.band_2 == actual.cells[2, :]).all())
         self.assertEqual(mapped_layer.zoom_level, self.tiled_raster_rdd.zoom_level)
 
+    def test_chained_map_cells_tiled(self):
+        mapped_layer = self.tiled_raster_rdd \
+                .map_cells(lambda cells, nd: cells + 1.0) \
+                .map_tiles(lambda tile: Tile(tile.cells * 2.0, tile.cell_type, tile.no_data_value)) \
+                .map_cells(lambda cells, nd: cells[0:1])
+
+        self.assertIsNone(mapped_layer._srdd)
+        self.assertEqual(mapped_layer.layer_metadata.to_dict(), self.tiled_raster_rdd.layer_metadata.to_dict())
+
+        actual = mapped_layer.to_numpy_rdd().first()[1]
+
+        self.assertIsNone(mapped_layer._srdd)
+        self.assertTrue((np.array([self.band_1 * 4.0]) == actual.cells).all())
+
+        # Using the layer in the JVM runs the chain and sends its result there
+        self.assertEqual(mapped_layer.bands(0).count(), 4)
+        self.assertIsNotNone(mapped_layer._srdd)
+
+    def test_map_cells_in_place_constant(self):
+        def test_func(cells, nd):
+            cells[cells < 2.0] = 0.0
+            return cells
+
+        # Every band of these tiles is constant
+        mapped_layer = self.tiled_raster_rdd.map_cells(test_func)
+        actual = mapped_layer.to_numpy_rdd().first()[1]
+
+        self.assertTrue((np.array([self.band_1 * 0.0, self.band_2, self.band_3]) == actual.cells).all())
+
+    def test_chained_map_cells_raster(self):
+        mapped_layer = self.raster_rdd \
+                .map_cells(lambda cells, nd: cells + 1.0) \
+                .map_cells(lambda cells, nd: cells * 2.0)
+
+        actual = mapped_layer.to_numpy_rdd().first()[1]
+
+        self.assertTrue(((self.bands + 1.0) * 2.0 == actual.cells).all())
+        self.assertEqual(mapped_layer.count(), 4)
+
+    def test_map_partitions_tiles_tiled(self):
+        batch_count = self.pysc.accumulator(0)
+
+        def test_func(keys, tile):
+            batch_count.add(1)
+
+            cells = tile.cells
+            return Tile(cells[:, 0:1] + cells[:, 1:2], tile.cell_type, tile.no_data_value)
+
+        mapped_layer = self.tiled_raster_rdd.repartition(1).map_partitions_tiles(test_func, batch_size=3)
+        actual = mapped_layer.to_numpy_rdd().collect()
+
+        self.assertEqual(len(actual), 4)
+        self.assertEqual(batch_count.value, 2)
+        self.assertEqual(mapped_layer.zoom_level, self.tiled_raster_rdd.zoom_level)
+
+        for (_, tile) in actual:
+            self.assertTrue((np.array([self.band_3]) == tile.cells).all())
+
+    def test_map_partitions_tiles_nan_no_data(self):
+        layer = [(key, Tile(self.bands, 'FLOAT', float('nan'))) for (key, _) in self.layer]
+        metadata = dict(self.metadata, cellType='float32')
+        nan_layer = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL,
+                                                    self.pysc.parallelize(layer),
+                                                    metadata,
+                                                    5)
+
+        batch_count = self.pysc.accumulator(0)
+
+        def test_func(keys, tile):
+            batch_count.add(1)
+            return tile
+
+        mapped_layer = nan_layer.repartition(1).map_partitions_tiles(test_func, batch_size=4)
+
+        self.assertEqual(mapped_layer.count(), 4)
+        self.assertEqual(batch_count.value, 1)
+
+    def test_map_partitions_tiles_raster(self):
+        def test_func(keys, tile):
+            return tile.cells * 2
+
+        actual = self.raster_rdd.map_partitions_tiles(test_func).to_numpy_rdd().collect()
+
+        self.assertEqual(len(actual), 4)
+
+        for (_, tile) in actual:
+            self.assertEqual(tile.no_data_value, -1.0)
+            self.assertTrue((self.bands * 2 == tile.cells).all())
+
+    def test_map_partitions_tiles_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            self.tiled_raster_rdd.map_partitions_tiles(lambda keys, tile: tile, batch_size=0)
+
+    def test_band_math(self):
+        result = self.tiled_raster_rdd.band_math("(b2 - b1) / (b2 + b1)")
+        actual = result.to_numpy_rdd().first()[1]
+
+        self.assertEqual(actual.cells.shape, (1, 5, 5))
+        self.assertTrue(np.allclose(actual.cells, 0.2))
+
+    def test_band_math_multiple_expressions(self):
+        result = self.tiled_raster_rdd.band_math(["b0 + b1 * 2", "max(b0, 2.5) - b2"], cell_type='int32')
+        actual = result.to_numpy_rdd().first()[1]
+
+        self.assertEqual(result.layer_metadata.cell_type, 'int32')
+        self.assertTrue((actual.cells[0] == 5).all())
+        self.assertTrue((actual.cells[1] == -1).all())
+
+    def test_band_math_invalid(self):
+        with pytest.raises(ValueError):
+            self.tiled_raster_rdd.band_math("b0 < b1")
+
+    def test_band_math_missing_band(self):
+        # band_math is lazy, so the missing band is only found once the layer is evaluated
+        result = self.tiled_raster_rdd.band_math(["b0 + b1", "b0 * b7"])
+
+        with pytest.raises(Py4JJavaError) as error:
+            result.to_numpy_rdd().first()
+
+        self.assertIn('b7', str(error.value))
+
 if __name__ == "__main__":
     unittest.main()
@@ -152,5 +152,57 @@ class CollectKeysTest(BaseTestClass):
         for x in actual:
             self.assertTrue(x in temp_keys)
 
+    def test_spatial_key_columns(self):
+        keys = [
+            SpatialKey(0, 0),
+            SpatialKey(0, 1),
+            SpatialKey(1, 0),
+            SpatialKey(1, 1)
+        ]
+
+        bounds = Bounds(keys[0], keys[3])
+
+        md = Metadata(bounds=bounds,
+                      crs=self.md_proj,
+                      cell_type=self.ct,
+                      extent=self.extent,
+                      layout_definition=self.ld)
+
+        rdd = self.pysc.parallelize([(key, self.tile) for key in keys], 2)
+        layer = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd, md)
+
+        actual = layer.collect_key_columns()
+
+        self.assertIsNone(actual.instants)
+        self.assertEqual(actual.size, 4)
+        self.assertEqual(actual._replace(instants=None), actual)
+        self.assertEqual(sorted(actual.to_keys()), keys)
+        self.assertEqual(actual.bounds(), bounds)
+
+    def test_space_time_key_columns(self):
+        temp_keys = [
+            SpaceTimeKey(0, 0, instant=self.time),
+            SpaceTimeKey(0, 1, instant=self.time),
+            SpaceTimeKey(1, 0, instant=self.time),
+            SpaceTimeKey(1, 1, instant=self.time)
+        ]
+
+        temp_bounds = Bounds(temp_keys[0], temp_keys[3])
+
+        temp_md = Metadata(bounds=temp_bounds,
+                           crs=self.md_proj,
+                           cell_type=self.ct,
+                           extent=self.extent,
+                           layout_definition=self.ld)
+
+        rdd = self.pysc.parallelize([(key, self.tile) for key in temp_keys], 2)
+        layer = TiledRasterLayer.from_numpy_rdd(LayerType.SPACETIME, rdd, temp_md)
+
+        actual = layer.collect_key_columns()
+
+        self.assertEqual(actual.instants.dtype, np.dtype('datetime64[ms]'))
+        self.assertEqual(sorted(actual.to_keys()), temp_keys)
+        self.assertEqual(actual.bounds(), temp_bounds)
+
 if __name__ == "__main__":
     unittest.main()
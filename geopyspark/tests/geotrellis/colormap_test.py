@@ -9,6 +9,7 @@ from geopyspark.geotrellis.color import get_colors_from_colors, get_colors_from_
 from geopyspark.geotrellis.constants import LayerType
 from geopyspark.geotrellis import SpatialKey, Tile
 from geopyspark.geotrellis.layer import TiledRasterLayer
+from geopyspark.geotrellis.histogram import LocalHistogram
 from geopyspark.tests.base_test_class import BaseTestClass
 
 
@@ -153,5 +154,16 @@ class ColormapTest(BaseTestClass):
         result = ColorMap.build(breaks=hist, colors=color_list)
         self.assertTrue(isinstance(result, ColorMap))
 
+    def test_local_histogram(self):
+        hist = LocalHistogram([0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0], [1] * 8, 80)
+        color_list = self.color_list
+
+        from_histogram = ColorMap.from_histogram(hist, color_list)
+        built = ColorMap.build(breaks=hist, colors=color_list)
+
+        self.assertTrue(isinstance(from_histogram, ColorMap))
+        self.assertTrue(isinstance(built, ColorMap))
+        self.assertEqual(from_histogram.cmap.mapDouble(7.0), built.cmap.mapDouble(7.0))
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,7 @@ import pytest
 from shapely.geometry import box
 
 from geopyspark.geotrellis import Extent, SpatialKey, GlobalLayout, LocalLayout
-from geopyspark.geotrellis.catalog import read_value, query, read_layer_metadata, AttributeStore
+from geopyspark.geotrellis.catalog import read_value, query, read_layer_metadata, write, AttributeStore
 from geopyspark.geotrellis.constants import LayerType
 from geopyspark.geotrellis.geotiff import get
 from geopyspark.tests.base_test_class import BaseTestClass
@@ -102,6 +102,32 @@ class CatalogTest(BaseTestClass):
 
         self.assertEqual(actual_metadata.to_dict(), expected_metadata.to_dict())
 
+    def test_write_statistics(self):
+        layer = query(self.uri, self.layer_name, 5)
+        expected = layer.get_statistics()
+
+        path = file_path('statistics-test-catalog')
+        uri = 'file://' + path
+
+        if os.path.isdir(path):
+            import shutil
+            shutil.rmtree(path)
+
+        write(uri, 'statistics-test', layer, compute_statistics=True)
+
+        stored = AttributeStore(uri).layer('statistics-test', 5).read('statistics')
+        self.assertEqual(stored['tileCount'], expected['tile_count'])
+        self.assertEqual([band['count'] for band in stored['bands']], expected['count'])
+
+        whole = query(uri, 'statistics-test', 5)
+        self.assertEqual(whole._stored_statistics(), stored)
+        self.assertEqual(whole.get_min_max(), layer.get_min_max())
+
+        extent = whole.layer_metadata.extent
+        part = query(uri, 'statistics-test', 5,
+                     box(extent.xmin, extent.ymin, extent.xmin + 1.0, extent.ymin + 1.0))
+        self.assertIsNone(part._stored_statistics())
+
     def test_layer_ids(self):
         ids = AttributeStore(self.uri).layers()
         self.assertTrue(len(ids) == 12)
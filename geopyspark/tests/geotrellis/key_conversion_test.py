@@ -1,5 +1,6 @@
 import pytest
 import unittest
+import numpy as np
 
 from shapely.geometry import Point
 import geopyspark as gps
@@ -31,3 +32,14 @@ class KeyTransformTest(BaseTestClass):
     def test_geom_to_key(self):
         kt = gps.KeyTransform(self.layout)
         self.assertTrue(kt.geometry_to_keys(Point(0.1,0.1)) == [gps.SpatialKey(0,4)])
+
+    def test_key_columns_to_extents(self):
+        kt = gps.KeyTransform(self.layout)
+        key_columns = gps.KeyColumns(np.array([0, 4, 2], dtype=np.int32), np.array([0, 4, 1], dtype=np.int32))
+
+        actual = kt.key_columns_to_extents(key_columns)
+        expected = [kt.key_to_extent(key) for key in key_columns.to_keys()]
+
+        self.assertEqual(actual.shape, (3, 4))
+        self.assertTrue(np.allclose(actual, expected))
+        self.assertTrue(np.allclose(actual[0], [0.0, 0.8, 0.2, 1.0]))
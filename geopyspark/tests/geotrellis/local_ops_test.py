@@ -215,6 +215,46 @@ class LocalOpertaionsTest(BaseTestClass):
 
         self.assertTrue((actual == 1).all())
 
+    def test_fused_operations(self):
+        arr = np.full((1, 4, 4), 3.0)
+        arr2 = np.full((1, 4, 4), 1.0)
+
+        rdd = BaseTestClass.pysc.parallelize([(self.spatial_key, Tile(arr, 'FLOAT', -500))])
+        rdd2 = BaseTestClass.pysc.parallelize([(self.spatial_key, Tile(arr2, 'FLOAT', -500))])
+
+        tiled = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd, self.metadata)
+        tiled2 = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd2, self.metadata)
+
+        result = 1 - abs((tiled - tiled2) / (tiled + tiled2) * 100)
+
+        self.assertIsNone(result._srdd)
+        self.assertEqual(result.layer_metadata.to_dict(), tiled.layer_metadata.to_dict())
+
+        actual = result.to_numpy_rdd().first()[1].cells
+
+        self.assertTrue((actual == -49).all())
+        self.assertIsNotNone(result._srdd)
+
+
+    def test_mixed_cell_type_metadata(self):
+        int_tile = Tile(np.ones((1, 4, 4), dtype='int32'), 'INT', -500)
+        float_tile = Tile(np.full((1, 4, 4), 0.5), 'FLOAT', -500.0)
+
+        int_rdd = BaseTestClass.pysc.parallelize([(self.spatial_key, int_tile)])
+        float_rdd = BaseTestClass.pysc.parallelize([(self.spatial_key, float_tile)])
+
+        int_metadata = dict(self.metadata, cellType='int32ud-500')
+
+        int_tiled = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL, int_rdd, int_metadata)
+        float_tiled = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL, float_rdd, self.metadata)
+
+        same_type = int_tiled * 2
+        mixed_type = (int_tiled + float_tiled) * 2
+
+        self.assertEqual(same_type.layer_metadata.cell_type, int_tiled.layer_metadata.cell_type)
+        self.assertIsNone(mixed_type._srdd)
+        self.assertTrue(mixed_type.is_floating_point_layer)
+        self.assertTrue((mixed_type.to_numpy_rdd().first()[1].cells == 3.0).all())
 
 
 if __name__ == "__main__":
@@ -7,7 +7,9 @@ from pyspark.serializers import AutoBatchedSerializer
 from geopyspark.geotrellis import Tile
 from geopyspark.geotrellis.protobuf import tileMessages_pb2
 from geopyspark.geotrellis.protobufserializer import ProtoBufSerializer
-from geopyspark.geotrellis.protobufcodecs import multibandtile_decoder, multibandtile_encoder
+from geopyspark.geotrellis.protobufcodecs import (multibandtile_decoder,
+                                                  multibandtile_encoder,
+                                                  to_pb_multibandtile)
 from geopyspark.tests.base_test_class import BaseTestClass
 
 
@@ -47,7 +49,7 @@ class MultibandSchemaTest(BaseTestClass):
 
         proto_tile.cols = 2
         proto_tile.rows = 2
-        proto_tile.sint32Cells.extend(self.arr.flatten().tolist())
+        proto_tile.rawCells = self.arr.tobytes()
         proto_tile.cellType.CopyFrom(cell_type)
 
         proto_multiband = tileMessages_pb2.ProtoMultibandTile()
@@ -69,6 +71,76 @@ class MultibandSchemaTest(BaseTestClass):
         for actual, expected in zip(self.collected, expected_multibands):
             self.assertTrue((actual.cells == expected.cells).all())
 
+    def test_decoded_legacy_multibands(self):
+        proto_tile = tileMessages_pb2.ProtoTile()
+
+        proto_tile.cols = 2
+        proto_tile.rows = 2
+        proto_tile.sint32Cells.extend(self.arr.flatten().tolist())
+        proto_tile.cellType.nd = self.no_data
+        proto_tile.cellType.hasNoData = True
+        proto_tile.cellType.dataType = 1
+
+        proto_multiband = tileMessages_pb2.ProtoMultibandTile()
+        proto_multiband.tiles.extend([proto_tile, proto_tile, proto_tile])
+
+        actual = multibandtile_decoder(proto_multiband.SerializeToString())
+
+        self.assertTrue((actual.cells == self.multiband_dict.cells).all())
+        self.assertEqual(actual.cells.dtype, self.multiband_dict.cells.dtype)
+        self.assertEqual(actual.no_data_value, self.no_data)
+
+    def test_compressed_multibands(self):
+        pytest.importorskip("lz4")
+        pytest.importorskip("zstandard")
+
+        arr = np.zeros((2, 64, 64), dtype=np.int8)
+        arr[:, :8, :] = 1
+        tile = Tile(arr, 'BYTE', self.no_data)
+
+        uncompressed_size = to_pb_multibandtile(tile).ByteSize()
+
+        for compression in ['lz4', 'zstd']:
+            proto_multiband = to_pb_multibandtile(tile, compression)
+            actual = multibandtile_decoder(proto_multiband.SerializeToString())
+
+            self.assertLess(proto_multiband.ByteSize(), uncompressed_size)
+            self.assertEqual(proto_multiband.tiles[0].rawSize, arr[0].nbytes)
+            self.assertTrue((actual.cells == arr).all())
+
+    def test_incompressible_multibands(self):
+        pytest.importorskip("lz4")
+
+        proto_multiband = to_pb_multibandtile(self.multiband_dict, 'lz4')
+
+        self.assertEqual(proto_multiband.tiles[0].compression, tileMessages_pb2.ProtoTile.NONE)
+        self.assertEqual(proto_multiband.tiles[0].rawCells, self.arr.tobytes())
+
+    def test_constant_multibands(self):
+        arr = np.full((2, 256, 256), np.nan, dtype=np.float32)
+        tile = Tile(arr, 'FLOAT', float('nan'))
+
+        proto_multiband = to_pb_multibandtile(tile)
+        actual = multibandtile_decoder(proto_multiband.SerializeToString())
+
+        self.assertTrue(all(proto_tile.constant for proto_tile in proto_multiband.tiles))
+        self.assertFalse(proto_multiband.tiles[0].rawCells)
+        self.assertEqual(actual.cells.shape, arr.shape)
+        self.assertEqual(actual.cells.dtype, arr.dtype)
+        self.assertTrue(np.isnan(actual.cells).all())
+        self.assertTrue(actual.cells.flags.writeable)
+
+    def test_mixed_constant_multibands(self):
+        arr = np.array([np.full((2, 2), 200, dtype=np.uint8), np.uint8([0, 0, 1, 1]).reshape(2, 2)])
+        tile = Tile(arr, 'UBYTE', 0)
+
+        proto_multiband = to_pb_multibandtile(tile)
+        actual = multibandtile_decoder(proto_multiband.SerializeToString())
+
+        self.assertTrue(proto_multiband.tiles[0].constant)
+        self.assertFalse(proto_multiband.tiles[1].constant)
+        self.assertTrue((actual.cells == arr).all())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -127,6 +127,41 @@ class ByteTileSchemaTest(BaseTestClass):
             self.assertEqual(actual.cells.shape, actual.cells.shape)
 
 
+class BitTileSchemaTest(BaseTestClass):
+    tiles = [
+        Tile(np.int8([0]).reshape(1, 1), 'BIT', None),
+        Tile(np.int8([1, 0, 1, 0]).reshape(2, 2), 'BIT', None),
+        Tile(np.int8([1, 1, 0, 0, 0, 0, 0, 0, 1]).reshape(3, 3), 'BIT', None)
+    ]
+
+    sc = BaseTestClass.pysc._jsc.sc()
+    tw = BaseTestClass.pysc._jvm.geopyspark.geotrellis.tests.schemas.BitArrayTileWrapper
+
+    java_rdd = tw.testOut(sc)
+    ser = ProtoBufSerializer(tile_decoder, tile_encoder)
+
+    rdd = RDD(java_rdd, BaseTestClass.pysc, AutoBatchedSerializer(ser))
+    collected = rdd.collect()
+
+    def test_encoded_tiles(self):
+        expected_encoded = [to_pb_tile(x) for x in self.collected]
+
+        for actual, expected in zip(self.tiles[1:], expected_encoded[1:]):
+            rows, cols = actual.cells.shape
+
+            self.assertEqual(len(expected.rawCells), (rows * cols + 7) // 8)
+            self.assertEqual(expected.cellType.dataType, mapped_data_types[actual.cell_type])
+
+        self.assertEqual(expected_encoded[1].rawCells, bytes([5]))
+        self.assertEqual(expected_encoded[2].rawCells, bytes([3, 1]))
+
+    def test_decoded_tiles(self):
+        for actual, expected in zip(self.collected, self.tiles):
+            self.assertTrue((actual.cells == expected.cells).all())
+            self.assertTrue(actual.cells.dtype == expected.cells.dtype)
+            self.assertEqual(actual.cells.shape[1:], expected.cells.shape)
+
+
 class UByteTileSchemaTest(BaseTestClass):
     tiles = [
         Tile.from_numpy_array(np.uint8([0, 0, 1, 1]).reshape(2, 2), 0),
@@ -1,4 +1,5 @@
 import os
+import pickle
 import unittest
 import pytest
 import numpy as np
@@ -7,7 +8,8 @@ from pyspark import RDD
 from pyspark.serializers import AutoBatchedSerializer
 from geopyspark.geotrellis import Extent, ProjectedExtent, Tile
 from geopyspark.geotrellis.protobufserializer import ProtoBufSerializer
-from geopyspark.geotrellis.protobufcodecs import (create_partial_tuple_decoder,
+from geopyspark.geotrellis.protobufcodecs import (LazyTile,
+                                                  create_partial_tuple_decoder,
                                                   create_partial_tuple_encoder,
                                                   from_pb_multibandtile,
                                                   to_pb_multibandtile,
@@ -73,6 +75,53 @@ class TupleSchemaTest(BaseTestClass):
             self.assertTrue((actual_tile.cells == expected_tile.cells).all())
             self.assertDictEqual(actual_extent._asdict(), expected_extent)
 
+    def test_batched_tuples(self):
+        batched_ser = ProtoBufSerializer(self.decoder, self.encoder, batched=True)
+        actual_tuples = batched_ser.loads(batched_ser.dumps(self.collected))
+
+        self.assertEqual(len(actual_tuples), len(self.collected))
+
+        for actual, expected in zip(actual_tuples, self.collected):
+            (actual_extent, actual_tile) = actual
+            (expected_extent, expected_tile) = expected
+
+            self.assertTrue((actual_tile.cells == expected_tile.cells).all())
+            self.assertEqual(actual_extent, expected_extent)
+
+    def test_lazy_tuples(self):
+        encoded = self.ser.dumps((ProjectedExtent(Extent(0.0, 0.0, 1.0, 1.0), 2004), self.multiband_dict))
+        (actual_extent, actual_tile) = self.ser.loads(encoded)[0]
+
+        self.assertIsInstance(actual_tile, LazyTile)
+        self.assertEqual(actual_extent.epsg, 2004)
+        self.assertEqual(actual_tile.cell_type, 'BYTE')
+        self.assertEqual(actual_tile.no_data_value, -128)
+        self.assertIsNotNone(actual_tile._multibandtile)
+
+        self.assertEqual(self.ser.dumps((actual_extent, actual_tile)), encoded)
+
+        unpickled_tile = pickle.loads(pickle.dumps(actual_tile))
+
+        self.assertIsNotNone(unpickled_tile._multibandtile)
+        self.assertTrue((unpickled_tile.cells == self.multiband_tile).all())
+        self.assertIsNone(unpickled_tile._multibandtile)
+
+    def test_serializer_equality(self):
+        batched_ser = ProtoBufSerializer(self.decoder, self.encoder, batched=True)
+
+        self.assertNotEqual(self.ser, batched_ser)
+        self.assertEqual(batched_ser, ProtoBufSerializer.create_tuple_serializer("ProjectedExtent",
+                                                                                 batched=True))
+        self.assertEqual(hash(batched_ser),
+                         hash(ProtoBufSerializer.create_tuple_serializer("ProjectedExtent",
+                                                                         batched=True)))
+        self.assertNotEqual(batched_ser, ProtoBufSerializer.create_tuple_serializer("SpatialKey",
+                                                                                    batched=True))
+
+    def test_unbatched_list(self):
+        with pytest.raises(ValueError):
+            self.ser.dumps(self.collected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,7 @@ import unittest
 import pytest
 import numpy as np
 
-from geopyspark.geotrellis import SpatialKey, Tile, Histogram
+from geopyspark.geotrellis import SpatialKey, Tile, Histogram, LocalHistogram, QuantileSketch
 from geopyspark.geotrellis.constants import LayerType
 from geopyspark.geotrellis.layer import TiledRasterLayer
 from geopyspark.tests.base_test_class import BaseTestClass
@@ -132,6 +132,53 @@ class HistogramTest(BaseTestClass):
         rebuilt_hist = Histogram.from_dict(dict_hist)
         self.assertEqual(self.hist.min_max(), rebuilt_hist.min_max())
 
+    def test_to_local(self):
+        local = self.hist.to_local()
+
+        self.assertEqual(local.min_max(), self.hist.min_max())
+        self.assertEqual(local.mean(), self.hist.mean())
+        self.assertEqual(local.cdf(), self.hist.cdf())
+        self.assertEqual(local.values(), self.hist.values())
+        self.assertEqual(local.quantile_breaks(4), [1.0, 2.0, 3.0, 4.0])
+        self.assertTrue((local.quantile(np.array([0.25, 0.75])) == [1.0, 3.0]).all())
+        self.assertEqual(local.merge(local).bin_counts(), [(1.0, 8), (2.0, 8), (3.0, 8), (4.0, 8)])
+
+    def test_local_dict_methods(self):
+        local = LocalHistogram.from_dict(self.hist.to_dict())
+
+        self.assertEqual(local.min_max(), (1.0, 4.0))
+        self.assertEqual(local.to_dict()['maxBucketCount'], 80)
+        self.assertEqual(LocalHistogram.from_dict(local.to_dict()).bin_counts(), local.bin_counts())
+
+    def test_quantile_sketch(self):
+        sketch = self.tiled.get_quantile_sketch(seed=0)
+
+        self.assertEqual(sketch.count(), 16)
+        self.assertEqual(sketch.min_max(), (1.0, 4.0))
+        self.assertEqual(sketch.quantile_breaks(4), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(sketch.error_bounds()['total_rank_error'], 0.0)
+        self.assertEqual(self.tiled.get_approximate_min_max(), (1.0, 4.0))
+
+        rebuilt = QuantileSketch.from_dict(sketch.to_dict())
+        self.assertEqual(rebuilt.merge(sketch).count(), 32)
+
+    def test_quantile_sketch_merge_compacts(self):
+        values = np.arange(10000, dtype=np.float64)
+        sketch = QuantileSketch(values[:100], np.ones(100, dtype=np.int64), 50)
+
+        for start in range(100, 10000, 100):
+            part = QuantileSketch(values[start:start + 100], np.ones(100, dtype=np.int64), 50)
+            sketch = sketch.merge(part, seed=start)
+
+        self.assertEqual(sketch.count(), 10000)
+        self.assertLess(len(sketch.values), 4 * 50)
+        self.assertGreater(sketch.error_bounds()['merge_error'], 0.0)
+        self.assertLess(abs(sketch.median() - 5000.0) / 10000.0, sketch.rank_error())
+
+    def test_quantile_sketch_invalid_fraction(self):
+        with pytest.raises(ValueError):
+            self.tiled.get_quantile_sketch(sample_fraction=0)
+
 
 if __name__ == "__main__":
     unittest.main()
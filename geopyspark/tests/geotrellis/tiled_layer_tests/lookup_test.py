@@ -4,7 +4,7 @@ import numpy as np
 
 import pytest
 
-from geopyspark.geotrellis import SpatialKey, Tile
+from geopyspark.geotrellis import SpatialKey, Tile, SpatialPartitionStrategy
 from geopyspark.tests.base_test_class import BaseTestClass
 from geopyspark.geotrellis.layer import TiledRasterLayer
 from geopyspark.geotrellis.constants import LayerType
@@ -72,6 +72,20 @@ class LookupTest(BaseTestClass):
         with pytest.raises(IndexError):
             result = self.raster_rdd.lookup(33, 13)
 
+    def test_lookup_many(self):
+        keys = [SpatialKey(1, 1), SpatialKey(0, 1), SpatialKey(5, 5)]
+        result = self.raster_rdd.lookup_many(keys)
+
+        self.assertEqual(set(result.keys()), {SpatialKey(1, 1), SpatialKey(0, 1)})
+        self.assertEqual(np.sum(result[SpatialKey(1, 1)].cells), 24 + 3*25)
+        self.assertEqual(np.sum(result[SpatialKey(0, 1)].cells), 24 + 2*25)
+
+    def test_lookup_many_partitioned(self):
+        partitioned = self.raster_rdd.partitionBy(SpatialPartitionStrategy(num_partitions=4))
+        result = partitioned.lookup_many([SpatialKey(0, 0), SpatialKey(1, 0)])
+
+        self.assertEqual(np.sum(result[SpatialKey(0, 0)].cells), 24 + 0*25)
+        self.assertEqual(np.sum(result[SpatialKey(1, 0)].cells), 24 + 1*25)
 
 
 if __name__ == "__main__":
@@ -168,6 +168,29 @@ class PointValuesTest(BaseTestClass):
         for r in result:
             self.assertTrue(r in self.expected_spatial_points_dict)
 
+    def test_sample_points_array(self):
+        coordinates = np.array([[point.x, point.y] for point in self.points])
+        result = self.create_spatial_layer().sample_points(coordinates)
+
+        self.assertEqual(result.shape, (5, 2))
+        self.assertTrue((result[:4] == [1, 2]).all())
+        self.assertTrue(np.isnan(result[4]).all())
+
+    def test_sample_points_array_outside_layer(self):
+        result = self.create_spatial_layer().sample_points(np.array([[-10.0, 15.0], [20.0, 20.0]]))
+
+        self.assertEqual(result.shape, (2, 2))
+        self.assertTrue(np.isnan(result).all())
+
+    def test_sample_points_rdd(self):
+        points = BaseTestClass.pysc.parallelize(self.points, 2)
+        result = dict(self.create_spatial_layer().sample_points(points, ResampleMethod.NEAREST_NEIGHBOR).collect())
+
+        self.assertEqual(set(result.keys()), {0, 1, 2, 3})
+
+        for values in result.values():
+            self.assertEqual(list(values), [1, 2])
+
     # SpaceTime tests
 
     def test_spacetime_list_no_resample(self):
@@ -199,6 +222,23 @@ class PointValuesTest(BaseTestClass):
             self.assertTrue(key in keys)
             self.assertTrue(value in values)
 
+    def test_sample_points_spacetime(self):
+        coordinates = np.array([[point.x, point.y] for point in self.points])
+        result = self.create_spacetime_layer().sample_points(coordinates)
+
+        self.assertEqual(result.size, 8)
+        self.assertEqual(set(result.point_indices), {0, 1, 2, 3})
+        self.assertEqual(result._replace(values=result.values).size, 8)
+
+        (instants, values) = result.pivot(len(coordinates))
+
+        self.assertEqual(list(instants.astype('int64')),
+                         [_convert_to_unix_time(self.now), _convert_to_unix_time(self.then)])
+        self.assertEqual(values.shape, (5, 2, 2))
+        self.assertTrue((values[:4, 0] == [1, 2]).all())
+        self.assertTrue((values[:4, 1] == [2, 3]).all())
+        self.assertTrue(np.isnan(values[4]).all())
+
     def test_spacetime_dict_with_resample(self):
         result = self.create_spacetime_layer().get_point_values(self.labeled_points,
                                                                 ResampleMethod.NEAREST_NEIGHBOR)
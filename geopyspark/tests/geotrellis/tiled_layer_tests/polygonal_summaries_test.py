@@ -1,13 +1,15 @@
 import os
 import unittest
+import datetime
 import numpy as np
 
 import pytest
 
-from geopyspark.geotrellis import SpatialKey, Tile
+from geopyspark.geotrellis import SpatialKey, SpaceTimeKey, Tile, _convert_to_unix_time
 from shapely.geometry import Polygon, MultiPolygon
 from geopyspark.tests.base_test_class import BaseTestClass
 from geopyspark.geotrellis.layer import TiledRasterLayer
+from geopyspark.geotrellis.histogram import LocalHistogram
 from geopyspark.geotrellis.constants import LayerType
 
 
@@ -49,6 +51,26 @@ class PolygonalSummariesTest(BaseTestClass):
 
     tiled_rdd = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd, metadata)
 
+    now = datetime.datetime(2017, 9, 25, 11, 37)
+    then = datetime.datetime(2018, 1, 17, 13, 53)
+
+    temporal_layer = [(SpaceTimeKey(0, 0, now), Tile(cells, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(1, 0, now), Tile(cells, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(0, 1, now), Tile(cells, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(1, 1, now), Tile(cells, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(0, 0, then), Tile(cells + 1, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(1, 0, then), Tile(cells + 1, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(0, 1, then), Tile(cells + 1, 'FLOAT', -1.0)),
+                      (SpaceTimeKey(1, 1, then), Tile(cells + 1, 'FLOAT', -1.0))]
+
+    temporal_metadata = dict(metadata, bounds={
+        'minKey': {'col': 0, 'row': 0, 'instant': _convert_to_unix_time(now)},
+        'maxKey': {'col': 1, 'row': 1, 'instant': _convert_to_unix_time(then)}})
+
+    temporal_tiled_rdd = TiledRasterLayer.from_numpy_rdd(LayerType.SPACETIME,
+                                                         BaseTestClass.pysc.parallelize(temporal_layer),
+                                                         temporal_metadata)
+
     @pytest.fixture(autouse=True)
     def tearDown(self):
         yield
@@ -78,6 +100,87 @@ class PolygonalSummariesTest(BaseTestClass):
 
         self.assertEqual(result, [1.0, 1.0])
 
+    def test_zonal_statistics(self):
+        polygons = [
+            Polygon([(0.0, 0.0), (0.0, 33.0), (33.0, 33.0), (33.0, 0.0), (0.0, 0.0)]),
+            Polygon([(1.0, 1.0), (1.0, 10.0), (10.0, 10.0), (10.0, 1.0)]),
+            Polygon([(100.0, 100.0), (100.0, 110.0), (110.0, 110.0), (110.0, 100.0)])
+        ]
+
+        result = self.tiled_rdd.zonal_statistics(polygons, ['count', 'sum', 'min', 'max', 'mean', 'histogram'])
+
+        self.assertTrue((result['count'][0] == [100, 100]).all())
+        self.assertTrue((result['count'][2] == [0, 0]).all())
+        self.assertTrue((result['sum'][0] == [96.0, 96.0]).all())
+        self.assertTrue((result['min'][:2] == [[0.0, 0.0], [1.0, 1.0]]).all())
+        self.assertTrue((result['max'][:2] == 1.0).all())
+        self.assertTrue((result['mean'][1] == [1.0, 1.0]).all())
+        self.assertTrue(np.isnan(result['mean'][2]).all())
+
+        self.assertIsInstance(result['histogram'][0][0], LocalHistogram)
+        self.assertEqual(result['histogram'][0][0].max(), 1.0)
+        self.assertEqual(result['histogram'][1][1].total_count(), result['count'][1][1])
+        self.assertEqual(result['histogram'][2], [None, None])
+
+    def test_zonal_statistics_no_intersections(self):
+        polygons = [Polygon([(100.0, 100.0), (100.0, 110.0), (110.0, 110.0), (110.0, 100.0)])]
+
+        result = self.tiled_rdd.zonal_statistics(polygons, ['count', 'mean', 'histogram'])
+
+        self.assertEqual(result['count'].shape, (1, 2))
+        self.assertTrue((result['count'] == 0).all())
+        self.assertEqual(result['mean'].shape, (1, 2))
+        self.assertTrue(np.isnan(result['mean']).all())
+        self.assertEqual(result['histogram'], [[None, None]])
+
+    def test_zonal_stats_by(self):
+        zone_layer = self.tiled_rdd.convert_data_type('int32', -1)
+        result = self.tiled_rdd.zonal_stats_by(zone_layer, ['count', 'sum', 'mean', 'std'])
+
+        self.assertTrue((result['zone'] == [0, 1]).all())
+        self.assertTrue((result['count'] == [[4, 4], [96, 96]]).all())
+        self.assertTrue((result['sum'] == [[0.0, 0.0], [96.0, 96.0]]).all())
+        self.assertTrue((result['mean'] == [[0.0, 0.0], [1.0, 1.0]]).all())
+        self.assertTrue((result['std'] == 0.0).all())
+
+    def test_zonal_stats_by_float_zones(self):
+        with pytest.raises(TypeError):
+            self.tiled_rdd.zonal_stats_by(self.tiled_rdd, ['count'])
+
+    def test_zonal_stats_by_different_layout(self):
+        tile = Tile(np.zeros((1, 10, 10), dtype='int32'), 'INT', -1)
+        layout = {'tileCols': 10, 'tileRows': 10, 'layoutCols': 1, 'layoutRows': 1}
+        metadata = dict(self.metadata,
+                        cellType='int32ud-1',
+                        bounds={'minKey': {'col': 0, 'row': 0}, 'maxKey': {'col': 0, 'row': 0}},
+                        layoutDefinition={'extent': self.extent, 'tileLayout': layout})
+
+        zone_layer = TiledRasterLayer.from_numpy_rdd(LayerType.SPATIAL,
+                                                     BaseTestClass.pysc.parallelize([(SpatialKey(0, 0), tile)]),
+                                                     metadata)
+
+        with pytest.raises(ValueError):
+            self.tiled_rdd.zonal_stats_by(zone_layer, ['count'])
+
+    def test_zonal_series(self):
+        polygons = [
+            Polygon([(1.0, 1.0), (1.0, 10.0), (10.0, 10.0), (10.0, 1.0)]),
+            Polygon([(0.0, 0.0), (0.0, 33.0), (33.0, 33.0), (33.0, 0.0), (0.0, 0.0)]),
+            Polygon([(100.0, 100.0), (100.0, 110.0), (110.0, 110.0), (110.0, 100.0)])
+        ]
+
+        result = self.temporal_tiled_rdd.zonal_series(polygons, ['count', 'sum', 'mean'])
+
+        self.assertTrue((result['geometry_id'] == [0, 0, 1, 1]).all())
+        self.assertTrue((result['instant'] == np.array([self.now, self.then] * 2, dtype='datetime64[ms]')).all())
+        self.assertTrue((result['mean'][:2] == [[1.0, 1.0], [2.0, 2.0]]).all())
+        self.assertTrue((result['count'][2:] == 100).all())
+        self.assertTrue((result['sum'][2:] == [[96.0, 96.0], [196.0, 196.0]]).all())
+
+    def test_zonal_statistics_invalid(self):
+        with pytest.raises(ValueError):
+            self.tiled_rdd.zonal_statistics([], ['median'])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,11 @@
 import os
 import unittest
+from unittest import mock
 import rasterio
 import numpy as np
 import pytest
 
+import geopyspark
 from geopyspark import geotiff
 from geopyspark.geotrellis import (Extent,
                                    ProjectedExtent,
@@ -69,6 +71,38 @@ class PyramidingTest(BaseTestClass):
         result = laid_out.pyramid()
         self.pyramid_building_check(result)
 
+    def test_multi_level_pyramid(self):
+        arr = np.arange(16 * 16, dtype='float32').reshape(1, 16, 16)
+        epsg_code = 3857
+        extent = Extent(0.0, 0.0, 10.0, 10.0)
+
+        tile = Tile(arr, 'FLOAT', False)
+        projected_extent = ProjectedExtent(extent, epsg_code)
+
+        rdd = BaseTestClass.pysc.parallelize([(projected_extent, tile)])
+        raster_rdd = RasterLayer.from_numpy_rdd(LayerType.SPATIAL, rdd)
+
+        laid_out = raster_rdd.tile_to_layout(GlobalLayout(tile_size=16))
+        expected = laid_out.pyramid()
+        result = laid_out.pyramid(levels_per_pass=3)
+
+        self.pyramid_building_check(result)
+        self.assertEqual(sorted(result.levels.keys()), sorted(expected.levels.keys()))
+
+        for zoom, level in expected.levels.items():
+            self.assertEqual(result.levels[zoom].layer_metadata.bounds, level.layer_metadata.bounds)
+            self.assertEqual(result.levels[zoom].count(), level.count())
+
+            expected_tiles = sorted(level.to_numpy_rdd().collect(), key=lambda pair: pair[0])
+            actual_tiles = sorted(result.levels[zoom].to_numpy_rdd().collect(), key=lambda pair: pair[0])
+
+            for ((expected_key, expected_tile), (actual_key, actual_tile)) in zip(expected_tiles, actual_tiles):
+                self.assertEqual(actual_key, expected_key)
+                self.assertTrue(np.allclose(actual_tile.cells, expected_tile.cells, equal_nan=True))
+
+        with pytest.raises(ValueError):
+            laid_out.pyramid(levels_per_pass=0)
+
     # collect_metadata needs to be updated for this to work
     '''
     def test_no_start_zoom(self):
@@ -184,5 +218,79 @@ class PyramidingTest(BaseTestClass):
         self.assertTrue(catalog.read_layer_metadata(uri, layer_name, 0))
         self.assertTrue(catalog.read_layer_metadata(uri, layer_name, max_zoom))
 
+    def test_write_pyramid_layers_concurrently(self):
+        max_zoom = 5
+        tif = file_path('srtm_52_11.tif')
+        raster_layer = geotiff.get(layer_type=LayerType.SPATIAL, uri=tif)
+        tiled_raster_layer = raster_layer.tile_to_layout(GlobalLayout(zoom=max_zoom), target_crs=3857)
+        pyramided_layer = tiled_raster_layer.pyramid()
+
+        layer_name = 'concurrent-pyramid-test-layer'
+        path = file_path('concurrent-pyramid-test-catalog')
+        uri = 'file:///' + path
+
+        if os.path.isdir(path):
+            import shutil
+            shutil.rmtree(path)
+
+        pyramided_layer.write(uri, layer_name, max_workers=3)
+
+        for zoom in range(max_zoom + 1):
+            self.assertTrue(catalog.read_layer_metadata(uri, layer_name, zoom))
+
+    def test_write_pyramid_layers_in_scheduler_pool(self):
+        max_zoom = 3
+        tif = file_path('srtm_52_11.tif')
+        raster_layer = geotiff.get(layer_type=LayerType.SPATIAL, uri=tif)
+        tiled_raster_layer = raster_layer.tile_to_layout(GlobalLayout(zoom=max_zoom), target_crs=3857)
+        pyramided_layer = tiled_raster_layer.pyramid()
+
+        layer_name = 'pooled-pyramid-test-layer'
+        path = file_path('pooled-pyramid-test-catalog')
+        uri = 'file:///' + path
+
+        if os.path.isdir(path):
+            import shutil
+            shutil.rmtree(path)
+
+        pyramided_layer.write(uri, layer_name, max_workers=2, scheduler_pool='pyramid-writes')
+
+        for zoom in range(max_zoom + 1):
+            self.assertTrue(catalog.read_layer_metadata(uri, layer_name, zoom))
+
+    def test_write_pyramid_layers_concurrently_with_failure(self):
+        max_zoom = 3
+        tif = file_path('srtm_52_11.tif')
+        raster_layer = geotiff.get(layer_type=LayerType.SPATIAL, uri=tif)
+        tiled_raster_layer = raster_layer.tile_to_layout(GlobalLayout(zoom=max_zoom), target_crs=3857)
+        pyramided_layer = tiled_raster_layer.pyramid()
+
+        layer_name = 'failing-pyramid-test-layer'
+        path = file_path('failing-pyramid-test-catalog')
+        uri = 'file:///' + path
+
+        if os.path.isdir(path):
+            import shutil
+            shutil.rmtree(path)
+
+        write = geopyspark.write
+
+        def failing_write(**kwargs):
+            if kwargs['tiled_raster_layer'].zoom_level == 1:
+                raise IOError("Could not reach the catalog")
+
+            return write(**kwargs)
+
+        with mock.patch('geopyspark.write', side_effect=failing_write) as patched:
+            with pytest.raises(RuntimeError) as error:
+                pyramided_layer.write(uri, layer_name, max_workers=2)
+
+        self.assertEqual(patched.call_count, max_zoom + 1)
+        self.assertIn('zoom 1: Could not reach the catalog', str(error.value))
+        self.assertIsInstance(error.value.__cause__, IOError)
+
+        for zoom in [0, 2, 3]:
+            self.assertTrue(catalog.read_layer_metadata(uri, layer_name, zoom))
+
 if __name__ == "__main__":
     unittest.main()